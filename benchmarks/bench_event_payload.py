@@ -0,0 +1,133 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 accsyn / HDR AB
+
+"""
+Benchmark serialising and compressing large event payloads, comparing the accsyn_api single pass event
+serialisation with the previous estimate, serialise, compress and serialise again approach. Reports time and peak
+memory allocated on top of the payload itself.
+
+Usage: python benchmarks/bench_event_payload.py [--sizes 1,10,100] [--rounds 3]
+"""
+
+import argparse
+import base64
+import datetime
+import gzip
+import io
+import json
+import time
+import tracemalloc
+
+from accsyn_api.session import (
+    COMPRESSION_GZIP,
+    COMPRESSION_LEGACY,
+    COMPRESSION_ZSTD,
+    DEFAULT_EVENT_PAYLOAD_COMPRESS_SIZE_TRESHOLD,
+    Session,
+    _get_zstandard,
+)
+
+
+def legacy_build(event: dict, data: dict) -> bytes:
+    """The previous event serialisation; estimate size, serialise and gzip payload, base64 encode, serialise event."""
+    event = dict(event)
+
+    def recursive_estimate_dict_size(o):
+        result = 0
+        if o is not None:
+            if isinstance(o, dict):
+                for key, value in list(o.items()):
+                    result += len(str(key)) + recursive_estimate_dict_size(value)
+            elif isinstance(o, list):
+                for _o in o:
+                    result += recursive_estimate_dict_size(_o)
+            elif Session._is_str(o):
+                result += len(o)
+            else:
+                result += 10
+        return result
+
+    size = recursive_estimate_dict_size(data)
+    if DEFAULT_EVENT_PAYLOAD_COMPRESS_SIZE_TRESHOLD < size:
+        out = io.BytesIO()
+        with gzip.GzipFile(fileobj=out, mode="w") as f:
+            f.write(Session._safe_dumps(data).encode('ascii'))
+        event["gz_data"] = base64.b64encode(out.getvalue()).decode('utf-8')
+    else:
+        event["data"] = data
+    return Session._safe_dumps(event).encode('utf-8')
+
+
+def single_pass_build(compression: str):
+    def build(event: dict, data: dict) -> bytes:
+        payload = Session._safe_dumps(data)
+        return Session._serialise_event(event, payload, compression=compression)[0]
+
+    return build
+
+
+def build_payload(megabytes: int) -> dict:
+    """Build a transfer create payload of roughly *megabytes* MB of JSON, with many similar tasks."""
+    tasks = []
+    size = 0
+    i = 0
+    while size < megabytes * 1024 * 1024:
+        task = dict(
+            source=(
+                f"share=projects/Örnen/sequences/sq{i % 40:03d}/sh{i % 500:04d}/render/v{i % 7:03d}"
+                f"/frame.{i:07d}.exr"
+            ),
+            destination=f"site=london/projects/Örnen/incoming/frame.{i:07d}.exr",
+            size=i * 1024,
+            metadata=dict(shot=f"sh{i % 500:04d}", priority=i % 3),
+        )
+        size += len(json.dumps(task)) + 2
+        tasks.append(task)
+        i += 1
+    return dict(code=f"delivery_{megabytes}mb", tasks=tasks)
+
+
+def measure(label: str, fn, event: dict, data: dict, rounds: int) -> None:
+    best = None
+    for _ in range(rounds):
+        t_start = time.perf_counter()
+        body = fn(event, data)
+        elapsed = time.perf_counter() - t_start
+        best = elapsed if best is None else min(best, elapsed)
+    del body
+    tracemalloc.start()
+    body = fn(event, data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<24} {best * 1000:10.1f} ms {peak / 1024 / 1024:10.1f} MB peak {len(body) / 1024:10.1f} KB body")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1,10,100", help="Comma separated payload sizes, in MB")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    event = dict(
+        audience="api",
+        workspace="my_workspace",
+        eid="0b6f3b52-8a5e-4f7c-9a0e-4f9a3c6f1d2e",
+        uri="transfer/create",
+        created=datetime.datetime.now(),
+    )
+    builds = [
+        ("legacy gz_data", legacy_build),
+        ("single pass gz_data", single_pass_build(COMPRESSION_LEGACY)),
+        ("single pass gzip", single_pass_build(COMPRESSION_GZIP)),
+    ]
+    if _get_zstandard() is not None:
+        builds.append(("single pass zstd", single_pass_build(COMPRESSION_ZSTD)))
+    for megabytes in [int(size) for size in args.sizes.split(",")]:
+        data = build_payload(megabytes)
+        print(f"Payload of {megabytes} MB ({len(data['tasks'])} tasks), best of {args.rounds}")
+        for label, fn in builds:
+            measure(label, fn, event, data, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
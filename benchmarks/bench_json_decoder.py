@@ -0,0 +1,106 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 accsyn / HDR AB
+
+"""
+Benchmark decoding of a synthetic find response, comparing the accsyn_api JSONDecoder with plain json.loads and the
+previous two pass decoder.
+
+Usage: python benchmarks/bench_json_decoder.py [--entities 100000] [--rounds 3]
+"""
+
+import argparse
+import datetime
+import json
+import re
+import time
+
+from accsyn_api.session import JSONDecoder, Session
+
+
+def legacy_decode(json_string: str) -> object:
+    """The previous decoder; parse, then walk the tree converting date/time strings."""
+    json_data = json.loads(json_string)
+
+    def recursive_decode(d):
+        if isinstance(d, dict):
+            for key in d.keys():
+                if isinstance(d[key], dict):
+                    d[key] = recursive_decode(d[key])
+                elif isinstance(d[key], list):
+                    d[key] = [recursive_decode(i) for i in d[key]]
+                elif Session._is_str(d[key]):
+                    dt = None
+                    if d[key].startswith("ObjectId:"):
+                        d[key] = d[key].replace("ObjectId:", "")
+                    elif re.match(
+                        "^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}$",
+                        str(Session._safely_printable(d[key])),
+                    ):
+                        dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S")
+                    elif re.match(
+                        "^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}$",
+                        str(Session._safely_printable(d[key])),
+                    ):
+                        dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S.%f")
+                    if dt is not None:
+                        dt = dt.replace(tzinfo=datetime.timezone.utc)
+                        d[key] = dt.astimezone()
+        return d
+
+    return recursive_decode(json_data)
+
+
+def build_find_response(entities: int) -> str:
+    """Build a find response JSON string with *entities* job like entities."""
+    t = datetime.datetime(2025, 1, 1)
+    result = []
+    for i in range(entities):
+        created = t + datetime.timedelta(seconds=37 * i)
+        result.append(
+            dict(
+                id="%024x" % i,
+                code=f"transfer_{i}",
+                name=f"Transfer {i} of project Örnen",
+                status="running" if i % 3 else "done",
+                user="user:%024x" % (i % 50),
+                parent="ObjectId:%024x" % (i % 10),
+                created=created.strftime("%Y-%m-%dT%H:%M:%S"),
+                modified=created.strftime("%Y-%m-%dT%H:%M:%S.123"),
+                progress=i % 100,
+                size=i * 1024,
+                metadata=dict(shot=f"sh{i % 200:04d}", tags=["a", "b"], approved=i % 2 == 0),
+            )
+        )
+    return json.dumps(dict(result=result))
+
+
+def measure(label: str, fn, s: str, rounds: int) -> float:
+    best = None
+    for _ in range(rounds):
+        t_start = time.perf_counter()
+        fn(s)
+        elapsed = time.perf_counter() - t_start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<24} {best * 1000:10.1f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    s = build_find_response(args.entities)
+    print(
+        f"Decoding find response with {args.entities} entities ({len(s) / 1024 / 1024:.1f} MB), best of {args.rounds}"
+    )
+    assert json.loads(s, cls=JSONDecoder) == legacy_decode(s), "Decoders disagree!"
+    baseline = measure("json.loads (no dates)", json.loads, s, args.rounds)
+    legacy = measure("legacy two pass", legacy_decode, s, args.rounds)
+    current = measure("JSONDecoder", lambda x: json.loads(x, cls=JSONDecoder), s, args.rounds)
+    print(f"JSONDecoder is {legacy / current:.1f}x faster than legacy, {current / baseline:.1f}x plain json.loads")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,15 @@
 # :copyright: Copyright (c) 2021 accsyn
 
 from ._version import __version__
-from .session import Session
+from .session import (
+    Session,
+    RetryPolicy,
+    CompressionPolicy,
+    AdaptiveCompressionPolicy,
+    EntityCache,
+    SchemaCache,
+    WriteBehindBuffer,
+    Query,
+    ResultSet,
+)
+from .async_session import AsyncSession
@@ -0,0 +1,1027 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2026 accsyn / HDR AB
+
+import re
+import time
+import collections
+import codecs
+import asyncio
+import logging
+import threading
+
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Set, Tuple, Union, cast, overload
+
+from .session import (
+    Session,
+    RetryPolicy,
+    CompressionPolicy,
+    EntityCache,
+    SchemaCache,
+    _ContentEncodingRejected,
+    _LazyFormat,
+    AccsynException,
+    Query,
+    ACCSYN_BACKEND_MASTER_HOSTNAME,
+    RESPONSE_CHUNK_SIZE,
+    UNIQUE_ENTITY_TYPES,
+    WriteBehindBuffer,
+)
+
+
+class _AsyncSessionState(Session):
+    """Configuration, caches and event building of an :class:`AsyncSession`, authenticated by it."""
+
+    _connect_upon_init: bool = False  # Endpoint resolve and login are awaited in AsyncSession.connect
+
+
+class AsyncSession(object):
+    """
+    accsyn asyncio API session object, offering the query, create, update, file and access operations of
+    :class:`~accsyn_api.session.Session` as coroutines on top of a non-blocking HTTP transport.
+
+    Requires the aiohttp module (pip install aiohttp). Connect by awaiting :func:`connect`, or use as an async
+    context manager::
+
+        async with accsyn_api.AsyncSession() as session:
+            jobs = await session.find("Transfer WHERE status=running")
+
+    .. versionadded:: 3.4.0
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initiate a new asyncio API session object, takes the same arguments as
+        :class:`~accsyn_api.session.Session`. Await :func:`connect` before use.
+        """
+        self._session = _AsyncSessionState(*args, **kwargs)
+        self._aiohttp_session = None
+        self._schema_tasks: Set["asyncio.Task[None]"] = set()  # Background schema refreshes, referenced until done
+        self._write_behind_task: Optional["asyncio.Task[None]"] = None
+        self._write_behind_event: Optional[asyncio.Event] = None
+        self._write_behind_alock: Optional[asyncio.Lock] = None
+        self._write_behind_closing = False
+
+    async def __aenter__(self) -> "AsyncSession":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    @property
+    def username(self) -> str:
+        return self._session.username
+
+    @property
+    def timeout(self) -> int:
+        return self._session.timeout
+
+    @property
+    def connect_timeout(self) -> int:
+        return self._session.connect_timeout
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._session.retry_policy
+
+    @property
+    def compression_policy(self) -> CompressionPolicy:
+        return self._session.compression_policy
+
+    @property
+    def entity_cache(self) -> Optional[EntityCache]:
+        return self._session.entity_cache
+
+    @property
+    def schema_cache(self) -> Optional[SchemaCache]:
+        return self._session.schema_cache
+
+    @property
+    def write_behind(self) -> Optional[WriteBehindBuffer]:
+        return self._session.write_behind
+
+    def get_last_message(self) -> Optional[str]:
+        """Return the last message returned by backend, see :func:`Session.get_last_message`."""
+        return self._session.get_last_message()
+
+    def get_cache_statistics(self) -> Optional[Dict[str, int]]:
+        """Return entity cache statistics, see :func:`Session.get_cache_statistics`."""
+        return self._session.get_cache_statistics()
+
+    def get_compression_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """Return event compression statistics, see :func:`Session.get_compression_statistics`."""
+        return self._session.get_compression_statistics()
+
+    async def connect(self) -> bool:
+        """Resolve the workspace API endpoint and authenticate, throws exception upon authentication failure."""
+        session = self._session
+        if session._uid is not None:
+            return True
+        if session._hostname is None and not session._dev:
+            # Resolve workspace hostname, do not expose credentials
+            response = await self._arest(
+                "GET",
+                ACCSYN_BACKEND_MASTER_HOSTNAME,
+                "J3PKTtDvolDMBtTy6AFGA",
+                dict(ident=session._workspace),
+                headers=dict(),
+            )
+            session._store_endpoint(response)
+        session._resolve_endpoint()
+        response = await self._arest(
+            "PUT",
+            session._hostname,
+            "/api/login",
+            dict(),
+            headers=session._login_headers(),
+            port=session._port,
+        )
+        return session._store_login(response)
+
+    async def aclose(self) -> None:
+        """Send pending updates and close the non-blocking HTTP transport, releasing its connections."""
+        for task in list(self._schema_tasks):
+            task.cancel()
+        if self._write_behind_task is not None:
+            # Let an ongoing flush finish, then send what is left
+            self._write_behind_closing = True
+            cast(asyncio.Event, self._write_behind_event).set()
+            await self._write_behind_task
+            self._write_behind_task = None
+        # Send failed updates again until given up
+        while self._session._write_behind is not None and 0 < len(self._session._write_behind):
+            await self.flush()
+        if self._aiohttp_session is not None:
+            await self._aiohttp_session.close()
+            self._aiohttp_session = None
+        self._session.close()
+
+    # Query
+
+    async def find(
+        self,
+        query: Union[str, Query],
+        entityid: Optional[str] = None,
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        offline: Optional[bool] = None,
+        archived: Optional[bool] = None,
+        limit: Optional[int] = None,
+        skip: Optional[int] = None,
+        create: bool = False,
+        update: bool = False,
+        single_entity_query: bool = False,
+        expand: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return (GET) a list of entities/entitytypes/attributes based on *query*, see :func:`Session.find`.
+
+        The whole result is returned, paging with :func:`Session.find_iter`, :func:`Session.scan` and lazy result
+        sets are not offered - page by awaiting find with *limit* and *skip*.
+        """
+        uri, data, expression = self._session._find_event(
+            query,
+            entityid=entityid,
+            attributes=attributes,
+            finished=finished,
+            inactive=inactive,
+            offline=offline,
+            archived=archived,
+            limit=limit,
+            skip=skip,
+            create=create,
+            update=update,
+            single_entity_query=single_entity_query,
+        )
+        if self._session._schema_cache is not None and uri in ["entitytypes", "attributes"]:
+            return await self._afind_schema(uri, data)
+        response = await self._aevent("GET", uri, data, query=expression)
+        result = Session._find_result(response, single_entity_query=single_entity_query)
+        if expand and result:
+            await self._aexpand(query, result if isinstance(result, list) else [result], expand)
+        return result
+
+    async def find_one(
+        self,
+        query: Union[str, Query],
+        entityid: Optional[str] = None,
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        offline: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return a single entity, see :func:`Session.find_one`."""
+        entity_cache = self._session._entity_cache
+        cache_key = self._session._get_cache_key(query, entityid, attributes, finished, inactive or offline, archived)
+        if entity_cache is not None and cache_key:
+            retval = entity_cache.get(*cache_key)
+            if retval is not None:
+                return retval
+        # A single entity query returns the entity found, not a list
+        retval = cast(
+            Optional[Dict[str, Any]],
+            await self.find(
+                query,
+                entityid=entityid,
+                attributes=attributes,
+                finished=finished,
+                inactive=inactive or offline,
+                archived=archived,
+                limit=1,
+                single_entity_query=True,
+            ),
+        )
+        if entity_cache is not None and cache_key and retval:
+            entity_cache.put(cache_key[0], retval)
+        return retval
+
+    async def count(
+        self,
+        query: Union[str, Query],
+        entityid: Optional[str] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> int:
+        """Return the amount of entities matching *query*, see :func:`Session.count`."""
+        result = await self.find(
+            query, entityid=entityid, attributes=["id"], finished=finished, inactive=inactive, archived=archived
+        )
+        return len(result or [])
+
+    async def exists_entity(
+        self,
+        query: Union[str, Query],
+        entityid: Optional[str] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> bool:
+        """Check if any entity matches *query*, see :func:`Session.exists_entity`."""
+        result = await self.find(
+            query,
+            entityid=entityid,
+            attributes=["id"],
+            finished=finished,
+            inactive=inactive,
+            archived=archived,
+            limit=1,
+        )
+        return 0 < len(result or [])
+
+    async def get_entity(self, entitytype: str, entityid: str) -> Optional[Dict[str, Any]]:
+        """Return an entity by its *entitytype* and *entityid*, see :func:`Session.get_entity`."""
+        entitytype = Session._check_entitytype(entitytype)
+        entityid = Session._check_entityid(entityid)
+        if entitytype in UNIQUE_ENTITY_TYPES:
+            resolved_id = await self.resolve_id(entitytype, entityid, missing_ok=True)
+            if resolved_id is None:
+                return None
+            entityid = resolved_id
+        assert re.match("^[a-z0-9]{24}$", (entityid or "")), "Invalid entity ID supplied!"
+        entity_cache = self._session._entity_cache
+        if entity_cache is not None:
+            retval = entity_cache.get(entitytype, entityid)
+            if retval is not None:
+                return retval
+        response = await self._aevent("GET", f"{entitytype}/find", dict(), entityid=entityid)
+        retval = Session._find_result(response, single_entity_query=True)
+        if entity_cache is not None and retval:
+            entity_cache.put(entitytype, retval)
+        return retval
+
+    async def get_entities(
+        self,
+        entitytype: str,
+        entityids: List[str],
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return many entities by their *entitytype* and *entityids*, see :func:`Session.get_entities`."""
+        entitytype, result, batches = self._session._get_entities_prepare(
+            entitytype, entityids, attributes, batch_size
+        )
+        semaphore = asyncio.Semaphore(max_workers or self._session._pool_maxsize)
+
+        async def find_batch(batch: List[str]) -> Optional[List[Dict[str, Any]]]:
+            async with semaphore:
+                return await self.find(
+                    Session._batch_query(entitytype, "id", batch),
+                    attributes=attributes,
+                    finished=finished,
+                    inactive=inactive,
+                    archived=archived,
+                    limit=len(batch),
+                )
+
+        for entities in await asyncio.gather(*[find_batch(batch) for batch in batches]):
+            self._session._get_entities_store(entitytype, result, entities, attributes)
+        return result
+
+    @overload
+    async def resolve_id(self, entitytype: str, ident: str, missing_ok: Literal[False] = False) -> str:
+        ...
+
+    @overload
+    async def resolve_id(self, entitytype: str, ident: str, missing_ok: bool) -> Optional[str]:
+        ...
+
+    @overload
+    async def resolve_id(self, entitytype: str, ident: List[str], missing_ok: Literal[False] = False) -> List[str]:
+        ...
+
+    @overload
+    async def resolve_id(self, entitytype: str, ident: List[str], missing_ok: bool) -> List[Optional[str]]:
+        ...
+
+    async def resolve_id(
+        self, entitytype: str, ident: Union[str, List[str]], missing_ok: bool = False
+    ) -> Union[Optional[str], List[str], List[Optional[str]]]:
+        """Return the id of an entity identified by its id or code, see :func:`Session.resolve_id`."""
+        entitytype, idents, resolved, codes = self._session._resolve_id_prepare(entitytype, ident)
+        for query in Session._resolve_id_queries(entitytype, codes):
+            self._session._resolve_id_store(entitytype, resolved, await self.find(query, attributes=["id", "code"]))
+        return Session._resolve_id_result(entitytype, ident, idents, resolved, missing_ok)
+
+    async def report(self, query: str) -> str:
+        """(Support) Return an internal backend report of an entity, see :func:`Session.report`."""
+        d = self._session._decode_query(query)
+        response = await self._aevent("GET", f"{d['entitytype']}/report", dict(), query=d.get("expression"))
+        return response["report"]
+
+    async def metrics(
+        self, query: str, attributes: Optional[List[str]] = None, time: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Return metrics for an entity (job), see :func:`Session.metrics`."""
+        d = self._session._decode_query(query)
+        response = await self._aevent(
+            "GET", f"{d['entitytype']}/metrics", Session._metrics_data(attributes, time), query=d.get("expression")
+        )
+        return response["result"]
+
+    # Create, update, delete
+
+    async def create(
+        self,
+        entitytype: str,
+        data: Union[str, Dict[str, Any], List[Dict[str, Any]]],
+        entityid: Optional[str] = None,
+        allow_duplicates: Optional[bool] = None,
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Create a new accsyn entity, see :func:`Session.create`."""
+        uri, data = Session._create_event(entitytype, data, allow_duplicates=allow_duplicates)
+        response = await self._aevent("POST", uri, data, entityid=entityid)
+        return Session._create_result(response)
+
+    async def create_many(
+        self,
+        entitytype: str,
+        items: Iterable[Dict[str, Any]],
+        entityid: Optional[str] = None,
+        allow_duplicates: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> Dict[int, Union[Dict[str, Any], Exception]]:
+        """Create many entities, concurrently and chunk by chunk, see :func:`Session.create_many`."""
+        entitytype, chunk_size = Session._create_many_check(entitytype, chunk_size)
+        concurrency = concurrency or self._session._pool_maxsize
+        semaphore = asyncio.Semaphore(concurrency)
+        total = len(items) if isinstance(items, collections.abc.Sized) else None
+        done = Session._create_many_load_checkpoint(checkpoint, entitytype, entityid)
+        results: Dict[int, Union[Dict[str, Any], Exception]] = dict()
+
+        async def create_unit(unit: List[Tuple[int, Dict[str, Any]]]) -> Any:
+            data = [item for _, item in unit] if entitytype == "task" else unit[0][1]
+            async with semaphore:
+                try:
+                    return await self.create(entitytype, data, entityid=entityid, allow_duplicates=allow_duplicates)
+                except Exception as e:
+                    return e
+
+        for units in Session._create_many_rounds(entitytype, items, done, results, chunk_size, concurrency):
+            for unit, result in zip(units, await asyncio.gather(*[create_unit(unit) for unit in units])):
+                Session._create_many_store(unit, result, results, done)
+            Session._create_many_save_checkpoint(checkpoint, entitytype, entityid, done)
+            if progress:
+                progress(len(results), total)
+        Session._create_many_finish_checkpoint(checkpoint, results)
+        return results
+
+    async def update(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update/modify an entity, see :func:`Session.update`."""
+        entitytype = Session._update_check(entitytype, entityid, data)
+        entityid = await self._aresolve_code(entitytype, entityid)
+        if self._session._write_behind is not None:
+            return self._write_behind_put(entitytype, entityid, data)
+        return await self._aupdate_event(entitytype, entityid, data)
+
+    async def _aupdate_event(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = await self._aevent("PUT", f"{entitytype}/edit", data, entityid=entityid)
+        self._session._invalidate_entity(entityid)
+        if response:
+            return response["result"][0]
+        return None
+
+    async def patch(
+        self,
+        entitytype: str,
+        before: Optional[Dict[str, Any]],
+        after: Dict[str, Any],
+        deep: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Update an entity with only the attributes that changed, see :func:`Session.patch`."""
+        Session._patch_check(after)
+        if before is None:
+            entityid = await self._aresolve_code(Session._check_entitytype(entitytype), after["id"])
+            if self._session._entity_cache is not None:
+                self._session._entity_cache.invalidate(entityid)
+            before = await self.get_entity(entitytype, entityid)
+            if before is None:
+                raise AccsynException(f"{entitytype.title()} {after['id']} not found!")
+        data = Session._patch_data(before, after, deep)
+        data.pop("id", None)
+        if 0 == len(data):
+            self._session._verbose(f"Not updating {entitytype} {after['id']}, nothing changed.")
+            return None
+        return await self.update(entitytype, after["id"], data)
+
+    async def update_many(
+        self,
+        entitytype: str,
+        entityid: Optional[Union[str, List[str]]] = None,
+        data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Optional[Union[List[Dict[str, Any]], Dict[str, Union[Dict[str, Any], Exception]]]]:
+        """Update/modify multiple entities, see :func:`Session.update_many`."""
+        entitytype = Session._check_updatable(entitytype)
+        semaphore = asyncio.Semaphore(max_workers or self._session._pool_maxsize)
+        if entitytype != "task":
+            patches = Session._update_many_patches(entityid, data)
+            idents = list(patches)
+            if entitytype in UNIQUE_ENTITY_TYPES:
+                entityids = await self.resolve_id(entitytype, idents, missing_ok=True)
+            else:
+                entityids = idents
+
+            async def update_one(ident: str, _id: Optional[str]) -> Any:
+                async with semaphore:
+                    try:
+                        Session._update_many_check(entitytype, ident, _id, patches[ident])
+                        return await self.update(entitytype, cast(str, _id), patches[ident])
+                    except Exception as e:
+                        return e
+
+            result = await asyncio.gather(*[update_one(ident, _id) for ident, _id in zip(idents, entityids)])
+            return collections.OrderedDict(zip(idents, result))
+        chunks = Session._update_many_chunks(cast(str, entityid), cast(List[Dict[str, Any]], data), chunk_size)
+
+        async def update_chunk(chunk: List[Dict[str, Any]]) -> Any:
+            async with semaphore:
+                try:
+                    return await self._aevent("PUT", f"{entitytype}/edit", chunk, entityid=entityid)
+                except Exception as e:
+                    return e
+
+        responses = await asyncio.gather(*[update_chunk(chunk) for chunk in chunks])
+        for chunk in chunks:
+            for d in chunk:
+                self._session._invalidate_entity(d.get("id"))
+        return Session._update_many_result(responses)
+
+    async def deactivate_one(self, entitytype: str, entityid: str) -> Any:
+        """Deactivate an entity, see :func:`Session.deactivate_one`."""
+        entitytype = Session._check_entitytype(entitytype)
+        entityid = await self._aresolve_code(entitytype, Session._check_entityid(entityid))
+        response = await self._aevent("DELETE", f"{entitytype}/deactivate", dict(), entityid=entityid)
+        self._session._invalidate_entity(entityid)
+        if response:
+            return response["result"]
+        return None
+
+    async def activate_one(self, entitytype: str, entityident: str) -> Any:
+        """Activate an entity, see :func:`Session.activate_one`."""
+        entitytype = Session._check_entitytype(entitytype)
+        entityident = Session._check_entityid(entityident, "entity identification").lower().strip()
+        is_id = re.match("^[a-z0-9]{24}$", entityident) is not None
+        response = await self._aevent(
+            "POST",
+            f"{entitytype}/activate",
+            dict(),
+            entityid=entityident if is_id else None,
+            query=entityident if not is_id else None,
+        )
+        self._session._invalidate_activated(entityident, is_id)
+        if response:
+            return response["result"]
+        return None
+
+    async def delete_one(self, entitytype: str, entityid: str, data: Optional[Dict[str, Any]] = None) -> Any:
+        """Delete(archive) an entity, see :func:`Session.delete_one`."""
+        entitytype = Session._delete_check(entitytype, entityid)
+        entityid = await self._aresolve_code(entitytype, entityid)
+        response = await self._aevent("DELETE", f"{entitytype}/delete", data, entityid=entityid)
+        self._session._invalidate_entity(entityid)
+        if response:
+            return response["result"]
+        return None
+
+    # Access
+
+    async def grant(
+        self,
+        entitytype: str,
+        entityid: str,
+        targettype: str,
+        targetid: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Grant access to an entity, see :func:`Session.grant`."""
+        entitytype, targettype = Session._check_access(entitytype, entityid, targettype, targetid)
+        entityid = entityid.lower().strip()
+        entityid = Session._grant_entityid(
+            entitytype,
+            entityid,
+            await self.resolve_id(entitytype, entityid, missing_ok=True),
+            data,
+        )
+        targetid = await self.resolve_id(targettype, targetid)
+        request = Session._grant_event(entitytype, entityid, targettype, targetid, data)
+        if request is None:
+            raise AccsynException("Unsupported grant access operation!")
+        response = await self._aevent(request["method"], request["uri"], request["data"], entityid=request["entityid"])
+        return Session._access_event_result(request, response)
+
+    async def grant_many(
+        self,
+        entitytype: str,
+        targettype: str,
+        grants: List[Tuple[Any, ...]],
+        max_workers: Optional[int] = None,
+    ) -> List[Any]:
+        """Grant many entities access to many target entities, concurrently, see :func:`Session.grant_many`."""
+        entitytype, targettype, entityids, targetids = await self._aaccess_many_prepare(entitytype, targettype, grants)
+        requests = Session._grant_many_requests(entitytype, targettype, grants, entityids, targetids)
+        return await self._aaccess_many_events(requests, max_workers)
+
+    async def _aaccess_many_prepare(
+        self, entitytype: str, targettype: str, pairs: List[Tuple[Any, ...]]
+    ) -> Tuple[str, str, List[Optional[str]], List[Optional[str]]]:
+        entitytype, targettype = Session._access_many_types(entitytype, targettype, pairs)
+        entityids = await self.resolve_id(entitytype, [pair[0] for pair in pairs], missing_ok=True)
+        targetids = await self.resolve_id(targettype, [pair[1] for pair in pairs], missing_ok=True)
+        return entitytype, targettype, entityids, targetids
+
+    async def _aaccess_many_events(
+        self, requests: List[Union[Dict[str, Any], Exception]], max_workers: Optional[int]
+    ) -> List[Any]:
+        semaphore = asyncio.Semaphore(max_workers or self._session._pool_maxsize)
+
+        async def send(request: Union[Dict[str, Any], Exception]) -> Any:
+            if isinstance(request, Exception):
+                return request
+            async with semaphore:
+                try:
+                    response = await self._aevent(
+                        request["method"], request["uri"], request["data"], entityid=request["entityid"]
+                    )
+                except Exception as e:
+                    return e
+            return Session._access_event_result(request, response)
+
+        return list(await asyncio.gather(*[send(request) for request in requests]))
+
+    async def access(self, targettype: str, targetid: str, recursive: bool = False) -> List[Dict[str, Any]]:
+        """Return list of ACLs for an entity, see :func:`Session.access`."""
+        targettype = Session._check_entitytype(targettype, "parent target type")
+        Session._check_entityid(targetid, "target id")
+        targetid = Session._check_id(await self._aresolve_code(targettype, targetid.lower().strip()))
+        request = Session._access_event(targettype, targetid, recursive)
+        response = await self._aevent(
+            request["method"], request["uri"], request["data"], query=request["query"], entityid=request["entityid"]
+        )
+        return Session._access_result(targettype, response)
+
+    async def revoke(self, entitytype: str, entityid: str, targettype: str, targetid: str) -> bool:
+        """Revoke access to an entity, see :func:`Session.revoke`."""
+        entitytype, targettype = Session._check_access(entitytype, entityid, targettype, targetid)
+        entityid = Session._check_id(await self.resolve_id(entitytype, entityid))
+        targetid = Session._check_id(await self._aresolve_code(targettype, targetid.lower().strip()))
+        response = None
+        if targettype in ["delivery"] and entitytype == "user":
+            response = await self._aevent("DELETE", "job/recipient", dict(recipient=entityid), entityid=targetid)
+        elif targettype in ["volume", "folder", "home", "collection"] and entitytype == "user":
+            response = await self._aevent(
+                "GET",
+                "acl/find",
+                dict(limit=1, attributes=["id"]),
+                query=f"acl WHERE entity=user:{entityid} AND target=share:{targetid}",
+            )
+            response = await self._aevent(
+                "DELETE", "acl/delete", dict(), entityid=Session._revoke_acl_id(response, entityid, targetid)
+            )
+        if response is not None:
+            return response["result"]
+        else:
+            raise AccsynException("Unsupported revoke access operation!")
+
+    async def revoke_many(
+        self,
+        entitytype: str,
+        targettype: str,
+        revocations: List[Tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> List[Any]:
+        """Revoke access of many entities to many target entities, concurrently, see :func:`Session.revoke_many`."""
+        entitytype, targettype, entityids, targetids = await self._aaccess_many_prepare(
+            entitytype, targettype, revocations
+        )
+        acls: Dict[Tuple[str, str], str] = dict()
+        if entitytype == "user" and targettype in ["volume", "folder", "home", "collection"]:
+            for query in Session._revoke_many_queries(entityids, targetids):
+                skip = 0
+                while True:
+                    page = await self.find(
+                        query, attributes=["id", "entity", "target"], limit=Session.DEFAULT_PAGE_SIZE, skip=skip
+                    )
+                    Session._revoke_many_store(acls, page)
+                    if len(page or []) < Session.DEFAULT_PAGE_SIZE:
+                        break
+                    skip += Session.DEFAULT_PAGE_SIZE
+        requests = Session._revoke_many_requests(entitytype, targettype, revocations, entityids, targetids, acls)
+        return await self._aaccess_many_events(requests, max_workers)
+
+    # File operations
+
+    async def ls(
+        self,
+        path: Union[str, Dict[str, Any], List[str]],
+        recursive: bool = False,
+        maxdepth: Optional[int] = None,
+        getsize: bool = False,
+        files_only: bool = False,
+        directories_only: bool = False,
+        include: Optional[Union[str, List[str]]] = None,
+        exclude: Optional[Union[str, List[str]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """List files on a share, see :func:`Session.ls`."""
+        Session._check_path(path)
+        data = Session._ls_data(path, recursive, maxdepth, getsize, files_only, directories_only, include, exclude)
+        return await self._afile_operation("GET", data)
+
+    async def getsize(
+        self,
+        path: Union[str, Dict[str, Any], List[str]],
+        include: Optional[Union[str, List[str]]] = None,
+        exclude: Optional[Union[str, List[str]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Get size of a file or directory, see :func:`Session.getsize`."""
+        Session._check_path(path)
+        return await self._afile_operation("GET", Session._getsize_data(path, include, exclude))
+
+    async def exists(self, path: Union[str, Dict[str, Any], List[str]]) -> Optional[bool]:
+        """Check if a file or directory exists, see :func:`Session.exists`."""
+        Session._check_path(path)
+        return await self._afile_operation("GET", dict(op="exists", path=path))
+
+    async def mkdir(self, path: Union[str, Dict[str, Any], List[str]]) -> Optional[Any]:
+        """Create a directory on a share, see :func:`Session.mkdir`."""
+        Session._check_path(path)
+        return await self._afile_operation("POST", dict(op="mkdir", path=path))
+
+    async def rename(
+        self,
+        path: Union[str, Dict[str, Any], List[str]],
+        path_to: Union[str, Dict[str, Any], List[str]],
+    ) -> Optional[Any]:
+        """Rename a file/directory on a share, see :func:`Session.rename`."""
+        Session._check_path(path)
+        Session._check_path(path_to, "destination path")
+        return await self._afile_operation("PUT", dict(op="rename", path=path, path_to=path_to))
+
+    async def mv(
+        self,
+        path_src: Union[str, Dict[str, Any], List[str]],
+        path_dst: Union[str, Dict[str, Any], List[str]],
+    ) -> Optional[Any]:
+        """Move a file/directory on a share, see :func:`Session.mv`."""
+        Session._check_path(path_src, "source path")
+        Session._check_path(path_dst, "destination path")
+        return await self._afile_operation("PUT", dict(op="move", path=path_src, path_to=path_dst))
+
+    async def delete(self, path: Union[str, Dict[str, Any], List[str]], force: bool = False) -> Optional[Any]:
+        """Delete a file/directory on a share, see :func:`Session.delete`."""
+        Session._check_path(path)
+        return await self._afile_operation("POST", dict(op="delete", path=path, force=force))
+
+    # Settings
+
+    async def get_setting(
+        self,
+        name: Optional[str] = None,
+        entitytype: str = 'workspace',
+        entityid: Optional[str] = None,
+        integration: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
+        """Retrive *name* setting value, see :func:`Session.get_setting`."""
+        evt_data = dict(entitytype=entitytype, name=name)
+        if integration:
+            evt_data['integration'] = integration
+        evt_data['data'] = data
+        response = await self._aevent("GET", "setting", evt_data, entityid=entityid)
+        return response.get("result")
+
+    async def get_settings(
+        self,
+        entitytype: Optional[str] = None,
+        entityid: Optional[str] = None,
+        recursive: bool = False,
+        upstream: bool = False,
+        omit_defaults: bool = True,
+        share: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Return settings JSON for an entity, see :func:`Session.get_settings`."""
+        payload: Dict[str, Any] = dict(
+            entitytype=entitytype.lower().strip() if entitytype else entitytype,
+            recursive=recursive,
+            upstream=upstream,
+            omit_defaults=omit_defaults,
+        )
+        if share:
+            payload["share"] = share
+        response = await self._aevent("GET", "setting", payload, entityid=entityid)
+        return cast(Dict[str, Any], response.get("result") or {})
+
+    async def set_setting(self, entitytype: str, name: str, value: str, entityid: Optional[str] = None) -> bool:
+        """Set a setting for an entity, see :func:`Session.set_setting`."""
+        payload = Session._setting_data(entitytype, name)
+        assert value is not None and isinstance(value, str), "Invalid value supplied, must be of string type!"
+        payload["value"] = value
+        response = await self._aevent("PUT", "setting", payload, entityid=entityid)
+        return bool(response.get("result"))
+
+    async def delete_setting(self, entitytype: str, name: str, entityid: Optional[str] = None) -> bool:
+        """Delete a setting for an entity, see :func:`Session.delete_setting`."""
+        payload = Session._setting_data(entitytype, name)
+        response = await self._aevent("DELETE", "setting", payload, entityid=entityid)
+        return bool(response.get("result"))
+
+    # Internal utility functions
+
+    async def flush(self) -> Dict[Tuple[str, str], Union[Optional[Dict[str, Any]], Exception]]:
+        """Send updates pending in the write-behind buffer now, see :func:`Session.flush`."""
+        if self._session._write_behind is None:
+            return dict()
+        if self._write_behind_alock is None:
+            self._write_behind_alock = asyncio.Lock()
+        async with self._write_behind_alock:
+            pending = self._session._write_behind.take()
+            semaphore = asyncio.Semaphore(self._session._pool_maxsize)
+
+            async def send(entitytype: str, entityid: str, data: Dict[str, Any]) -> Any:
+                async with semaphore:
+                    try:
+                        return await self._aupdate_event(entitytype, entityid, data)
+                    except Exception as e:
+                        return e
+
+            results = await asyncio.gather(*[send(*update) for update in pending])
+            return self._session._write_behind_record(pending, list(results))
+
+    def _write_behind_put(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Utility; Queue an update to be sent by the flush task, starting it if needed."""
+        buffer = cast(WriteBehindBuffer, self._session._write_behind)
+        was_empty = 0 == len(buffer)
+        retval = buffer.put(entitytype, entityid, data)
+        self._session._invalidate_entity(entityid)
+        if self._write_behind_task is None:
+            self._write_behind_closing = False
+            self._write_behind_event = asyncio.Event()
+            self._write_behind_task = asyncio.get_running_loop().create_task(self._awrite_behind_run())
+        if was_empty or buffer.is_due():
+            cast(asyncio.Event, self._write_behind_event).set()
+        return retval
+
+    async def _awrite_behind_run(self) -> None:
+        """Utility; Flush task, sending pending updates when due until the session is closed."""
+        buffer = cast(WriteBehindBuffer, self._session._write_behind)
+        event = cast(asyncio.Event, self._write_behind_event)
+        while not self._write_behind_closing:
+            try:
+                await asyncio.wait_for(event.wait(), timeout=buffer.get_wait_time())
+            except asyncio.TimeoutError:
+                pass
+            event.clear()
+            if not self._write_behind_closing and buffer.is_due():
+                await self.flush()
+
+    async def _aresolve_code(self, entitytype: str, ident: str) -> str:
+        """Resolve *ident* if a code of an entity type having unique codes, see :func:`Session._resolve_code`."""
+        if entitytype.lower().strip() in UNIQUE_ENTITY_TYPES:
+            return await self.resolve_id(entitytype, ident)
+        return ident
+
+    async def _aexpand(self, query: Union[str, Query], entities: List[Dict[str, Any]], expand: List[str]) -> None:
+        """Attach entities referenced by *expand* attributes of *entities*, see :func:`Session._expand`."""
+        expanded: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = dict()
+        references, missing = self._session._expand_prepare(query, entities, expand, expanded, threading.Lock())
+        for entitytype, entityids in missing.items():
+            fetched = await self.get_entities(entitytype, entityids)
+            expanded.update(((entitytype, entityid), entity) for entityid, entity in fetched.items())
+        Session._expand_attach(references, expanded)
+
+    async def _afind_schema(self, uri: str, data: Dict[str, Any]) -> Optional[List[Any]]:
+        """Return entity types or attributes from schema cache, see :func:`Session._find_schema`."""
+        scope, key = self._session._get_schema_scope(), Session._get_schema_key(uri, data)
+        schema_cache = self._session._schema_cache
+        assert schema_cache is not None, "Session has no schema cache!"
+        result, stale = schema_cache.get(scope, key)
+        if result is None or (stale and self._session._backend_version is None):
+            return await self._afetch_schema(scope, key, uri, data)
+        if stale and self._session._begin_schema_refresh(key):
+            task = asyncio.get_running_loop().create_task(self._arefresh_schema(scope, key, uri, data))
+            self._schema_tasks.add(task)
+            task.add_done_callback(self._schema_tasks.discard)
+        return result
+
+    async def _afetch_schema(self, scope: str, key: str, uri: str, data: Dict[str, Any]) -> Optional[List[Any]]:
+        result = Session._find_result(await self._aevent("GET", uri, data))
+        schema_cache = self._session._schema_cache
+        if schema_cache is not None and result is not None:
+            schema_cache.put(scope, key, result)
+        return result
+
+    async def _arefresh_schema(self, scope: str, key: str, uri: str, data: Dict[str, Any]) -> None:
+        try:
+            await self._afetch_schema(scope, key, uri, data)
+        except Exception as e:
+            Session._warning(f"Could not refresh schema {key}: {e}", False)
+        finally:
+            with self._session._schema_lock:
+                self._session._schema_refreshing.discard(key)
+
+    async def _afile_operation(self, method: str, data: Dict[str, Any]) -> Optional[Any]:
+        """Perform a workspace file operation, returning the result."""
+        response = await self._aevent(method, "workspace/file", data)
+        if response:
+            return response["result"]
+        return None
+
+    # Rest API
+
+    def _get_aiohttp_session(self) -> Any:
+        """Return the aiohttp client session, created on first use within the running event loop."""
+        if self._aiohttp_session is None:
+            try:
+                import aiohttp
+            except ImportError as ie:
+                logging.error(
+                    "aiohttp module is not installed, please install it with 'pip install aiohttp' or add it to your"
+                    " PYTHONPATH"
+                )
+                raise ie
+            self._aiohttp_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._session._pool_maxsize, ssl=False, force_close=not self._session._keep_alive
+                ),
+            )
+        return self._aiohttp_session
+
+    async def _arest(
+        self,
+        method: str,
+        hostname: Optional[str],
+        uri: str,
+        data: Optional[Dict[str, Any]],
+        timeout: Optional[int] = None,
+        ssl: bool = True,
+        port: Optional[int] = None,
+        quiet: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        content_encoding: Optional[str] = None,
+        sample: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """(Utility) Make a non-blocking REST call to accsyn backend, see :func:`Session._rest`."""
+        import aiohttp
+        import yarl
+
+        request = self._session._prepare_rest(
+            method,
+            hostname,
+            uri,
+            data,
+            timeout=timeout,
+            ssl=ssl,
+            port=port,
+            headers=headers,
+            body=body,
+            content_encoding=content_encoding,
+        )
+        http = self._get_aiohttp_session()
+        connect_timeout, read_timeout = request["timeout"]
+        t_start = int(round(time.time() * 1000))
+        retries = dict(connect=0, read=0, status=0)
+        replayable = Session._is_replayable(method, data)
+        url = request["url"]
+        if request["params"] is not None:
+            # Pre-quoted query string, tell aiohttp not to re-encode
+            url = yarl.URL(f"{url}?{request['params']}", encoded=True)
+        self._session._verbose(
+            "REST %s %s, data: %s", method, request["url"], _LazyFormat(self._session._printable, data)
+        )
+        while True:
+            t_sent = time.perf_counter()
+            try:
+                async with http.request(
+                    request["method"],
+                    url,
+                    data=request["body"],
+                    headers=request["headers"],
+                    timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                ) as r:
+                    if sample is not None:
+                        sample["request_seconds"] = time.perf_counter() - t_sent
+                    status = r.status
+                    retry_after = r.headers.get("Retry-After")
+                    # Decode response as it arrives, instead of holding both raw body and text in memory
+                    text = await AsyncSession._aread_text(r)
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                kind = "connect" if AsyncSession._is_aiohttp_connect_error(e) else "read"
+                if self._session._retry_policy.allows(kind, retries, replayable):
+                    await asyncio.sleep(self._session._retry_delay(request, kind, retries))
+                    continue
+                raise AccsynException(Session._unreachable_message(request, quiet=quiet))
+            if self._session._retry_policy.is_retryable_status(status) and self._session._retry_policy.allows(
+                "status", retries, replayable
+            ):
+                await asyncio.sleep(
+                    self._session._retry_delay(request, "status", retries, status=status, retry_after=retry_after)
+                )
+                continue
+            break
+        if Session._is_encoding_rejected(status, text, content_encoding):
+            raise _ContentEncodingRejected(cast(str, content_encoding))
+        return self._session._decode_rest_response(request, text, t_start, quiet=quiet)
+
+    @staticmethod
+    async def _aread_text(r: Any) -> str:
+        """Utility; Decode (decompressed) aiohttp response body to text as it is read from the connection."""
+        decoder = codecs.getincrementaldecoder(r.charset or "utf-8")(errors="replace")
+        text = [decoder.decode(chunk) async for chunk in r.content.iter_chunked(RESPONSE_CHUNK_SIZE)]
+        text.append(decoder.decode(b"", final=True))
+        return "".join(text)
+
+    @staticmethod
+    def _is_aiohttp_connect_error(e: BaseException) -> bool:
+        """Utility; Check if an aiohttp exception happened before the request could reach the backend."""
+        import aiohttp
+
+        connect_errors = [aiohttp.ClientConnectorError]
+        if hasattr(aiohttp, "ConnectionTimeoutError"):
+            connect_errors.append(aiohttp.ConnectionTimeoutError)
+        return isinstance(e, tuple(connect_errors))
+
+    async def _aevent(
+        self,
+        method: str,
+        uri: str,
+        data: Optional[Dict[str, Any]] = None,
+        query: Optional[str] = None,
+        entityid: Optional[str] = None,
+        timeout: Optional[int] = None,
+        ssl: bool = True,
+        quiet: bool = False,
+    ) -> Dict[str, Any]:
+        """Utility; Construct an event and send it non-blocking using REST to accsyn backend."""
+        event, payload = self._session._build_event(uri, data, query=query, entityid=entityid)
+        while True:
+            body, content_encoding, sample = self._session._encode_event(method, event, payload)
+            try:
+                response = await self._arest(
+                    method,
+                    hostname=self._session._hostname,
+                    uri="/event",
+                    data=dict(event, data=data),
+                    timeout=timeout,
+                    ssl=ssl,
+                    port=self._session._port,
+                    quiet=quiet,
+                    body=body,
+                    content_encoding=content_encoding,
+                    sample=sample,
+                )
+            except _ContentEncodingRejected as e:
+                self._session._fallback_compression(e.content_encoding)
+                continue
+            self._session._record_compression(sample, body)
+            return response
@@ -13,17 +13,29 @@ import json
 import uuid
 import hashlib
 import copy
+import random
+import functools
+import email.utils
 import webbrowser
+import concurrent.futures
+import collections
 
 import urllib.parse
 import base64
-import io
-import gzip
+import zlib
+import codecs
 
 import re
+import threading
+import queue
+import atexit
+import weakref
+import logging.handlers
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple, Union, cast, overload
 
 from ._version import __version__
 
@@ -43,6 +55,13 @@ ACCSYN_BACKEND_MASTER_HOSTNAME = f"master.{ACCSYN_BACKEND_DOMAIN}"
 ACCSYN_PORT = 443
 DEFAULT_EVENT_PAYLOAD_COMPRESS_SIZE_TRESHOLD = 100 * 1024  # Compress event data payloads above 100k
 
+# Event payload compression
+COMPRESSION_ZSTD = "zstd"  # Zstandard compressed request body, requires the zstandard module
+COMPRESSION_GZIP = "gzip"  # Gzip compressed request body
+COMPRESSION_LEGACY = "gz_data"  # Base64 encoded gzip within event JSON, supported by all backends
+COMPRESSION_CHUNK_SIZE = 1024 * 1024  # Feed compressor 1MB at a time
+RESPONSE_CHUNK_SIZE = 256 * 1024  # Read and decode responses 256KB at a time
+
 CLEARANCE_SUPPORT = "support"
 CLEARANCE_ADMIN = "admin"
 CLEARANCE_EMPLOYEE = "employee"
@@ -88,6 +107,31 @@ UNIQUE_ENTITY_TYPES = [
 ]
 # Entity types were code is unique and can be used to find the entity by its API identifier (code)
 
+EXPAND_ENTITY_TYPES = dict(
+    user="user",
+    workspace="workspace",
+    share="share",
+    volume="volume",
+    site="site",
+    engine="engine",
+    queue="queue",
+    client="client",
+)
+# Entity type referenced by plain ids in attributes, when expanding find results
+
+EXPAND_PARENT_ENTITY_TYPES = dict(
+    transfer="job",
+    delivery="job",
+    request="job",
+    stream="job",
+    task="job",
+    share="volume",
+    folder="volume",
+    home="volume",
+    collection="volume",
+)
+# Entity type of parent attribute when expanding find results, same as entity queried if not listed
+
 
 class JSONEncoder(json.JSONEncoder):
     """JSON serialiser."""
@@ -108,49 +152,765 @@ class JSONEncoder(json.JSONEncoder):
 
 
 class JSONDecoder(json.JSONDecoder):
-    """JSON deserialize."""
-
-    def decode(self, json_string: str) -> Any:
-        json_data = json.loads(json_string)
-
-        def recursive_decode(d: Any) -> Any:
-            if isinstance(d, dict):
-                for key in d.keys():
-                    if isinstance(d[key], dict):
-                        d[key] = recursive_decode(d[key])
-                    elif isinstance(d[key], list):
-                        newlist = []
-                        for i in d[key]:
-                            newlist.append(recursive_decode(i))
-                        d[key] = newlist
-                    elif Session._is_str(d[key]):
-                        dt = None
-                        if d[key].startswith("ObjectId:"):
-                            d[key] = d[key].replace("ObjectId:", "") # Just treat as string
-                        elif re.match(
-                            "^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}$",
-                            str(Session._safely_printable(d[key])),
-                        ):
-                            if len(d[key].split("-")[0]) == 4:
-                                dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S")
-                            else:
-                                dt = datetime.datetime.strptime(d[key], "%y-%m-%dT%H:%M:%S")
-                        # With millis
-                        elif re.match(
-                            "^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}$",
-                            str(Session._safely_printable(d[key])),
-                        ):
-                            if len(d[key].split("-")[0]) == 4:
-                                dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S.%f")
-                            else:
-                                dt = datetime.datetime.strptime(d[key], "%y-%m-%dT%H:%M:%S.%f")
-                        if dt is not None:
-                            # Backend sends UTC, convert to local timezone
-                            dt = dt.replace(tzinfo=datetime.timezone.utc)
-                            d[key] = dt.astimezone()
-            return d
+    """JSON deserialize, converting backend UTC date/time strings to local datetimes while parsing."""
+
+    # Date/time as sent by backend, with two or four digit year and optional milliseconds
+    _DATETIME_LENGTHS = {17, 19, 21, 23}
+    _DATETIME_PATTERN = re.compile(r"([0-9]{4}|[0-9]{2})-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}(\.[0-9]{3})?")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("object_hook", JSONDecoder._decode_object)
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def _decode_object(d: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode the string values of a JSON object, called once per object by the parser."""
+        for key, value in d.items():
+            if type(value) is str and value:
+                if value[0] == "O" and value.startswith("ObjectId:"):
+                    d[key] = value[9:]  # Just treat as string
+                elif len(value) in JSONDecoder._DATETIME_LENGTHS and (value[-3] == ":" or value[-4] == "."):
+                    dt = JSONDecoder._parse_datetime(value)
+                    if dt is not None:
+                        d[key] = dt
+        return d
+
+    @staticmethod
+    def _parse_datetime(s: str) -> Optional[datetime.datetime]:
+        """Parse a backend UTC date/time string, returning a datetime in local timezone - None if not a date/time."""
+        m = JSONDecoder._DATETIME_PATTERN.fullmatch(s)
+        if m is None:
+            return None
+        if len(m.group(1)) == 2:
+            # Same century pivot as strptime %y
+            s = ("20" if int(s[0:2]) < 69 else "19") + s
+        try:
+            dt = datetime.datetime.fromisoformat(s)
+        except ValueError:
+            return None
+        # Backend sends UTC, convert to local timezone
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return dt.astimezone(_local_timezone(int(dt.timestamp()) // 900))
+
+
+@functools.lru_cache(maxsize=4096)
+def _local_timezone(quarter: int) -> datetime.tzinfo:
+    """
+    Return the local timezone in effect at the UTC quarter of an hour (seconds since epoch divided by 900).
+
+    Timezone offsets and daylight saving transitions fall on quarter hours, caching per quarter gives the same result
+    as computing the local timezone for each datetime.
+    """
+    return cast(
+        datetime.tzinfo,
+        datetime.datetime.fromtimestamp(quarter * 900, tz=datetime.timezone.utc).astimezone().tzinfo,
+    )
+
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter keeping track of connections opened and requests served by its connection pools."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._lock_statistics = threading.Lock()
+        self._disposed_connections = 0
+        self._disposed_requests = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        # Harvest statistics from pools evicted by the pool manager, before they are gone
+        pools = self.poolmanager.pools
+        dispose_func_previous = pools.dispose_func
+
+        def dispose_func(pool: Any) -> None:
+            with self._lock_statistics:
+                self._disposed_connections += getattr(pool, "num_connections", 0)
+                self._disposed_requests += getattr(pool, "num_requests", 0)
+            if dispose_func_previous:
+                dispose_func_previous(pool)
+
+        pools.dispose_func = dispose_func
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return the number of connections opened, requests made and connections reused."""
+        with self._lock_statistics:
+            connections = self._disposed_connections
+            requests_made = self._disposed_requests
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += getattr(pool, "num_connections", 0)
+                requests_made += getattr(pool, "num_requests", 0)
+        return dict(
+            pools=len(pools),
+            connections_opened=connections,
+            connections_reused=max(0, requests_made - connections),
+            requests=requests_made,
+        )
+
+
+class RetryPolicy(object):
+    """
+    Retry policy for REST calls towards accsyn backend, with exponential backoff and jitter.
+
+    Calls that failed to connect never reached the backend and are always safe to retry. Calls that got a retryable
+    HTTP status back are only retried if replayable - events carry an unique id (eid) that is kept on retry, allowing
+    backend to de-duplicate them. Calls that timed out waiting for response are not retried unless *read_retries* is
+    given, as each attempt can block for the whole read timeout.
+
+    .. versionadded:: 3.4.0
+    """
+
+    DEFAULT_STATUSES = [429, 502, 503, 504]
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        connect_retries: Optional[int] = None,
+        read_retries: int = 0,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        jitter: bool = True,
+        statuses: Optional[List[int]] = None,
+        respect_retry_after: bool = True,
+    ) -> None:
+        """
+        :param max_retries: The maximum total amount of retries for a call, 0 disables retries.
+        :param connect_retries: The maximum amount of retries upon connection failure or timeout, defaults to
+            *max_retries*.
+        :param read_retries: The maximum amount of retries upon read failure or timeout of replayable calls, defaults
+            to 0 - opt in with care, a retry can block for another full read timeout.
+        :param backoff_factor: The base delay in seconds, doubled for each retry.
+        :param backoff_max: The maximum delay in seconds between two attempts.
+        :param jitter: If True (default), randomise the delay between zero and the backoff ("full jitter").
+        :param statuses: The HTTP statuses to retry, defaults to 429, 502, 503 and 504.
+        :param respect_retry_after: If True (default), wait for the delay given by the Retry-After response header.
+        """
+        self.max_retries = max_retries
+        self.connect_retries = max_retries if connect_retries is None else connect_retries
+        self.read_retries = read_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.statuses = statuses if statuses is not None else RetryPolicy.DEFAULT_STATUSES
+        self.respect_retry_after = respect_retry_after
+
+    def allows(self, kind: str, retries: Dict[str, int], replayable: bool) -> bool:
+        """
+        Check if another attempt can be made.
+
+        :param kind: The kind of failure: "connect", "read" or "status".
+        :param retries: The amount of retries made so far, per kind of failure.
+        :param replayable: True if the call can be safely sent again to backend.
+        :return: True if call should be retried.
+        """
+        if self.max_retries <= sum(retries.values()):
+            return False
+        if kind == "connect":
+            return retries.get("connect", 0) < self.connect_retries
+        if not replayable:
+            return False
+        if kind == "read":
+            return retries.get("read", 0) < self.read_retries
+        return True
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.statuses
+
+    def get_backoff(self, retry: int, retry_after: Optional[str] = None) -> float:
+        """
+        Return the delay in seconds before making retry number *retry* (zero based).
+
+        :param retry: The retry about to be made, 0 for the first retry.
+        :param retry_after: The Retry-After response header, if any.
+        """
+        if retry_after and self.respect_retry_after:
+            delay = RetryPolicy._parse_retry_after(retry_after)
+            if delay is not None:
+                return min(delay, self.backoff_max)
+        delay = min(self.backoff_max, self.backoff_factor * (2**retry))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: str) -> Optional[float]:
+        """Parse a Retry-After header, either delay seconds or a HTTP date."""
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            dt = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (dt - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+class CompressionPolicy(object):
+    """
+    Fixed compression policy for event payloads; compress payloads larger than a threshold, at a fixed level.
+    Keeps compression statistics per endpoint uri, for tuning.
+
+    .. versionadded:: 3.4.0
+    """
+
+    DEFAULT_LEVELS = {COMPRESSION_GZIP: 6, COMPRESSION_ZSTD: 3}
+
+    def __init__(
+        self, threshold: int = DEFAULT_EVENT_PAYLOAD_COMPRESS_SIZE_TRESHOLD, level: Optional[int] = None
+    ) -> None:
+        """
+        :param threshold: Compress payloads larger than this amount of bytes.
+        :param level: The compression level, defaults to 6 for gzip and 3 for zstd.
+        """
+        self.threshold = threshold
+        self.level = level
+        self._statistics: Dict[str, Dict[str, Any]] = dict()
+        self._lock = threading.Lock()
+
+    def get_level(self, uri: str, size: int, compression: str) -> Optional[int]:
+        """
+        Return the level to compress a payload with, or None if it should be sent uncompressed.
+
+        :param uri: The event endpoint uri, e.g. "task/create".
+        :param size: The size of serialised payload, in bytes.
+        :param compression: The compression about to be used: "zstd", "gzip" or "gz_data".
+        """
+        if size <= self.threshold:
+            return None
+        return self.level if self.level is not None else CompressionPolicy._get_default_level(compression)
+
+    def record(
+        self,
+        uri: str,
+        size: int,
+        size_sent: int,
+        level: Optional[int],
+        compress_seconds: float,
+        request_seconds: float,
+    ) -> None:
+        """
+        Record the outcome of a sent event.
+
+        :param uri: The event endpoint uri.
+        :param size: The size of serialised payload, in bytes.
+        :param size_sent: The size of request body sent, in bytes.
+        :param level: The level payload was compressed with, None if not compressed.
+        :param compress_seconds: The time spent compressing.
+        :param request_seconds: The time from sending request until response headers arrived. A proxy for the
+            upload time, as it also includes network round trip and backend processing.
+        """
+        with self._lock:
+            statistics = self._statistics.get(uri)
+            if statistics is None:
+                statistics = self._statistics[uri] = dict(
+                    requests=0,
+                    compressed=0,
+                    bytes=0,
+                    bytes_sent=0,
+                    bytes_compressed=0,
+                    bytes_compressed_sent=0,
+                    compress_seconds=0.0,
+                    request_seconds=0.0,
+                    level=None,
+                )
+            statistics["requests"] += 1
+            statistics["bytes"] += size
+            statistics["bytes_sent"] += size_sent
+            statistics["request_seconds"] += request_seconds
+            statistics["level"] = level
+            if level is not None:
+                statistics["compressed"] += 1
+                statistics["bytes_compressed"] += size
+                statistics["bytes_compressed_sent"] += size_sent
+                statistics["compress_seconds"] += compress_seconds
+
+    def get_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return compression statistics per endpoint uri; amount of requests and compressed requests, payload bytes and
+        bytes sent, time spent compressing and requesting, the last level used and the derived compression "ratio"
+        (bytes sent/payload bytes, of compressed requests) and "throughput" (bytes sent per second).
+        """
+        result = dict()
+        with self._lock:
+            for uri, statistics in self._statistics.items():
+                statistics = dict(statistics)
+                statistics["ratio"] = (
+                    statistics["bytes_compressed_sent"] / statistics["bytes_compressed"]
+                    if statistics["bytes_compressed"]
+                    else None
+                )
+                statistics["throughput"] = (
+                    statistics["bytes_sent"] / statistics["request_seconds"] if statistics["request_seconds"] else None
+                )
+                result[uri] = statistics
+        return result
+
+    @staticmethod
+    def _get_default_level(compression: str) -> int:
+        return CompressionPolicy.DEFAULT_LEVELS[
+            COMPRESSION_ZSTD if compression == COMPRESSION_ZSTD else COMPRESSION_GZIP
+        ]
+
+
+class AdaptiveCompressionPolicy(CompressionPolicy):
+    """
+    Adaptive compression policy for event payloads, deciding per endpoint uri whether to compress and at what level
+    from observed throughput and compression ratio.
+
+    Compressing pays off when the time spent compressing is less than the transfer time saved. On fast links the
+    policy lowers the level and eventually stops compressing, on slow links it raises the level. Uncompressed
+    endpoints are probed with a compressed request at regular intervals, to pick up changed conditions.
+
+    Throughput is estimated from the time until response headers arrive, which besides the upload includes round trip
+    and backend processing - overestimating transfer time and steering towards harder compression. The shortest
+    request time seen per endpoint is taken as its latency and subtracted before estimating throughput.
+
+    .. versionadded:: 3.4.0
+    """
+
+    LEVELS = {COMPRESSION_GZIP: [1, 6, 9], COMPRESSION_ZSTD: [1, 3, 9]}
+
+    def __init__(
+        self,
+        threshold: int = 1024,
+        smoothing: float = 0.3,
+        probe_interval: int = 20,
+        slow_link_factor: float = 4.0,
+    ) -> None:
+        """
+        :param threshold: Never compress payloads of this amount of bytes or less.
+        :param smoothing: The weight of a new observation in the moving averages, between 0 and 1.
+        :param probe_interval: Compress every n:th payload to an endpoint not compressing, to re-evaluate.
+        :param slow_link_factor: Raise level when transfer takes this many times longer than compressing.
+        """
+        super().__init__(threshold=threshold)
+        self.smoothing = smoothing
+        self.probe_interval = probe_interval
+        self.slow_link_factor = slow_link_factor
+        # Per uri; levels to choose from, current level (None=uncompressed), throughput and per level ratio and speed
+        self._estimates: Dict[str, Dict[str, Any]] = dict()
+        # Per uri; shortest request time seen, round trip and backend processing not spent uploading
+        self._latency: Dict[str, float] = dict()
+
+    def get_level(self, uri: str, size: int, compression: str) -> Optional[int]:
+        if size <= self.threshold:
+            return None
+        with self._lock:
+            levels = AdaptiveCompressionPolicy.LEVELS[
+                COMPRESSION_ZSTD if compression == COMPRESSION_ZSTD else COMPRESSION_GZIP
+            ]
+            estimate = self._estimates.get(uri)
+            if estimate is None or estimate["levels"] is not levels:
+                # First payload, or session fell back to another compression
+                estimate = self._estimates[uri] = dict(
+                    levels=levels, level=levels[1], skipped=0, throughput=None, ratio=dict(), speed=dict()
+                )
+            if estimate["level"] is None:
+                estimate["skipped"] += 1
+                if estimate["skipped"] < self.probe_interval:
+                    return None
+                estimate["skipped"] = 0
+                return estimate["levels"][0]
+            return estimate["level"]
+
+    def record(
+        self,
+        uri: str,
+        size: int,
+        size_sent: int,
+        level: Optional[int],
+        compress_seconds: float,
+        request_seconds: float,
+    ) -> None:
+        super().record(uri, size, size_sent, level, compress_seconds, request_seconds)
+        with self._lock:
+            latency = self._latency.get(uri)
+            self._latency[uri] = request_seconds if latency is None else min(latency, request_seconds)
+            estimate = self._estimates.get(uri)
+            if estimate is None or latency is None or request_seconds <= latency:
+                return
+            estimate["throughput"] = self._smooth(estimate["throughput"], size_sent / (request_seconds - latency))
+            if level is None or level not in estimate["levels"]:
+                return
+            estimate["ratio"][level] = self._smooth(estimate["ratio"].get(level), size_sent / size)
+            estimate["speed"][level] = self._smooth(estimate["speed"].get(level), size / max(compress_seconds, 1e-6))
+            estimate["level"] = self._choose_level(estimate, level)
+
+    def _choose_level(self, estimate: Dict[str, Any], level: int) -> Optional[int]:
+        """Hill climb from *level* just observed, to the neighbour level with least estimated cost."""
+        levels = estimate["levels"]
+        throughput = estimate["throughput"]
+
+        def cost(level: int) -> float:
+            # Seconds per payload byte; compress and then send
+            return 1 / estimate["speed"][level] + estimate["ratio"][level] / throughput
+
+        index = levels.index(level)
+        if 1 / throughput <= cost(level):
+            # Sending uncompressed is faster, try a faster level or stop compressing
+            return levels[index - 1] if 0 < index else None
+        neighbours = [levels[i] for i in [index - 1, index + 1] if 0 <= i < len(levels)]
+        best = min([level] + [l for l in neighbours if l in estimate["speed"]], key=cost)
+        if (
+            best == level
+            and index + 1 < len(levels)
+            and levels[index + 1] not in estimate["speed"]
+            and self.slow_link_factor / estimate["speed"][level] < estimate["ratio"][level] / throughput
+        ):
+            # Link bound, try spending more CPU on compression
+            return levels[index + 1]
+        return best
+
+    def _smooth(self, average: Optional[float], value: float) -> float:
+        """Exponential moving average."""
+        return value if average is None else average + self.smoothing * (value - average)
+
+
+class _TTLCache(object):
+    """Thread safe cache of values expiring after a time to live, evicting least recently used values when full."""
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        assert 0 < ttl, "Cache time to live must be positive!"
+        assert 0 < maxsize, "Cache size must be positive!"
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key => (expires, value), in least recently used order
+        self._entries: "collections.OrderedDict[Any, Tuple[float, Any]]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _lookup(self, key: Any) -> Optional[Any]:
+        """Return value cached by *key*, None if not cached or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def _store(self, key: Any, value: Any) -> None:
+        entry = (time.monotonic() + self.ttl, value)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while self.maxsize < len(self._entries):
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _discard(self, predicate: Callable[[Any, Any], bool]) -> None:
+        """Remove all keys for which *predicate* (key, value) is true."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if predicate(key, entry[1])]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return amount of cache "hits", "misses", "evictions" and current "size"."""
+        with self._lock:
+            return dict(hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._entries))
+
+
+class EntityCache(_TTLCache):
+    """
+    Per session cache of entities, keyed by entity type and id. Entries expire after a time to live, and the least
+    recently used entries are evicted when full. Thread safe.
+
+    Entities updated, deleted, deactivated or activated through the session are invalidated. Changes made by others
+    are not seen until the entry expires.
+
+    .. versionadded:: 3.4.0
+    """
+
+    DEFAULT_TTL: float = 60.0  # Seconds an entity is kept
+    DEFAULT_MAXSIZE: int = 1024  # Amount of entities kept
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        """
+        :param ttl: Seconds to keep an entity before fetching it again.
+        :param maxsize: The maximum amount of entities to keep, least recently used entities are evicted first.
+        """
+        super(EntityCache, self).__init__(ttl, maxsize)
+
+    def get(self, entitytype: str, entityid: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of cached entity, None if not cached or expired."""
+        entity = self._lookup((entitytype.lower(), entityid))
+        return copy.deepcopy(entity) if entity is not None else None
+
+    def put(self, entitytype: str, entity: Dict[str, Any]) -> None:
+        """Cache a copy of *entity*, must have an id."""
+        self._store((entitytype.lower(), entity["id"]), copy.deepcopy(entity))
+
+    def invalidate(self, entityid: str) -> None:
+        """Remove entity with *entityid*, cached as any entity type (e.g. both "job" and "transfer")."""
+        self._discard(lambda key, entity: key[1] == entityid)
+
+
+class _CodeCache(_TTLCache):
+    """Cache of entity ids by entity type and code, for entity types having unique codes."""
+
+    def get(self, entitytype: str, code: str) -> Optional[str]:
+        return self._lookup((entitytype, code))
+
+    def put(self, entitytype: str, code: str, entityid: str) -> None:
+        self._store((entitytype, code), entityid)
+
+    def invalidate(self, entityid: str) -> None:
+        """Remove all codes resolving to *entityid*, the entity might have been renamed or deleted."""
+        self._discard(lambda key, value: value == entityid)
+
+
+class SchemaCache(object):
+    """
+    Cache of entity types and attributes (schema) returned by :func:`Session.find`, kept in memory and optionally on
+    disk. Schemas are scoped by workspace, backend version and role - a backend upgrade starts with an empty cache.
+
+    Schemas older than the time to live are still returned, while refreshed from backend in the background. Thread
+    safe, and can be shared by sessions.
+
+    .. versionadded:: 3.4.0
+    """
+
+    DEFAULT_TTL: float = 24 * 60 * 60  # Seconds before a schema is refreshed
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL) -> None:
+        """
+        :param path: Directory to persist schemas in, one JSON file per scope. Schemas are kept in memory only if not
+            supplied.
+        :param ttl: Seconds before a schema is refreshed in the background.
+        """
+        assert 0 < ttl, "Schema cache time to live must be positive!"
+        self.path = os.path.expanduser(path) if path else None
+        self.ttl = ttl
+        # scope => key => (time stored, result)
+        self._scopes: Dict[str, Dict[str, Tuple[float, Any]]] = dict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, scope: str, key: str) -> Tuple[Optional[Any], bool]:
+        """
+        Return a copy of cached schema and if it should be refreshed, (None, True) if not cached.
+
+        :param scope: The scope, workspace, backend version and role.
+        :param key: The schema key, e.g. "attributes:job".
+        """
+        with self._lock:
+            entry = self._get_scope(scope).get(key)
+            if entry is None:
+                self._misses += 1
+                return None, True
+            self._hits += 1
+        return copy.deepcopy(entry[1]), entry[0] + self.ttl <= time.time()
+
+    def put(self, scope: str, key: str, result: Any) -> None:
+        """Cache a copy of schema *result*, and persist scope if a path is set."""
+        with self._lock:
+            entries = self._get_scope(scope)
+            entries[key] = (time.time(), copy.deepcopy(result))
+            if self.path:
+                self._write_scope(scope, entries)
+
+    def clear(self) -> None:
+        """Remove all cached schemas, also from disk."""
+        with self._lock:
+            for scope in list(self._scopes):
+                self._scopes[scope] = dict()
+                if self.path:
+                    self._write_scope(scope, self._scopes[scope])
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Return amount of cache "hits" and "misses"."""
+        with self._lock:
+            return dict(hits=self._hits, misses=self._misses)
+
+    def _get_scope(self, scope: str) -> Dict[str, Tuple[float, Any]]:
+        """Return schemas of *scope*, read from disk on first use. Must be called with lock held."""
+        entries = self._scopes.get(scope)
+        if entries is None:
+            entries = self._scopes[scope] = self._read_scope(scope)
+        return entries
+
+    def _get_scope_path(self, scope: str) -> str:
+        return os.path.join(self.path, re.sub(r"[^A-Za-z0-9_.-]", "_", scope) + ".json")
+
+    def _read_scope(self, scope: str) -> Dict[str, Tuple[float, Any]]:
+        if not self.path:
+            return dict()
+        try:
+            with open(self._get_scope_path(scope), "r") as f:
+                d = json.load(f, cls=JSONDecoder)
+            return {key: (entry["time"], entry["result"]) for key, entry in d.items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Missing or unreadable, will be fetched again
+            return dict()
+
+    def _write_scope(self, scope: str, entries: Dict[str, Tuple[float, Any]]) -> None:
+        """Write schemas of *scope* to disk, replacing the previous file atomically."""
+        p = self._get_scope_path(scope)
+        p_temp = f"{p}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(p_temp, "w") as f:
+                json.dump(
+                    {key: dict(time=entry[0], result=entry[1]) for key, entry in entries.items()}, f, cls=JSONEncoder
+                )
+            os.replace(p_temp, p)
+        except OSError as e:
+            Session._warning(f"Could not write schema cache {p}: {e}", False)
+
+
+class WriteBehindBuffer(object):
+    """
+    Buffer of pending entity updates, for sessions deferring and coalescing updates (write-behind). Updates of the
+    same entity are merged, last write wins per attribute, and sent when the oldest update has been pending for the
+    flush interval or when the maximum amount of entities are pending. A failed update is sent again with the next
+    flush, merged beneath a newer update of the entity if pending, until it failed the maximum amount of attempts.
+    Thread safe.
+
+    .. versionadded:: 3.4.0
+    """
+
+    DEFAULT_INTERVAL: float = 1.0  # Seconds an update is kept pending at most
+    DEFAULT_MAX_PENDING: int = 100  # Amount of pending entities triggering a flush
+    DEFAULT_MAX_ATTEMPTS: int = 3  # Times an update is sent before given up
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        """
+        :param interval: Seconds to keep an update pending before sending it.
+        :param max_pending: The amount of entities with pending updates that triggers sending them at once.
+        :param max_attempts: The amount of times a failing update is sent before it is given up.
+        """
+        assert 0 < interval, "Interval must be positive!"
+        assert 0 < max_pending, "Maximum amount of pending entities must be positive!"
+        assert 0 < max_attempts, "Maximum amount of attempts must be positive!"
+        self.interval = interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self._pending: Dict[Tuple[str, str], Dict[str, Any]] = collections.OrderedDict()
+        self._attempts: Dict[Tuple[str, str], int] = dict()  # Failed attempts of updates requeued
+        self._since: Optional[float] = None  # When the oldest pending update was queued
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge update *data* into the pending update of entity, return a copy of the pending update with the id."""
+        with self._lock:
+            key = (entitytype.lower(), entityid)
+            pending = self._pending.setdefault(key, dict())
+            pending.update(copy.deepcopy(data))
+            self._queued += 1
+            if self._since is None:
+                self._since = time.monotonic()
+            return dict(id=entityid, **copy.deepcopy(pending))
+
+    def take(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Remove and return all pending updates, as (entity type, id, data) in order of first update."""
+        with self._lock:
+            pending = [(entitytype, entityid, data) for (entitytype, entityid), data in self._pending.items()]
+            self._pending.clear()
+            self._since = None
+            return pending
+
+    def is_due(self) -> bool:
+        """Return True if pending updates should be sent."""
+        return self.get_wait_time() == 0
+
+    def get_wait_time(self) -> Optional[float]:
+        """Return seconds until pending updates should be sent, None if nothing is pending."""
+        with self._lock:
+            if self._since is None:
+                return None
+            if self.max_pending <= len(self._pending):
+                return 0
+            return max(0, self._since + self.interval - time.monotonic())
+
+    def record(self, entitytype: str, entityid: str, data: Dict[str, Any], error: Optional[Exception]) -> bool:
+        """
+        Record the outcome of sending a pending update, requeuing it if it failed unless it failed the maximum amount
+        of attempts. A newer update of the entity pending wins per attribute.
 
-        return recursive_decode(json_data)
+        :return: True if the failed update was requeued.
+        """
+        with self._lock:
+            key = (entitytype.lower(), entityid)
+            attempts = self._attempts.pop(key, 0) + 1
+            if error is None:
+                self._sent += 1
+                return False
+            if self.max_attempts <= attempts:
+                self._failed += 1
+                return False
+            self._pending[key] = dict(data, **self._pending.get(key, dict()))
+            self._attempts[key] = attempts
+            self._retried += 1
+            if self._since is None:
+                self._since = time.monotonic()
+            return True
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        :return: A dictionary with the amount of updates queued, entity updates sent, retried and failed (given up),
+            and entities with updates pending.
+        """
+        with self._lock:
+            return dict(
+                queued=self._queued,
+                sent=self._sent,
+                retried=self._retried,
+                failed=self._failed,
+                pending=len(self._pending),
+            )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_zstandard() -> Optional[Any]:
+    """Return the zstandard module if installed, None otherwise."""
+    try:
+        import zstandard
+
+        return zstandard
+    except ImportError:
+        return None
+
+
+class _LazyFormat(object):
+    """Defer building a log message argument until the message is formatted."""
+
+    __slots__ = ("_fn", "_args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any) -> None:
+        self._fn = fn
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._fn(*self._args))
 
 
 def _load_env_file(path: str, override: bool = False) -> None:
@@ -195,13 +955,214 @@ def _load_env_file(path: str, override: bool = False) -> None:
         logging.error(traceback.format_exc())
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_query(query: str) -> Tuple[str, ...]:
+    """Split *query* into its parts at whitespace outside of quotes and parentheses, cached per query string."""
+    # Scenarios:
+    #   entities
+    #   attributes WHERE entitytype='job'
+    #   Job WHERE code='my_transfer'
+    #   Job WHERE (dest='lars@edit.com' OR ..)
+
+    # First replace tabs with spaces, remove double spaces
+    is_escaped = False
+    is_at_whitespace = False
+    query = (query or "").replace("\t", " ").replace("\n", "").strip()
+    parts = []
+    idx_part_start = 0
+    paranthesis_depth = 0
+    for idx in range(0, len(query)):
+        if query[idx] == " ":
+            if not is_escaped and paranthesis_depth == 0:
+                if not is_at_whitespace:
+                    is_at_whitespace = True
+                    if idx_part_start < idx:
+                        # Add this part
+                        parts.append(query[idx_part_start:idx])
+                idx_part_start = idx + 1
+        else:
+            is_at_whitespace = False
+            if query[idx] == '"':
+                is_escaped = not is_escaped
+            elif query[idx] == "(":
+                if not is_escaped:
+                    paranthesis_depth += 1
+            elif query[idx] == ")":
+                if not is_escaped:
+                    paranthesis_depth -= 1
+    if idx_part_start < len(query):
+        parts.append(query[idx_part_start:])
+    assert len(parts) == 1 or 3 <= len(parts), (
+        "Query has invalid syntax; statements can either be "
+        'single ("<entity>"") or with a WHERE statement '
+        '("<(sub)entity> WHERE {<entity>.}id=..{ AND ..}"")'
+    )
+    assert (
+        len(parts) == 1 or parts[1].strip().lower() == "where"
+    ), f'Invalid query "{query}", should be on the form "<entitytype> where <expression>".'
+    return tuple(parts)
+
+
+class QueryParameter(object):
+    """A named parameter of a :class:`Query`, bound to a value with :func:`Query.bind`."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"QueryParameter({self.name!r})"
+
+
+class Query(object):
+    """
+    Structured query builder, compiling to accsyn query syntax. Queries are immutable and compiled once, supply a
+    query to :func:`Session.find` and friends instead of a query string to also skip parsing it::
+
+        running = Query("Job").where(status="running", user=Query.param("user"))
+        jobs = session.find(running.bind(user=user_id))
+
+    .. versionadded:: 3.4.0
+    """
+
+    _PARAMETER_PATTERN = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+    def __init__(
+        self,
+        entitytype: str,
+        _tokens: Optional[Tuple[Tuple[bool, Any], ...]] = None,
+        _params: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        :param entitytype: The type of entity to query (job, share, user, ..).
+        """
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), "Invalid entity type supplied, must be of string type!"
+        self._entitytype = entitytype.strip()
+        # Compiled expression; (is parameter, text or parameter name) tokens
+        self._tokens = _tokens or tuple()
+        self._params = _params or dict()
+        self._compiled: Optional[str] = None
+
+    @staticmethod
+    def param(name: str) -> QueryParameter:
+        """Return a named parameter to use as value in :func:`where`, bound with :func:`bind`."""
+        return QueryParameter(name)
+
+    @property
+    def entitytype(self) -> str:
+        return self._entitytype
+
+    @property
+    def parameters(self) -> List[str]:
+        """The names of all parameters of this query."""
+        return list(dict.fromkeys(value for is_param, value in self._tokens if is_param))
+
+    def where(self, *expressions: str, **conditions: Any) -> "Query":
+        """
+        Return a new query, further restricted by *expressions* and *conditions*.
+
+        :param expressions: Expressions on accsyn query format, e.g. "priority>50" or "priority>{min_priority}" where
+            {min_priority} is a parameter.
+        :param conditions: Attributes that should equal a value, or a parameter created by :func:`param`. List values
+            are matched with the "in" operator.
+        :return: The new query, all expressions and conditions must be true (AND).
+        """
+        tokens = list(self._tokens)
+        for expression in expressions:
+            assert 0 < len(expression or "") and Session._is_str(expression), "Invalid expression supplied!"
+            if tokens:
+                tokens.append((False, " AND "))
+            tokens.append((False, "("))
+            idx = 0
+            for match in Query._PARAMETER_PATTERN.finditer(expression):
+                tokens.append((False, expression[idx : match.start()]))
+                tokens.append((True, match.group(1)))
+                idx = match.end()
+            tokens.append((False, expression[idx:] + ")"))
+        for attribute, value in conditions.items():
+            if tokens:
+                tokens.append((False, " AND "))
+            operator = " in " if isinstance(value, (list, tuple, set)) else "="
+            if isinstance(value, QueryParameter):
+                tokens.append((False, attribute + operator))
+                tokens.append((True, value.name))
+            else:
+                tokens.append((False, attribute + operator + Query._quote(value)))
+        return Query(self._entitytype, _tokens=tuple(tokens), _params=self._params)
+
+    def bind(self, **params: Any) -> "Query":
+        """Return a new query, with parameter *params* bound to values."""
+        return Query(self._entitytype, _tokens=self._tokens, _params=dict(self._params, **params))
+
+    @property
+    def expression(self) -> str:
+        """The compiled expression, empty if query has no conditions."""
+        if self._compiled is None:
+            result = []
+            for is_param, value in self._tokens:
+                if is_param:
+                    if value not in self._params:
+                        raise AccsynException(f"Query parameter '{value}' is not bound!")
+                    result.append(Query._quote(self._params[value]))
+                else:
+                    result.append(value)
+            self._compiled = "".join(result)
+        return self._compiled
+
+    def __str__(self) -> str:
+        expression = self.expression
+        return f"{self._entitytype} WHERE {expression}" if expression else self._entitytype
+
+    def __repr__(self) -> str:
+        return f"Query({str(self)!r})"
+
+    @staticmethod
+    def _quote(value: Any) -> str:
+        """
+        Utility; Return *value* on accsyn query syntax, raise exception if it cannot be expressed - the syntax has
+        no escaping of quotes or list separators.
+        """
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return str(value)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = json.loads(json.dumps(value, cls=JSONEncoder))
+        elif isinstance(value, (list, tuple, set)):
+            items = [str(v) for v in value]
+            if any("," in item for item in items):
+                raise AccsynException(f"Cannot query list {items}, values must not contain commas!")
+            value = ",".join(items)
+        value = str(value)
+        if "'" in value and '"' in value:
+            raise AccsynException(f"Cannot query value {value!r}, it must not contain both single and double quotes!")
+        return f'"{value}"' if "'" in value else f"'{value}'"
+
+
 class Session(object):
     """accsyn API session object."""
 
     DEFAULT_CONNECT_TIMEOUT: int = 10  # Wait 10 seconds for connection
     DEFAULT_TIMEOUT: int = 2 * 60  # Wait 2 minutes for response
+    DEFAULT_POOL_CONNECTIONS: int = 4  # Amount of hosts to keep connection pools for
+    DEFAULT_POOL_MAXSIZE: int = 10  # Amount of connections to keep alive per host
+    DEFAULT_PAGE_SIZE: int = 1000  # Amount of entities to fetch per page when iterating
+    RESOLVE_ID_TTL: int = 5 * 60  # Seconds to cache the id of an entity code
+    RESOLVE_ID_CACHE_SIZE: int = 10000  # Amount of entity codes to cache ids for
+    RESOLVE_ID_BATCH_SIZE: int = 100  # Amount of entity codes to look up per query
+    GET_ENTITIES_BATCH_SIZE: int = 100  # Amount of entity ids to fetch per query
+    UPDATE_MANY_CHUNK_SIZE: int = 500  # Amount of tasks to update per event
+    CREATE_MANY_CHUNK_SIZE: int = 500  # Amount of tasks to create per event, and entities between checkpoints
 
     _p_logfile: Optional[str] = None
+    _loggers_logfile: Dict[str, logging.Logger] = dict()  # Buffered logfile loggers, per path
+    _lock_logfile = threading.Lock()
+    # Amount of log lines to buffer before writing to logfile, warnings are written directly
+    LOGFILE_BUFFER_SIZE: int = 100
+    _connect_upon_init: bool = True  # Resolve endpoint and login when constructed
 
     @property
     def username(self) -> str:
@@ -215,6 +1176,10 @@ class Session(object):
     def connect_timeout(self) -> int:
         return self._connect_timeout
 
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
     def __init__(
         self,
         workspace: Optional[str] = None,
@@ -230,6 +1195,15 @@ class Session(object):
         connect_timeout: Optional[int] = None,
         domain: Optional[str] = None,
         path_envfile: Optional[str] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        keep_alive: bool = True,
+        retry: Optional[Union[int, RetryPolicy]] = None,
+        compression: Optional[str] = None,
+        compression_policy: Optional[CompressionPolicy] = None,
+        entity_cache: Optional[Union[bool, EntityCache]] = None,
+        schema_cache: Optional[Union[bool, SchemaCache]] = None,
+        write_behind: Optional[Union[bool, WriteBehindBuffer]] = None,
     ) -> None:
         """
         Initiate a new API session object. Throws exception upon authentication failure.
@@ -247,6 +1221,26 @@ class Session(object):
         :param connect_timeout: Timeout in seconds for API calls - waiting for connection.
         :param domain: (Backward compatibility) The accsyn domain (or read from ACCSYN_DOMAIN environment variable)
         :param path_envfile: Path to .env file to load credentials from (or read from ACCSYN_CREDENTIALS_PATH environment variable)
+        :param pool_connections: The number of hosts to keep HTTP connection pools for.
+        :param pool_maxsize: The maximum number of connections to keep alive per host, raise when making concurrent calls.
+        :param keep_alive: If True (default), connections are kept alive and reused between API calls.
+        :param retry: The retry policy for failed API calls, or the maximum amount of retries. Defaults to
+            :class:`RetryPolicy` with 3 retries, 0 disables retries.
+        :param compression: How to compress large event payloads; "gz_data" (default) compresses the payload within
+            the event, supported by all backends. Opt in to a "zstd" or "gzip" compressed request body for backends
+            accepting it, those rejecting it are detected and the session falls back to "gz_data".
+        :param compression_policy: Decides when and how hard to compress event payloads, defaults to
+            :class:`CompressionPolicy` compressing payloads above 100KB. Use :class:`AdaptiveCompressionPolicy` to
+            adapt to observed throughput and compression ratio.
+        :param entity_cache: Cache entities returned by :func:`get_entity` and :func:`find_one` by id; True for an
+            :class:`EntityCache` with default time to live and size, or a configured :class:`EntityCache`. Disabled by
+            default.
+        :param schema_cache: Cache entity types and attributes returned by :func:`find`; True for an in memory
+            :class:`SchemaCache`, or a configured :class:`SchemaCache` - for example persisted on disk. Disabled by
+            default.
+        :param write_behind: Defer and coalesce updates made with :func:`update`, sending them in the background;
+            True for a :class:`WriteBehindBuffer` with default flush interval and size, or a configured
+            :class:`WriteBehindBuffer`. Disabled by default.
 
         .. deprecated:: 3.1.0
             Use the :param workspace: parameter instead
@@ -270,7 +1264,55 @@ class Session(object):
         self._pretty_json = pretty_json
         self._proxy = proxy
         self._dev = os.environ.get('AS_DEV', 'false') in ['true', '1']
-        Session._p_logfile = path_logfile
+        self._keep_alive = keep_alive
+        self._pool_maxsize = pool_maxsize or Session.DEFAULT_POOL_MAXSIZE
+        if retry is None:
+            retry = RetryPolicy()
+        elif isinstance(retry, int):
+            retry = RetryPolicy(max_retries=retry)
+        self._retry_policy = retry
+        if compression is None:
+            compression = COMPRESSION_LEGACY
+        assert compression in [
+            COMPRESSION_ZSTD,
+            COMPRESSION_GZIP,
+            COMPRESSION_LEGACY,
+        ], f"Unsupported compression {compression}!"
+        if compression == COMPRESSION_ZSTD and _get_zstandard() is None:
+            Session._warning('Zstandard compression requires the "zstandard" module, falling back to gzip.')
+            compression = COMPRESSION_GZIP
+        self._compression = compression
+        self._compression_policy = compression_policy or CompressionPolicy()
+        if entity_cache is True:
+            entity_cache = EntityCache()
+        self._entity_cache: Optional[EntityCache] = entity_cache or None
+        self._code_cache = _CodeCache(Session.RESOLVE_ID_TTL, Session.RESOLVE_ID_CACHE_SIZE)
+        if schema_cache is True:
+            schema_cache = SchemaCache()
+        self._schema_cache: Optional[SchemaCache] = schema_cache or None
+        self._schema_refreshing: Set[str] = set()  # Schema keys being refreshed in the background
+        self._schema_lock = threading.Lock()
+        self._backend_version: Optional[str] = None
+        if write_behind is True:
+            write_behind = WriteBehindBuffer()
+        self._write_behind: Optional[WriteBehindBuffer] = write_behind if write_behind is not False else None
+        self._write_behind_thread: Optional[threading.Thread] = None
+        self._write_behind_wakeup = threading.Event()
+        self._write_behind_closing = False
+        self._write_behind_lock = threading.Lock()  # Pending updates are sent one flush at a time, in order
+        self._write_behind_exit: Optional[Callable[[], None]] = None  # Sends pending updates at interpreter exit
+        # Connection pooling, shared by all REST calls made by this session
+        self._http_adapter = _PooledHTTPAdapter(
+            pool_connections=pool_connections or Session.DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=self._pool_maxsize,
+        )
+        self._http = requests.Session()
+        # Ask for compressed responses, in all encodings urllib3 can decode - zstd requires 'backports.zstd' module
+        self._http.headers["Accept-Encoding"] = ", ".join(ACCEPT_ENCODING.split(","))
+        self._http.mount("https://", self._http_adapter)
+        self._http.mount("http://", self._http_adapter)
+        if path_logfile:
+            Session._p_logfile = path_logfile
         self._role = CLEARANCE_NONE
         self._verbose(f"Creating accsyn Python API session (v{__version__})")
         if not workspace:
@@ -297,32 +1339,85 @@ class Session(object):
         self._port = port
         self._timeout = timeout or Session.DEFAULT_TIMEOUT
         self._connect_timeout = connect_timeout or Session.DEFAULT_CONNECT_TIMEOUT
-        if self._hostname is None:
-            if self._dev:
-                self._hostname = "127.0.0.1"
-            else:
-                # Resolve workspace hostname
-                response = self._rest(
-                    "GET",
-                    ACCSYN_BACKEND_MASTER_HOSTNAME,
-                    "J3PKTtDvolDMBtTy6AFGA",
-                    dict(ident=workspace),
-                )
-                # Store hostname
-                if "message" in response:
-                    raise AccsynException(response["message"])
-                result = response.get('result', dict())
-                assert "hostname" in result, f"No API endpoint hostname were provided for workspace {workspace}!"
-                self._hostname = result["hostname"]
-                if self._port is None:
-                    self._port = result["port"]
-        if self._port is None:
-            self._port = ACCSYN_PORT if not self._dev else 8181
         self._workspace = workspace
         self._username = username
         self._api_key = api_key
         self._last_message = None
-        self._login()
+        if self._connect_upon_init:
+            self._resolve_endpoint()
+            self._login()
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release resources held by the session, sending pending updates and closing pooled connections.
+
+        .. versionadded:: 3.4.0
+        """
+        if self._write_behind is not None:
+            self._write_behind_stop()
+        self._http.close()
+        Session._flush_logfile()
+
+    def get_pool_statistics(self) -> Dict[str, int]:
+        """
+        Return HTTP connection pool statistics for this session.
+
+        .. versionadded:: 3.4.0
+
+        :return: A dictionary with the amount of pools, connections opened, connections reused and requests made.
+        """
+        return self._http_adapter.get_statistics()
+
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        max_workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Any]:
+        """
+        Run *fn* on each of *items* concurrently on a bounded thread pool, sharing this session.
+
+        .. versionadded:: 3.4.0
+
+        :param fn: The function to call with each item, for example a session function bound to its leading arguments
+            with functools.partial.
+        :param items: The items to process.
+        :param max_workers: The maximum amount of concurrent calls, defaults to the connection pool size.
+        :param progress: Optional callback, called with the amount of items done and total amount of items as each
+            item completes.
+        :return: List of results, in order of *items*. Items that failed hold the exception raised instead.
+        """
+        items = list(items)
+        results: List[Any] = [None] * len(items)
+        if len(items) == 0:
+            return results
+        max_workers = max_workers or self._pool_maxsize
+        if self._pool_maxsize < max_workers:
+            self._verbose(
+                f"Running {max_workers} concurrent calls with a connection pool size of {self._pool_maxsize}, "
+                "connections will not be reused!"
+            )
+        done = 0
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_workers, len(items)), thread_name_prefix="accsyn_api"
+        ) as executor:
+            futures = {executor.submit(fn, item): idx for idx, item in enumerate(items)}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+                done += 1
+                if progress:
+                    progress(done, len(items))
+        return results
 
     @staticmethod
     def get_hostname() -> str:
@@ -341,15 +1436,12 @@ class Session(object):
          :return: The message.
         """
         if Session._p_logfile:
-            with open(Session._p_logfile, "a") as f:
-                try:
-                    if standout:
-                        f.write("-" * 80 + "\n")
-                    f.write(s + "\n")
-                    if standout:
-                        f.write("-" * 80 + "\n")
-                finally:
-                    f.flush()
+            logger = Session._get_logfile_logger(Session._p_logfile)
+            if standout:
+                logger.info("-" * 80)
+            logger.info(s)
+            if standout:
+                logger.info("-" * 80)
         else:
             if standout:
                 logging.info("-" * 80)
@@ -362,31 +1454,111 @@ class Session(object):
         """Retreive error message from last API call."""
         return self._last_message
 
+    def _resolve_endpoint(self) -> None:
+        """Resolve the hostname and port of the workspace API endpoint, unless already known."""
+        if self._hostname is None:
+            if self._dev:
+                self._hostname = "127.0.0.1"
+            else:
+                # Resolve workspace hostname, do not expose credentials
+                response = self._rest(
+                    "GET",
+                    ACCSYN_BACKEND_MASTER_HOSTNAME,
+                    "J3PKTtDvolDMBtTy6AFGA",
+                    dict(ident=self._workspace),
+                    headers=dict(),
+                )
+                self._store_endpoint(response)
+        if self._port is None:
+            self._port = ACCSYN_PORT if not self._dev else 8181
+
+    def _store_endpoint(self, response: Dict[str, Any]) -> None:
+        """Store the workspace API endpoint hostname and port from master *response*."""
+        if "message" in response:
+            raise AccsynException(response["message"])
+        result = response.get('result', dict())
+        assert "hostname" in result, f"No API endpoint hostname were provided for workspace {self._workspace}!"
+        self._hostname = result["hostname"]
+        if self._port is None:
+            self._port = result["port"]
+
     def _login(self) -> bool:
         """Attempt to authenticate with accsyn using the provided credentials, returns a session ID."""
         assert self._uid is None, "Already logged in!"
-        headers = {
-            "Authorization": f"basic {Session._base64_encode(self._username)}:{Session._base64_encode(self._api_key)}",
-            "X-Accsyn-Workspace": self._workspace,
-        }
         response = self._rest(
             "PUT",
             self._hostname,
             "/api/login",
             dict(),
-            headers=headers,
+            headers=self._login_headers(),
             port=self._port,
         )
-        # Store session key
-        if 'message' in response:
-            raise AccsynException(response["message"])
-        assert "result" in response, "No result were provided!"
+        return self._store_login(response)
+
+    def _login_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"basic {Session._base64_encode(self._username)}:{Session._base64_encode(self._api_key)}",
+            "X-Accsyn-Workspace": self._workspace,
+        }
+
+    def _store_login(self, response: Dict[str, Any]) -> bool:
+        """Store session key, role and user ID from login *response*."""
+        if 'message' in response:
+            raise AccsynException(response["message"])
+        assert "result" in response, "No result were provided!"
         result = response["result"]
         self._role = result["role"]
         self._uid = result["id"]
         self._session_id = result["session_id"]
+        self._backend_version = result.get("version") or None
+        if self._backend_version is None and self._schema_cache is not None:
+            Session._warning(
+                "Backend did not report its version, cached schemas will not be invalidated upon backend upgrade but"
+                f" refetched when older than {self._schema_cache.ttl}s.",
+                False,
+            )
         return True
 
+    # Validation, shared with AsyncSession
+
+    @staticmethod
+    def _check_entitytype(entitytype: str, what: str = "entity type") -> str:
+        """Utility; Validate *entitytype*, return it normalised."""
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), f"Invalid {what} supplied, must be of string type!"
+        return entitytype.lower().strip()
+
+    @staticmethod
+    def _check_entityid(entityid: str, what: str = "entity ID") -> str:
+        """Utility; Validate *entityid*, an id or code."""
+        assert 0 < len(entityid or "") and Session._is_str(
+            entityid
+        ), f"Invalid {what} supplied, must be of string type!"
+        return entityid
+
+    @staticmethod
+    def _check_path(path: Union[str, Dict[str, Any], List[str]], what: str = "path") -> None:
+        """Utility; Validate an accsyn file *path*."""
+        assert 0 < len(path or "") and (
+            Session._is_str(path) or isinstance(path, (dict, list))
+        ), f"No {what} supplied, or not a string/list/dict!"
+
+    @staticmethod
+    def _check_id(entityid: Optional[str]) -> str:
+        """Utility; Validate that *entityid* is a resolved entity id."""
+        assert re.match("^[a-z0-9]{24}$", (entityid or "")), "Please supply a valid entity ID!"
+        return cast(str, entityid)
+
+    @staticmethod
+    def _check_access(entitytype: str, entityid: str, targettype: str, targetid: str) -> Tuple[str, str]:
+        """Utility; Validate a grant or revocation, return the entity and target types normalised."""
+        entitytype = Session._check_entitytype(entitytype)
+        Session._check_entityid(entityid)
+        targettype = Session._check_entitytype(targettype, "target entity type")
+        Session._check_entityid(targetid, "target entity ID")
+        return entitytype, targettype
+
     # Create
 
     def create(
@@ -405,6 +1577,183 @@ class Session(object):
         :param allow_duplicates: (jobs and tasks) Allow duplicates to be created.
         :return: The created entity data, as dictionary.
         """
+        uri, data = Session._create_event(entitytype, data, allow_duplicates=allow_duplicates)
+        d = self._event(
+            "POST",
+            uri,
+            data,
+            entityid=entityid,
+        )
+        return Session._create_result(d)
+
+    def create_many(
+        self,
+        entitytype: str,
+        items: Iterable[Dict[str, Any]],
+        entityid: Optional[str] = None,
+        allow_duplicates: Optional[bool] = None,
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        checkpoint: Optional[str] = None,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+    ) -> Dict[int, Union[Dict[str, Any], Exception]]:
+        """
+        Create many entities, concurrently and chunk by chunk. A failure only fails the items affected, and a
+        checkpoint file allows resuming from where a previous run stopped.
+
+        Tasks are created in chunks of *chunk_size* tasks per event beneath parent job *entityid*, other entity types
+        one entity per event. Items are consumed from *items* a chunk at a time, allowing a generator to be supplied.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The type of entities to create (task, job, user, share, ..)
+        :param items: The entity data, dictionaries.
+        :param entityid: For creating sub entities (tasks), this is the parent (job) id.
+        :param allow_duplicates: (jobs and tasks) Allow duplicates to be created.
+        :param chunk_size: The amount of tasks to create per event, and amount of other entities to create between
+            checkpoints. Defaults to 500.
+        :param concurrency: The maximum amount of concurrent events, defaults to the connection pool size.
+        :param checkpoint: Path to a checkpoint file, recording the items created. Items recorded are skipped when
+            resuming, which requires the same items in the same order. Removed when all items were created.
+        :param progress: Optional callback, called with the amount of items done and total amount of items (None if
+            unknown) as each chunk completes.
+        :return: Dictionary by item index, holding the created entity or the exception raised. Items created by a
+            previous run only hold the entity id. Items the backend did not return an entity with id for, e.g. tasks of
+            a chunk not returning one entity per task, hold an exception and are not recorded as done - have
+            *allow_duplicates* off to not create them twice when resuming.
+        """
+        entitytype, chunk_size = Session._create_many_check(entitytype, chunk_size)
+        concurrency = concurrency or self._pool_maxsize
+        total = len(items) if isinstance(items, collections.abc.Sized) else None
+        done = Session._create_many_load_checkpoint(checkpoint, entitytype, entityid)
+        results: Dict[int, Union[Dict[str, Any], Exception]] = dict()
+
+        def create_unit(unit: List[Tuple[int, Dict[str, Any]]]) -> Any:
+            data = [item for _, item in unit] if entitytype == "task" else unit[0][1]
+            return self.create(entitytype, data, entityid=entityid, allow_duplicates=allow_duplicates)
+
+        for units in Session._create_many_rounds(entitytype, items, done, results, chunk_size, concurrency):
+            for unit, result in zip(units, self.map(create_unit, units, max_workers=concurrency)):
+                Session._create_many_store(unit, result, results, done)
+            Session._create_many_save_checkpoint(checkpoint, entitytype, entityid, done)
+            if progress:
+                progress(len(results), total)
+        Session._create_many_finish_checkpoint(checkpoint, results)
+        return results
+
+    @staticmethod
+    def _create_many_check(entitytype: str, chunk_size: Optional[int]) -> Tuple[str, int]:
+        """Utility; Validate a bulk create, return the entity type normalised and the chunk size."""
+        entitytype = (entitytype or "").lower().strip()
+        assert entitytype, "You must provide the entity type to create!"
+        chunk_size = chunk_size or Session.CREATE_MANY_CHUNK_SIZE
+        assert 0 < chunk_size, "Chunk size must be positive!"
+        return entitytype, chunk_size
+
+    @staticmethod
+    def _create_many_rounds(
+        entitytype: str,
+        items: Iterable[Dict[str, Any]],
+        done: Dict[str, str],
+        results: Dict[int, Union[Dict[str, Any], Exception]],
+        chunk_size: int,
+        concurrency: int,
+    ) -> Iterator[List[List[Tuple[int, Dict[str, Any]]]]]:
+        """
+        Utility; Yield rounds of units to create concurrently, a unit being a chunk of (index, item) tasks or a
+        single other entity. Items recorded as done in checkpoint are skipped, with their id put in *results*.
+        """
+        unit_size = chunk_size if entitytype == "task" else 1
+        round_size = chunk_size * concurrency if entitytype == "task" else chunk_size
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        for idx, item in enumerate(items):
+            if done.get(str(idx)):
+                results[idx] = dict(id=done[str(idx)])
+                continue
+            assert isinstance(item, dict) and 0 < len(item), f"Invalid create data supplied for item {idx}!"
+            pending.append((idx, item))
+            if round_size <= len(pending):
+                yield [pending[i : i + unit_size] for i in range(0, len(pending), unit_size)]
+                pending = []
+        if pending:
+            yield [pending[i : i + unit_size] for i in range(0, len(pending), unit_size)]
+
+    @staticmethod
+    def _create_many_store(
+        unit: List[Tuple[int, Dict[str, Any]]],
+        result: Any,
+        results: Dict[int, Union[Dict[str, Any], Exception]],
+        done: Dict[str, str],
+    ) -> None:
+        """Utility; Store the outcome of creating *unit* per item, recording created items as done."""
+        if isinstance(result, Exception):
+            for idx, _ in unit:
+                results[idx] = result
+            return
+        created = result if isinstance(result, list) else [result]
+        if len(created) != len(unit):
+            # Not one entity per item returned, cannot tell which were created - fail them to have them retried
+            e = AccsynException(
+                f"Create returned {len(created) if result is not None else 'no'} entities for {len(unit)} item(s),"
+                f" outcome unknown: {result}"
+            )
+            created = [e] * len(unit)
+        for (idx, _), entity in zip(unit, created):
+            if not isinstance(entity, Exception) and not (isinstance(entity, dict) and entity.get("id")):
+                entity = AccsynException(f"Create did not return an entity id, outcome unknown: {entity}")
+            results[idx] = entity
+            if not isinstance(entity, Exception):
+                done[str(idx)] = entity["id"]
+
+    @staticmethod
+    def _create_many_load_checkpoint(
+        checkpoint: Optional[str], entitytype: str, entityid: Optional[str]
+    ) -> Dict[str, str]:
+        """Utility; Return ids of items created by a previous run, by item index, from *checkpoint*."""
+        if not checkpoint or not os.path.exists(checkpoint):
+            return dict()
+        with open(checkpoint, "r") as f:
+            d = json.load(f)
+        if d.get("entitytype") != entitytype or d.get("entityid") != entityid:
+            raise AccsynException(
+                f"Checkpoint {checkpoint} was recorded creating {d.get('entitytype')} entities"
+                f"{' beneath ' + d['entityid'] if d.get('entityid') else ''}, cannot resume!"
+            )
+        Session._info(f"Resuming from checkpoint {checkpoint}, {len(d['done'])} item(s) already created.", False)
+        return d["done"]
+
+    @staticmethod
+    def _create_many_save_checkpoint(
+        checkpoint: Optional[str], entitytype: str, entityid: Optional[str], done: Dict[str, str]
+    ) -> None:
+        """Utility; Record the items created in *checkpoint*, replacing it atomically."""
+        if not checkpoint:
+            return
+        p_temp = f"{checkpoint}.{os.getpid()}.tmp"
+        with open(p_temp, "w") as f:
+            json.dump(dict(entitytype=entitytype, entityid=entityid, done=done), f)
+        os.replace(p_temp, checkpoint)
+
+    @staticmethod
+    def _create_many_finish_checkpoint(
+        checkpoint: Optional[str], results: Dict[int, Union[Dict[str, Any], Exception]]
+    ) -> None:
+        """Utility; Remove *checkpoint* if all items were created, otherwise tell how to resume."""
+        if not checkpoint or not os.path.exists(checkpoint):
+            return
+        failed = sum(1 for result in results.values() if isinstance(result, Exception))
+        if failed == 0:
+            os.remove(checkpoint)
+        else:
+            Session._warning(f"{failed} item(s) failed to be created, run again to resume from {checkpoint}.")
+
+    @staticmethod
+    def _create_event(
+        entitytype: str,
+        data: Union[str, Dict[str, Any], List[Dict[str, Any]]],
+        allow_duplicates: Optional[bool] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Utility; Validate and load create *data*, return the event uri and data to POST."""
         entitytype = (entitytype or "").lower().strip()
         assert entitytype, "You must provide the entity type to create!"
         if Session._is_str(data):
@@ -439,12 +1788,13 @@ class Session(object):
             "task",
         ]:
             data["allow_duplicates"] = allow_duplicates
-        d = self._event(
-            "POST",
-            f"{entitytype}/{uri}",
-            data,
-            entityid=entityid,
-        )
+        return f"{entitytype}/{uri}", data
+
+    @staticmethod
+    def _create_result(
+        d: Optional[Dict[str, Any]],
+    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Utility; Extract the created entity, or entities, from a create response."""
         if d:
             if "result" in d:
                 if len(d["result"]) == 1:
@@ -453,12 +1803,13 @@ class Session(object):
                     return d["result"]
             else:
                 return d
+        return None
 
     # Query
 
     def find(
         self,
-        query: str,
+        query: Union[str, "Query"],
         entityid: Optional[str] = None,
         attributes: Optional[List[str]] = None,
         finished: Optional[bool] = None,
@@ -470,11 +1821,13 @@ class Session(object):
         create: bool = False,
         update: bool = False,
         single_entity_query: bool = False,
-    ) -> Optional[List[Dict[str, Any]]]:
+        lazy: bool = False,
+        expand: Optional[List[str]] = None,
+    ) -> Optional[Union[List[Dict[str, Any]], "ResultSet"]]:
         """
         Return (GET) a list of entities/entitytypes/attributes based on *query*.
 
-        :param query: The query, a string on accsyn query format.
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
         :param entityid: The parent entity ID, required for sub entities "task" and "file".
         :param attributes: The attributes to return, default is to return all attributes with access.
         :param finished: (job) Search among finished/aborted jobs.
@@ -486,19 +1839,389 @@ class Session(object):
         :param create: (attributes) Return create (POST) attributes.
         :param update: (attributes) Return update (PUT) attributes.
         :param single_entity_query: It is a single entity query, tell backend to be more relaxed regarding status scope.
-        :return: List of dictionaries.
+        :param lazy: If True, return a :class:`ResultSet` that fetches nothing until used.
+        :param expand: Attributes referencing other entities to expand, e.g. ["user", "parent"]. Referenced entities
+            are fetched in batches and attached as "<attribute>_entity", None if not found. Plain ids are assumed to
+            reference the entity type named by the attribute, supply "<attribute>:<entitytype>" to override.
+        :return: List of dictionaries, or a ResultSet if *lazy*.
+
+        .. versionchanged:: 3.4.0
+            Added the *lazy* and *expand* parameters. Entity types and attributes are served from the schema cache, if
+            enabled.
+        """
+        if lazy:
+            assert not (create or update or single_entity_query), "Lazy find only supports entity queries!"
+            return ResultSet(
+                self,
+                query,
+                entityid=entityid,
+                attributes=attributes,
+                finished=finished,
+                inactive=inactive if inactive is not None else offline,
+                archived=archived,
+                limit=limit,
+                skip=skip,
+                expand=expand,
+            )
+        uri, data, expression = self._find_event(
+            query,
+            entityid=entityid,
+            attributes=attributes,
+            finished=finished,
+            inactive=inactive,
+            offline=offline,
+            archived=archived,
+            limit=limit,
+            skip=skip,
+            create=create,
+            update=update,
+            single_entity_query=single_entity_query,
+        )
+        if self._schema_cache is not None and uri in ["entitytypes", "attributes"]:
+            return self._find_schema(uri, data)
+        response = self._event("GET", uri, data, query=expression)
+        result = Session._find_result(response, single_entity_query=single_entity_query)
+        if expand and result:
+            self._expand(query, result if isinstance(result, list) else [result], expand)
+        return result
+
+    def find_iter(
+        self,
+        query: Union[str, "Query"],
+        page_size: Optional[int] = None,
+        prefetch: int = 1,
+        entityid: Optional[str] = None,
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+        limit: Optional[int] = None,
+        skip: Optional[int] = None,
+        expand: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
-        assert 0 < len(query or "") and Session._is_str(query), "Invalid query type supplied, must be of string type!"
+        Iterate entities matching *query*, fetching them page by page. The next page(s) are fetched in the background
+        while the current page is consumed, keeping at most *prefetch* + 1 pages in memory.
+
+        .. versionadded:: 3.4.0
+
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
+        :param page_size: The amount of entities to fetch per call, defaults to 1000.
+        :param prefetch: The amount of pages to fetch ahead in the background, 0 fetches pages when needed.
+        :param entityid: The parent entity ID, required for sub entities "task" and "file".
+        :param attributes: The attributes to return, default is to return all attributes with access.
+        :param finished: (job) Search among finished/aborted jobs.
+        :param inactive: (user,share) Search among inactive entities.
+        :param archived: Search among archived (deleted/purged) entities.
+        :param limit: The maximum total amount of entities to return.
+        :param skip: The amount of entities to skip.
+        :param expand: Attributes referencing other entities to expand, see :func:`find`. Each referenced entity is
+            fetched once, regardless of amount of pages referencing it.
+        :return: Generator yielding entities, one at a time.
+        """
+        page_size = page_size or Session.DEFAULT_PAGE_SIZE
+        assert 0 < page_size, "Page size must be positive!"
+        assert 0 <= prefetch, "Prefetch must be zero or positive!"
+        if limit is not None and not isinstance(limit, int):
+            raise AccsynException("Limit must be an integer!")
+        skip = skip or 0
+        # Expanded entities by entity type and id, shared by all pages
+        expanded: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = dict()
+        lock_expanded = threading.Lock()
+
+        def fetch_page(page: int) -> List[Dict[str, Any]]:
+            result = (
+                self.find(
+                    query,
+                    entityid=entityid,
+                    attributes=attributes,
+                    finished=finished,
+                    inactive=inactive,
+                    archived=archived,
+                    limit=page_size,
+                    skip=skip + page * page_size,
+                )
+                or []
+            )
+            if expand and result:
+                self._expand(query, result, expand, expanded=expanded, lock=lock_expanded)
+            return result
+
+        executor = None
+        if 0 < prefetch:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="accsyn_api")
+        pages: collections.deque = collections.deque()
+        next_page = 0
+        count = 0
+        try:
+            while True:
+                # Keep current and prefetched pages in flight, not beyond limit
+                while len(pages) < prefetch + 1 and (limit is None or next_page * page_size < limit):
+                    if executor is not None:
+                        pages.append(executor.submit(fetch_page, next_page))
+                    else:
+                        pages.append(next_page)
+                    next_page += 1
+                if not pages:
+                    return
+                page = pages.popleft()
+                result = page.result() if executor is not None else fetch_page(page)
+                for entity in result:
+                    yield entity
+                    count += 1
+                    if limit is not None and limit <= count:
+                        return
+                if len(result) != page_size:
+                    # Last page, or backend does not page this query
+                    return
+                del result
+        finally:
+            if executor is not None:
+                for future in pages:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+    def scan(
+        self,
+        entitytype: str,
+        partitions: int = 4,
+        expression: Optional[str] = None,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        ordered: bool = True,
+        page_size: Optional[int] = None,
+        prefetch: int = 2,
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Scan all entities of *entitytype*, split into *partitions* creation time ranges fetched concurrently.
+
+        Entity ids are ObjectIds starting with their creation time, each partition is a range of ids paged through
+        with skip - which stays small as it only grows within the partition. Partitions are spread evenly between
+        *start* and *end*, the first and last partition are open ended so no entity is missed regardless of bounds.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The type of entity to scan (job, share, user, ..).
+        :param partitions: The amount of id ranges to fetch concurrently.
+        :param expression: Additional query expression entities must match, e.g. "status=done".
+        :param start: Spread partitions from this creation time, defaults to creation of first entity returned. Only
+            affects how evenly entities are spread across partitions.
+        :param end: Spread partitions until this creation time, defaults to now.
+        :param ordered: If True (default), yield entities partition by partition in creation time order of the
+            partitions, otherwise as they arrive.
+        :param page_size: The amount of entities to fetch per call, defaults to 1000.
+        :param prefetch: The amount of pages each partition may fetch ahead before waiting for consumption.
+        :param attributes: The attributes to return, default is to return all attributes with access. The id is
+            always returned.
+        :param finished: (job) Search among finished/aborted jobs.
+        :param inactive: (user,share) Search among inactive entities.
+        :param archived: Search among archived (deleted/purged) entities.
+        :return: Generator yielding entities, one at a time.
+
+        .. note::
+
+            Paging with skip relies on backend returning entities of a partition in the same order on each call,
+            entities created or deleted within a partition while it is scanned may be missed or returned twice.
+        """
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), "Invalid entity type supplied, must be of string type!"
+        assert 0 < partitions, "Partitions must be positive!"
+        assert 0 < prefetch, "Prefetch must be positive!"
+        page_size = page_size or Session.DEFAULT_PAGE_SIZE
+        if attributes and "id" not in attributes:
+            attributes = ["id"] + list(attributes)
+        find_kwargs = dict(attributes=attributes, finished=finished, inactive=inactive, archived=archived)
+        if start is not None and start.tzinfo is None:
+            start = start.astimezone()
+        if end is not None and end.tzinfo is None:
+            end = end.astimezone()
+        if start is None and 1 < partitions:
+            first = self.find(
+                Session._scan_query(entitytype, expression), limit=1, **dict(find_kwargs, attributes=["id"])
+            )
+            start = Session._object_id_time(first[0]["id"]) if first else None
+        if start is None:
+            partitions = 1
+        end = end or datetime.datetime.now(datetime.timezone.utc)
+        bounds: List[Optional[str]] = [None]
+        for idx in range(1, partitions):
+            bounds.append(Session._object_id_at(start + (end - start) * idx / partitions))
+        bounds.append(None)
+        self._verbose("Scanning %s in %d partition(s): %s", entitytype, partitions, bounds)
+
+        stop = threading.Event()
+        if ordered:
+            queues = [queue.Queue(maxsize=prefetch) for _ in range(partitions)]
+        else:
+            queues = [queue.Queue(maxsize=prefetch * partitions)] * partitions
+
+        def put(q: queue.Queue, item: Tuple[str, Any]) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def scan_partition(partition: int) -> None:
+            q = queues[partition]
+            query = Session._scan_query(entitytype, expression, bounds[partition], bounds[partition + 1])
+            skip = 0
+            try:
+                while not stop.is_set():
+                    page = self.find(query, limit=page_size, skip=skip, **find_kwargs) or []
+                    if page and not put(q, ("page", page)):
+                        return
+                    if len(page) < page_size:
+                        break
+                    skip += len(page)
+                put(q, ("done", None))
+            except BaseException as e:
+                put(q, ("error", e))
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(partitions, self._pool_maxsize), thread_name_prefix="accsyn_api"
+        )
+        try:
+            for partition in range(partitions):
+                executor.submit(scan_partition, partition)
+            done = 0
+            partition = 0
+            while done < partitions:
+                kind, value = queues[partition].get()
+                if kind == "page":
+                    for entity in value:
+                        yield entity
+                elif kind == "error":
+                    raise value
+                else:
+                    done += 1
+                    partition += 1 if ordered else 0
+        finally:
+            stop.set()
+            executor.shutdown(wait=False)
+
+    def count(
+        self,
+        query: Union[str, "Query"],
+        entityid: Optional[str] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> int:
+        """
+        Return the amount of entities matching *query*, without fetching the entities - only their ids.
+
+        The backend API has no count, the id of each matching entity is still transferred. Use
+        :func:`exists_entity` to check if any entity matches, it fetches at most one id.
+
+        .. versionadded:: 3.4.0
+
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
+        :param entityid: The parent entity ID, required for sub entities "task" and "file".
+        :param finished: (job) Count among finished/aborted jobs.
+        :param inactive: (user,share) Count among inactive entities.
+        :param archived: Count among archived (deleted/purged) entities.
+        :return: The amount of entities.
+        """
+        return self._count(query, entityid=entityid, finished=finished, inactive=inactive, archived=archived)
+
+    def exists_entity(
+        self,
+        query: Union[str, "Query"],
+        entityid: Optional[str] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+    ) -> bool:
+        """
+        Check if any entity matches *query*, fetching at most the id of one entity.
+
+        .. versionadded:: 3.4.0
+
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
+        :param entityid: The parent entity ID, required for sub entities "task" and "file".
+        :param finished: (job) Search among finished/aborted jobs.
+        :param inactive: (user,share) Search among inactive entities.
+        :param archived: Search among archived (deleted/purged) entities.
+        :return: True if at least one entity matches, False otherwise.
+        """
+        result = self.find(
+            query,
+            entityid=entityid,
+            attributes=["id"],
+            finished=finished,
+            inactive=inactive,
+            archived=archived,
+            limit=1,
+        )
+        return 0 < len(result or [])
+
+    def _count(self, query: Union[str, "Query"], **find_kwargs: Any) -> int:
+        """Utility; Return the amount of entities matching *query*, fetching only their ids."""
+        find_kwargs["attributes"] = ["id"]
+        find_kwargs.pop("expand", None)
+        return len(self.find(query, **find_kwargs) or [])
+
+    @staticmethod
+    def _scan_query(
+        entitytype: str,
+        expression: Optional[str] = None,
+        lower: Optional[str] = None,
+        upper: Optional[str] = None,
+    ) -> str:
+        """Utility; Build query for entities of *entitytype* matching *expression*, with ids within bounds."""
+        conditions = []
+        if lower:
+            conditions.append(f"id>='{lower}'")
+        if upper:
+            conditions.append(f"id<'{upper}'")
+        if expression:
+            conditions.append(f"({expression})" if conditions else expression)
+        return f"{entitytype} WHERE {' AND '.join(conditions)}" if conditions else entitytype
+
+    @staticmethod
+    def _object_id_at(dt: datetime.datetime) -> str:
+        """Utility; Return the lowest possible ObjectId created at *dt*."""
+        if dt.tzinfo is None:
+            dt = dt.astimezone()
+        return f"{int(dt.timestamp()):08x}{'0' * 16}"
+
+    @staticmethod
+    def _object_id_time(entityid: str) -> datetime.datetime:
+        """Utility; Return the creation time embedded in ObjectId *entityid*."""
+        return datetime.datetime.fromtimestamp(int(entityid[:8], 16), tz=datetime.timezone.utc)
+
+    def _find_event(
+        self,
+        query: Union[str, "Query"],
+        entityid: Optional[str] = None,
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        offline: Optional[bool] = None,
+        archived: Optional[bool] = None,
+        limit: Optional[int] = None,
+        skip: Optional[int] = None,
+        create: bool = False,
+        update: bool = False,
+        single_entity_query: bool = False,
+    ) -> Tuple[str, Dict[str, Any], Optional[str]]:
+        """Utility; Validate find parameters and return the event uri, data and query expression to GET."""
+        assert Session._is_query(query), "Invalid query type supplied, must be of string type!"
 
-        retval = None
         d = self._decode_query(query)
         data = dict()
         if d["entitytype"] == "entitytypes":
             # Ask cloud server, the Python API is rarely updated and should not
             # need to know
-            d = self._event("GET", "entitytypes", dict())
-            if d:
-                retval = d["result"]
+            return "entitytypes", dict(), None
         elif d["entitytype"] == "attributes":
             assert d.get("expression"), (
                 "Please query which entity to obtain attributes for (i.e. " '"attributes WHERE entitytype=job")'
@@ -513,56 +2236,56 @@ class Session(object):
                 raise AccsynException("Create must be a boolean!")
             if update is not None and not isinstance(update, bool):
                 raise AccsynException("Update must be a boolean!")
-            response = self._event(
-                "GET",
-                "attributes",
-                dict(entitytype=entitytype, create=create, update=update),
-            )
-            if response:
-                retval = response["result"]
-        else:
-            # Validate parameters
-            if attributes:
-                if not isinstance(attributes, list):
-                    raise AccsynException("Attributes must be a list of strings!")
-                if not all(isinstance(a, str) for a in attributes):
-                    raise AccsynException("Attributes must be a list of strings!")
-                if not all(len(a.strip()) > 0 for a in attributes):
-                    raise AccsynException("Attributes must be a list of non-empty strings!")
-                attributes = [a.strip() for a in attributes]
-            if inactive is not None and not isinstance(inactive, bool):
-                raise AccsynException("Inactive must be a boolean!")
-            if finished is not None and not isinstance(finished, bool):
-                raise AccsynException("Finished must be a boolean!")
-            if archived is not None and not isinstance(archived, bool):
-                raise AccsynException("Archived must be a boolean!")
-            if limit is not None and not isinstance(limit, int):
-                raise AccsynException("Limit must be an integer!")
-            if skip is not None and not isinstance(skip, int):
-                raise AccsynException("Skip must be an integer!")
-            # Send query to server, first determine uri
-            if entityid is not None:
-                data["parent"] = entityid
-            if finished is not None:
-                data["finished"] = finished
-            if inactive is not None:
-                data["inactive"] = inactive
-            elif offline is not None:
-                Session._warning(f"The 'offline' parameter is deprecated, use 'inactive' instead.")
-                data["inactive"] = offline
-            if archived is not None:
-                data["archived"] = archived
-            if limit:
-                data["limit"] = limit
-            if skip:
-                data["skip"] = skip
-            if attributes:
-                data["attributes"] = attributes
-            if single_entity_query:
-                data["single_entity_query"] = single_entity_query
-            response = self._event("GET", f"{d['entitytype']}/find", data, query=d.get("expression"))
-            if response:
-                retval = response["result"]
+            return "attributes", dict(entitytype=entitytype, create=create, update=update), None
+        # Validate parameters
+        if attributes:
+            if not isinstance(attributes, list):
+                raise AccsynException("Attributes must be a list of strings!")
+            if not all(isinstance(a, str) for a in attributes):
+                raise AccsynException("Attributes must be a list of strings!")
+            if not all(len(a.strip()) > 0 for a in attributes):
+                raise AccsynException("Attributes must be a list of non-empty strings!")
+            attributes = [a.strip() for a in attributes]
+        if inactive is not None and not isinstance(inactive, bool):
+            raise AccsynException("Inactive must be a boolean!")
+        if finished is not None and not isinstance(finished, bool):
+            raise AccsynException("Finished must be a boolean!")
+        if archived is not None and not isinstance(archived, bool):
+            raise AccsynException("Archived must be a boolean!")
+        if limit is not None and not isinstance(limit, int):
+            raise AccsynException("Limit must be an integer!")
+        if skip is not None and not isinstance(skip, int):
+            raise AccsynException("Skip must be an integer!")
+        # Send query to server, first determine uri
+        if entityid is not None:
+            data["parent"] = entityid
+        if finished is not None:
+            data["finished"] = finished
+        if inactive is not None:
+            data["inactive"] = inactive
+        elif offline is not None:
+            Session._warning(f"The 'offline' parameter is deprecated, use 'inactive' instead.")
+            data["inactive"] = offline
+        if archived is not None:
+            data["archived"] = archived
+        if limit:
+            data["limit"] = limit
+        if skip:
+            data["skip"] = skip
+        if attributes:
+            data["attributes"] = attributes
+        if single_entity_query:
+            data["single_entity_query"] = single_entity_query
+        return f"{d['entitytype']}/find", data, d.get("expression")
+
+    @staticmethod
+    def _find_result(
+        response: Optional[Dict[str, Any]], single_entity_query: bool = False
+    ) -> Optional[Union[List[Dict[str, Any]], Dict[str, Any]]]:
+        """Utility; Extract the entities from a find *response*, the first one if *single_entity_query*."""
+        retval = None
+        if response:
+            retval = response["result"]
         if single_entity_query:
             if retval and 0 < len(retval):
                 if 1 < len(retval):
@@ -574,7 +2297,7 @@ class Session(object):
 
     def find_one(
         self,
-        query: str,
+        query: Union[str, "Query"],
         entityid: Optional[str] = None,
         attributes: Optional[List[str]] = None,
         finished: Optional[bool] = None,
@@ -585,7 +2308,7 @@ class Session(object):
         """
         Return a single entity.
 
-        :param query: The query, a string on accsyn query format.
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
         :param entityid: The parent entity ID, required for sub entities "task" and "file".
         :param attributes: The attributes to return, default is to return all attributes with access.
         :param finished: (job) Search among finished/aborted jobs.
@@ -593,19 +2316,29 @@ class Session(object):
         :param offline: (user,share) Search among offline entities. (Deprecated)
         :param archived: Search among archived (purged/deleted) entities.
         :return: If found, a single dictionary. None otherwise.
+
+        .. versionchanged:: 3.4.0
+            Only the first entity is fetched from backend. Queries on id are served from the entity cache, if enabled.
         """
-        assert 0 < len(query or "") and (
-            Session._is_str(query)
-        ), "Invalid query type supplied, must be of string type!"
-        return self.find(
+        assert Session._is_query(query), "Invalid query type supplied, must be of string type!"
+        cache_key = self._get_cache_key(query, entityid, attributes, finished, inactive or offline, archived)
+        if self._entity_cache is not None and cache_key:
+            retval = self._entity_cache.get(*cache_key)
+            if retval is not None:
+                return retval
+        retval = self.find(
             query,
             entityid=entityid,
             attributes=attributes,
             finished=finished,
             inactive=inactive or offline,
             archived=archived,
+            limit=1,
             single_entity_query=True,
         )
+        if self._entity_cache is not None and cache_key and retval:
+            self._entity_cache.put(cache_key[0], retval)
+        return retval
 
     def get_entity(self, entitytype: str, entityid: str) -> Optional[Dict[str, Any]]:
         """
@@ -613,16 +2346,24 @@ class Session(object):
         if it is inactive or archived.
 
         :param entitytype: The type of entity to return (job, share, acl, ..)
-        :param entityid: The id of the entity.
+        :param entityid: The id of the entity, or code of entity types having unique codes (user, share, queue, ..).
         :return: If found, a single dictionary. None otherwise.
+
+        .. versionchanged:: 3.4.0
+            Served from the entity cache, if enabled. Accepts entity codes.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        assert 0 < len(entityid or "") and Session._is_str(
-            entityid
-        ), "Invalid entity ID supplied, must be of string type!"
+        entitytype = Session._check_entitytype(entitytype)
+        entityid = Session._check_entityid(entityid)
+        if entitytype in UNIQUE_ENTITY_TYPES:
+            resolved_id = self.resolve_id(entitytype, entityid, missing_ok=True)
+            if resolved_id is None:
+                return None
+            entityid = resolved_id
         assert re.match("^[a-z0-9]{24}$", (entityid or "")), "Invalid entity ID supplied!"
+        if self._entity_cache is not None:
+            retval = self._entity_cache.get(entitytype, entityid)
+            if retval is not None:
+                return retval
         response = self._event("GET", f"{entitytype}/find", dict(), entityid=entityid)
         if response:
             result = response["result"]
@@ -631,9 +2372,86 @@ class Session(object):
             retval = result[0]
             if 1 < len(result):
                 Session._warning(f"Multiple entities retreived({len(result)}), returning first one.")
+            if self._entity_cache is not None:
+                self._entity_cache.put(entitytype, retval)
             return retval
         return None
 
+    def get_entities(
+        self,
+        entitytype: str,
+        entityids: List[str],
+        attributes: Optional[List[str]] = None,
+        finished: Optional[bool] = None,
+        inactive: Optional[bool] = None,
+        archived: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Return many entities by their *entitytype* and *entityids*. Ids are fetched in batches, one "id in" query per
+        batch, with batches fetched concurrently.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The type of entities to return (job, share, user, ..)
+        :param entityids: The ids of the entities.
+        :param attributes: The attributes to return, default is to return all attributes with access.
+        :param finished: (job) Search among finished/aborted jobs.
+        :param inactive: (user,share) Search among inactive entities.
+        :param archived: Search among archived (deleted/purged) entities.
+        :param batch_size: The amount of ids to fetch per query, default 100.
+        :param max_workers: The maximum amount of concurrent queries, defaults to the connection pool size.
+        :return: Dictionary of entities by id, in order of *entityids*. Ids not found map to None.
+        """
+        entitytype, result, batches = self._get_entities_prepare(entitytype, entityids, attributes, batch_size)
+        find_kwargs = dict(attributes=attributes, finished=finished, inactive=inactive, archived=archived)
+        responses = self.map(
+            lambda batch: self.find(Session._batch_query(entitytype, "id", batch), limit=len(batch), **find_kwargs),
+            batches,
+            max_workers=max_workers,
+        )
+        for response in responses:
+            if isinstance(response, Exception):
+                raise response
+            self._get_entities_store(entitytype, result, response, attributes)
+        return result
+
+    @overload
+    def resolve_id(self, entitytype: str, ident: str, missing_ok: Literal[False] = False) -> str:
+        ...
+
+    @overload
+    def resolve_id(self, entitytype: str, ident: str, missing_ok: bool) -> Optional[str]:
+        ...
+
+    @overload
+    def resolve_id(self, entitytype: str, ident: List[str], missing_ok: Literal[False] = False) -> List[str]:
+        ...
+
+    @overload
+    def resolve_id(self, entitytype: str, ident: List[str], missing_ok: bool) -> List[Optional[str]]:
+        ...
+
+    def resolve_id(
+        self, entitytype: str, ident: Union[str, List[str]], missing_ok: bool = False
+    ) -> Union[Optional[str], List[str], List[Optional[str]]]:
+        """
+        Return the id of an entity identified by its id or code, for entity types having unique codes (user, share,
+        queue, ..). Codes are looked up in batches, one query per hundred codes, and cached for five minutes.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The type of entity (user, share, queue, ..)
+        :param ident: The id or code of the entity, or a list of ids and codes.
+        :param missing_ok: If True, None is returned for codes not found instead of raising an exception.
+        :return: The id, or list of ids in the same order as *ident*.
+        """
+        entitytype, idents, resolved, codes = self._resolve_id_prepare(entitytype, ident)
+        for query in Session._resolve_id_queries(entitytype, codes):
+            self._resolve_id_store(entitytype, resolved, self.find(query, attributes=["id", "code"]))
+        return Session._resolve_id_result(entitytype, ident, idents, resolved, missing_ok)
+
     def report(self, query: str) -> str:
         """
         (Support) Return an internal backend report of an entity.
@@ -642,9 +2460,8 @@ class Session(object):
         :return: A text string containing the human readable report.
         """
         d = self._decode_query(query)
-        data = dict()
-        d = self._event("GET", f"{d['entitytype']}/report", data, query=d.get("expression"))
-        return d["report"]
+        response = self._event("GET", f"{d['entitytype']}/report", dict(), query=d.get("expression"))
+        return response["report"]
 
     def metrics(
         self, query: str, attributes: Optional[List[str]] = None, time: Optional[str] = None
@@ -660,13 +2477,18 @@ class Session(object):
         :return:
         """
         d = self._decode_query(query)
-        data = dict(
-            attributes=attributes,
+        response = self._event(
+            "GET", f"{d['entitytype']}/metrics", Session._metrics_data(attributes, time), query=d.get("expression")
         )
-        if not time is None:
+        return response["result"]
+
+    @staticmethod
+    def _metrics_data(attributes: Optional[List[str]], time: Optional[str]) -> Dict[str, Any]:
+        """Utility; Build the data of a metrics event."""
+        data: Dict[str, Any] = dict(attributes=attributes)
+        if time is not None:
             data["time"] = time
-        d = self._event("GET", f"{d['entitytype']}/metrics", data, query=d.get("expression"))
-        return d["result"]
+        return data
 
     # Update an entity
 
@@ -675,31 +2497,110 @@ class Session(object):
         Update/modify an entity.
 
         :param entitytype: The type of entity to update (job, share, acl, ..)
-        :param entityid: The entity ID of the parent entity to update (job).
+        :param entityid: The entity ID of the parent entity to update (job), or code of entity types having unique
+            codes (user, share, queue, ..).
         :param data: The dictionary containing attributes to update.
-        :return: The updated entity data, as dictionary.
+        :return: The updated entity data, as dictionary. If the session defers updates (write-behind), the pending
+            update including the entity id.
+
+        .. versionchanged:: 3.4.0
+            Accepts entity codes. Deferred and coalesced if the session was created with *write_behind*.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
+        entitytype = Session._update_check(entitytype, entityid, data)
+        entityid = self._resolve_code(entitytype, entityid)
+        if self._write_behind is not None:
+            return self._write_behind_put(entitytype, entityid, data)
+        return self._update_event(entitytype, entityid, data)
+
+    @staticmethod
+    def _check_updatable(entitytype: str) -> str:
+        """Utility; Validate that entities of *entitytype* can be updated, return it normalised."""
+        entitytype = Session._check_entitytype(entitytype)
         if entitytype == "acl":
             raise AccsynException("ACLs cannot be updated, use the grant function to grant access.")
-        assert 0 < len(entityid or "") and Session._is_str(
-            entityid
-        ), "Invalid entity ID supplied, must be of string type!"
+        return entitytype
+
+    @staticmethod
+    def _update_check(entitytype: str, entityid: str, data: Dict[str, Any]) -> str:
+        """Utility; Validate an entity update, return the entity type normalised."""
+        entitytype = Session._check_updatable(entitytype)
+        Session._check_entityid(entityid)
         assert 0 < len(data or dict()) and isinstance(
             data, dict
         ), "Invalid data supplied, must be dict and have content!"
+        return entitytype
+
+    def _update_event(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Utility; Send an entity update to backend."""
         response = self._event(
             "PUT",
             f"{entitytype}/edit",
             data,
             entityid=entityid,
         )
+        self._invalidate_entity(entityid)
         if response:
             return response["result"][0]
 
+    def patch(
+        self,
+        entitytype: str,
+        before: Optional[Dict[str, Any]],
+        after: Dict[str, Any],
+        deep: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update an entity with only the attributes that changed, skipping the update if nothing changed.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The type of entity to update (job, share, user, ..)
+        :param before: The entity as previously fetched. If None, the entity is fetched from backend by the id of
+            *after*, bypassing the entity cache.
+        :param after: The modified entity, must have the entity id. Attributes missing are left untouched.
+        :param deep: If True, only changed keys of dictionary attributes (metadata, settings, ..) are sent, requires
+            backend to merge dictionary attributes. Otherwise changed dictionary attributes are sent whole.
+        :return: The updated entity data, as dictionary. None if nothing changed.
+        """
+        Session._patch_check(after)
+        if before is None:
+            # Fetch from backend, a stale cached entity would have changes not sent or reverted
+            entityid = self._resolve_code(Session._check_entitytype(entitytype), after["id"])
+            if self._entity_cache is not None:
+                self._entity_cache.invalidate(entityid)
+            before = self.get_entity(entitytype, entityid)
+            if before is None:
+                raise AccsynException(f"{entitytype.title()} {after['id']} not found!")
+        data = Session._patch_data(before, after, deep)
+        data.pop("id", None)
+        if 0 == len(data):
+            self._verbose(f"Not updating {entitytype} {after['id']}, nothing changed.")
+            return None
+        return self.update(entitytype, after["id"], data)
+
+    @staticmethod
+    def _patch_check(after: Dict[str, Any]) -> None:
+        """Utility; Validate the modified entity of a patch."""
+        assert isinstance(after, dict) and 0 < len(
+            after.get("id") or ""
+        ), "Invalid modified entity supplied, must be dict and have the entity id!"
+
+    @staticmethod
+    def _patch_data(before: Dict[str, Any], after: Dict[str, Any], deep: bool) -> Dict[str, Any]:
+        """
+        Utility; Return the attributes of *after* differing from *before*. Dictionaries are diffed recursively if
+        *deep*, unless keys were removed - which requires sending the dictionary whole.
+        """
+        data: Dict[str, Any] = dict()
+        for key, value in after.items():
+            if key in before and before[key] == value:
+                continue
+            if deep and isinstance(value, dict) and isinstance(before.get(key), dict):
+                if set(before[key]).issubset(value):
+                    value = Session._patch_data(before[key], value, deep)
+            data[key] = value
+        return data
+
     def update_one(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         '''
         Update/modify an entity.
@@ -719,42 +2620,125 @@ class Session(object):
     def update_many(
         self,
         entitytype: str,
-        entityid: str,
-        data: List[Dict[str, Any]],
-    ) -> Optional[List[Dict[str, Any]]]:
+        entityid: Optional[Union[str, List[str]]] = None,
+        data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Optional[Union[List[Dict[str, Any]], Dict[str, Union[Dict[str, Any], Exception]]]]:
         """
-        Update/modify multiple entities - tasks beneath a job.
-
-        :param entitytype: The type of parent entity to update (job)
-        :param entityid: The id of the parent entity job to update
-        :param data: The list dictionaries containing sub entity (task) id and attributes to update.
-        :return: The updated sub entities (tasks), as dictionaries.
+        Update/modify multiple entities - tasks beneath a job, or entities of any other type.
+
+        Tasks are updated in chunks of *chunk_size* tasks per event, other entities one entity per event as accsyn
+        edits a single entity at a time. Events are run concurrently. A failing chunk of tasks is raised once all
+        chunks are done, with the tasks updated by the other chunks in the *partial_result* attribute of the
+        exception.
+
+        :param entitytype: The type of entities to update (task, job, user, share, ..)
+        :param entityid: For tasks, the id of the parent job. For other entity types, optionally a list of entity ids
+            (or codes of entity types having unique codes) to apply the same *data* to.
+        :param data: For tasks, the list of dictionaries containing task id and attributes to update. For other entity
+            types, the list of dictionaries containing entity id (or code) and attributes to update - updates of the
+            same entity are merged, or the dictionary of attributes to update on all entities in *entityid*.
+        :param chunk_size: (tasks) The amount of tasks to update per event, defaults to 500.
+        :param max_workers: The maximum amount of concurrent events, defaults to the connection pool size.
+        :return: For tasks, the updated tasks, as dictionaries. For other entity types, dictionary by entity id (or
+            code) as supplied, in order, holding the updated entity or the exception raised.
 
         .. versionchanged:: 3.2.0
             The entityid and data parameters have switched places.
 
+        .. versionchanged:: 3.4.0
+            Updates any entity type, tasks in concurrent chunks.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        assert entitytype == "task", "Only multiple 'task' entities can be updated!"
-        if entitytype == "acl":
-            raise AccsynException("ACLs cannot be updated, use the grant function to grant access.")
+        entitytype = Session._check_updatable(entitytype)
+        if entitytype != "task":
+            patches = Session._update_many_patches(entityid, data)
+            idents = list(patches)
+            entityids = (
+                self.resolve_id(entitytype, idents, missing_ok=True) if entitytype in UNIQUE_ENTITY_TYPES else idents
+            )
+
+            def update_one(item: Tuple[str, Optional[str]]) -> Optional[Dict[str, Any]]:
+                Session._update_many_check(entitytype, item[0], item[1], patches[item[0]])
+                return self.update(entitytype, item[1], patches[item[0]])
+
+            result = self.map(update_one, zip(idents, entityids), max_workers=max_workers)
+            return collections.OrderedDict(zip(idents, result))
+        chunks = Session._update_many_chunks(cast(str, entityid), cast(List[Dict[str, Any]], data), chunk_size)
+        if len(chunks) == 1:
+            responses = [self._event("PUT", f"{entitytype}/edit", data, entityid=entityid)]
+        else:
+            responses = self.map(
+                lambda chunk: self._event("PUT", f"{entitytype}/edit", chunk, entityid=entityid),
+                chunks,
+                max_workers=max_workers,
+            )
+        for d in data:
+            self._invalidate_entity(d.get("id"))
+        return Session._update_many_result(responses)
+
+    @staticmethod
+    def _update_many_chunks(
+        entityid: str, data: List[Dict[str, Any]], chunk_size: Optional[int]
+    ) -> List[List[Dict[str, Any]]]:
+        """Utility; Validate a bulk task update beneath job *entityid*, return the tasks in chunks."""
         assert 0 < len(entityid or "") and (
             Session._is_str(entityid)
         ), "Entity ID must be provided and be of string type!"
         if not re.match("^[a-z0-9]{24}$", (entityid or "")):
             raise AccsynException("Invalid parent entity ID supplied!")
         assert 0 < len(data or []) and isinstance(data, list), "Invalid data supplied, must be a list!"
-        response = self._event(
-            "PUT",
-            f"{entitytype}/edit",
-            data,
-            entityid=entityid,
-        )
-        if response:
-            return response["result"]
+        chunk_size = chunk_size or Session.UPDATE_MANY_CHUNK_SIZE
+        assert 0 < chunk_size, "Chunk size must be positive!"
+        return [data[idx : idx + chunk_size] for idx in range(0, len(data), chunk_size)]
+
+    @staticmethod
+    def _update_many_patches(
+        entityid: Optional[Union[str, List[str]]],
+        data: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Utility; Return the attributes to update by entity id (or code), merging updates of the same entity."""
+        patches: Dict[str, Dict[str, Any]] = collections.OrderedDict()
+        if entityid is not None:
+            assert isinstance(entityid, list) and 0 < len(entityid), "Invalid entity IDs supplied, must be a list!"
+            assert 0 < len(data or dict()) and isinstance(
+                data, dict
+            ), "Invalid data supplied, must be dict and have content!"
+            for ident in entityid:
+                patches[ident] = data
+        else:
+            assert 0 < len(data or []) and isinstance(data, list), "Invalid data supplied, must be a list!"
+            for d in data:
+                assert isinstance(d, dict) and d.get("id"), "Invalid data supplied, each update must have an id!"
+                attributes = {key: value for key, value in d.items() if key != "id"}
+                patches[d["id"]] = dict(patches.get(d["id"]) or dict(), **attributes)
+        for ident in patches:
+            assert Session._is_str(ident), "Invalid entity ID supplied, must be of string type!"
+        return patches
+
+    @staticmethod
+    def _update_many_check(entitytype: str, ident: str, entityid: Optional[str], data: Dict[str, Any]) -> None:
+        """Utility; Check an entity of a bulk update can be updated, raising if its code was not found."""
+        if entityid is None:
+            raise AccsynException(f"{entitytype.title()} {ident} not found!")
+        if 0 == len(data):
+            raise AccsynException(f"Nothing to update on {entitytype} {ident}!")
+
+    @staticmethod
+    def _update_many_result(responses: List[Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Utility; Return the tasks updated by chunks of a bulk task update, raising the first failure with the tasks
+        updated by the other chunks in its *partial_result* attribute.
+        """
+        result = None
+        for response in responses:
+            if response and not isinstance(response, Exception):
+                result = (result or []) + response["result"]
+        for response in responses:
+            if isinstance(response, Exception):
+                setattr(response, "partial_result", result)
+                raise response
+        return result
 
     # Entity assignment / connections
 
@@ -941,58 +2925,51 @@ class Session(object):
         :param data: ACL data, should permissions and other data.
         :return: True if assignment was a success, exception otherwise.
         """
-        # Validate entity type and id
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        assert 0 < len(entityid or "") and Session._is_str(
-            entityid
-        ), "Invalid entity ID supplied, must be of string type!"
+        entitytype, targettype = Session._check_access(entitytype, entityid, targettype, targetid)
         entityid = entityid.lower().strip()
-        if not re.match("^[a-z0-9]{24}$", (entityid or "")):
-            # Try to find entity by code if possible
-            if entitytype in UNIQUE_ENTITY_TYPES:
-                response = self._event(
-                    "GET",
-                    f"{entitytype}/find",
-                    query=f"code='{entityid}'",
-                )
-                if 0 < len(response.get("result", [])):
-                    # Use the correct ID
-                    entityid = response["result"][0]["id"]
-                else:
-                    # Allow this - user will be invited
-                    if (data or dict()).get("invite", True) is False:
-                        raise AccsynException(
-                            f"No {entitytype} found with code '{entityid}', and invite is not allowed!"
-                        )
-                    else:
-                        Session._warning(f"No {entitytype} found with code '{entityid}', will be invited!")
-            else:
-                raise AccsynException(f"Please supply a valid {entitytype} ID!")
-        # Validate target entity type and id
-        assert 0 < len(targettype or "") and Session._is_str(
-            targettype
-        ), "Invalid target entity type supplied, must be of string type!"
-        targettype = targettype.lower().strip()
-        assert 0 < len(targetid or "") and Session._is_str(
-            targetid
-        ), "Invalid entity type supplied, must be of string type!"
-        targetid = targetid.lower().strip()
-        if not re.match("^[a-z0-9]{24}$", (targetid or "")):
-            if targettype in UNIQUE_ENTITY_TYPES:
-                response = self._event(
-                    "GET",
-                    f"{targettype}/find",
-                    query=f"code='{targetid}'",
-                )
-                if len(response["result"]) == 0:
-                    raise AccsynException(f"No {targettype} found with code '{targetid}'!")
-                targetid = response["result"][0]["id"]
-            else:
-                raise AccsynException(f"Please supply a valid {targettype} ID!")
+        # Find entity by code if possible
+        entityid = Session._grant_entityid(
+            entitytype, entityid, self.resolve_id(entitytype, entityid, missing_ok=True), data
+        )
+        targetid = self.resolve_id(targettype, targetid)
+        request = Session._grant_event(entitytype, entityid, targettype, targetid, data)
         result = None
+        if request is not None:
+            response = self._event(request["method"], request["uri"], request["data"], entityid=request["entityid"])
+            result = Session._access_event_result(request, response)
+        if result is not None:
+            return result
+        else:
+            raise AccsynException("Unsupported grant access operation!")
+
+    @staticmethod
+    def _grant_entityid(
+        entitytype: str, entityid: str, resolved_id: Optional[str], data: Optional[Dict[str, Any]]
+    ) -> str:
+        """Utility; Return the id of the entity to grant access, or its code if to be invited."""
+        if resolved_id is not None:
+            return resolved_id
+        elif (data or dict()).get("invite", True) is False:
+            raise AccsynException(f"No {entitytype} found with code '{entityid}', and invite is not allowed!")
+        # Allow this - user will be invited
+        Session._warning(f"No {entitytype} found with code '{entityid}', will be invited!")
+        return entityid
+
+    @staticmethod
+    def _grant_event(
+        entitytype: str,
+        entityid: str,
+        targettype: str,
+        targetid: str,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Utility; Build the event granting *entitytype* *entityid* access to *targettype* *targetid*, ids
+        resolved.
+
+        :return: A dict with REST method, uri, data, entity id and if first result should be picked, None if
+            unsupported.
+        """
         if entitytype == "user":
             if targettype in ["delivery", "request", "stream"]:
                 # Assign a user to a delivery, expect delivery and user supplied
@@ -1002,13 +2979,7 @@ class Session(object):
                     recipient=user_id,
                     invite=(data or dict()).get("invite", True),
                 )
-                response = self._event(
-                    "PUT",
-                    f"job/recipient/add",
-                    payload,
-                    entityid=delivery_id,
-                )
-                result = response["result"]
+                return dict(method="PUT", uri="job/recipient/add", data=payload, entityid=delivery_id, first=False)
             elif targettype in ["volume", "folder", "home", "collection"]:
                 # Assign an employee user to a volume
                 assert (
@@ -1027,12 +2998,104 @@ class Session(object):
                 )
                 if (data or dict()).get("invite", True) is False:
                     payload["invite"] = False
-                response = self._event("POST", f"acl/create", payload)
-                result = response["result"][0]
-        if result is not None:
-            return result
-        else:
-            raise AccsynException("Unsupported grant access operation!")
+                return dict(method="POST", uri="acl/create", data=payload, entityid=None, first=True)
+        return None
+
+    def grant_many(
+        self,
+        entitytype: str,
+        targettype: str,
+        grants: List[Tuple[Any, ...]],
+        max_workers: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Grant many entities access to many target entities, concurrently.
+
+        Entity and target codes are resolved in batches, then each grant is made as with :func:`grant`.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The entity type that should be granted access (user).
+        :param targettype: The entity type to grant access to (volume, folder, delivery, ..)
+        :param grants: List of (entity id, target id) or (entity id, target id, ACL data) tuples, ids or codes. ACL
+            data holds permissions and other data, as with :func:`grant`.
+        :param max_workers: The maximum amount of concurrent events, defaults to the connection pool size.
+        :return: List of results in order of *grants*, the grant result or the exception raised.
+        """
+        entitytype, targettype, entityids, targetids = self._access_many_prepare(entitytype, targettype, grants)
+        requests = Session._grant_many_requests(entitytype, targettype, grants, entityids, targetids)
+        return self.map(self._access_many_event, requests, max_workers=max_workers)
+
+    def _access_many_prepare(
+        self, entitytype: str, targettype: str, pairs: List[Tuple[Any, ...]]
+    ) -> Tuple[str, str, List[Optional[str]], List[Optional[str]]]:
+        """Utility; Validate *pairs* and resolve their entity and target codes, None if not found."""
+        entitytype, targettype = Session._access_many_types(entitytype, targettype, pairs)
+        entityids = self.resolve_id(entitytype, [pair[0] for pair in pairs], missing_ok=True)
+        targetids = self.resolve_id(targettype, [pair[1] for pair in pairs], missing_ok=True)
+        return entitytype, targettype, entityids, targetids
+
+    @staticmethod
+    def _access_many_types(entitytype: str, targettype: str, pairs: List[Tuple[Any, ...]]) -> Tuple[str, str]:
+        """Utility; Validate and normalise entity types and (entity, target) *pairs*."""
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), "Invalid entity type supplied, must be of string type!"
+        assert 0 < len(targettype or "") and Session._is_str(
+            targettype
+        ), "Invalid target entity type supplied, must be of string type!"
+        assert 0 < len(pairs or []) and isinstance(pairs, list), "Invalid access supplied, must be a list!"
+        for pair in pairs:
+            assert (
+                isinstance(pair, (tuple, list))
+                and 2 <= len(pair) <= 3
+                and all(Session._is_str(ident) and 0 < len(ident.strip()) for ident in pair[:2])
+                and (len(pair) < 3 or pair[2] is None or isinstance(pair[2], dict))
+            ), f"Invalid access supplied: {pair}, must be (entity id, target id) or (entity id, target id, data) tuples!"
+        return entitytype.lower().strip(), targettype.lower().strip()
+
+    @staticmethod
+    def _grant_many_requests(
+        entitytype: str,
+        targettype: str,
+        grants: List[Tuple[Any, ...]],
+        entityids: List[Optional[str]],
+        targetids: List[Optional[str]],
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Utility; Build the event of each grant, ids resolved, or the exception telling why it cannot be made."""
+        requests: List[Union[Dict[str, Any], Exception]] = []
+        for grant, entityid, targetid in zip(grants, entityids, targetids):
+            data = grant[2] if 2 < len(grant) else None
+            try:
+                if entityid is None:
+                    if (data or dict()).get("invite", True) is False:
+                        raise AccsynException(
+                            f"No {entitytype} found with code '{grant[0]}', and invite is not allowed!"
+                        )
+                    # Allow this - user will be invited
+                    Session._warning(f"No {entitytype} found with code '{grant[0]}', will be invited!")
+                    entityid = grant[0].lower().strip()
+                if targetid is None:
+                    raise AccsynException(f"No {targettype} found with code '{grant[1]}'!")
+                request = Session._grant_event(entitytype, entityid, targettype, targetid, data)
+                if request is None:
+                    raise AccsynException("Unsupported grant access operation!")
+                requests.append(request)
+            except (AccsynException, AssertionError) as e:
+                requests.append(e)
+        return requests
+
+    def _access_many_event(self, request: Union[Dict[str, Any], Exception]) -> Any:
+        """Utility; Send the event of a grant or revocation, raising the exception if it cannot be made."""
+        if isinstance(request, Exception):
+            raise request
+        response = self._event(request["method"], request["uri"], request["data"], entityid=request["entityid"])
+        return Session._access_event_result(request, response)
+
+    @staticmethod
+    def _access_event_result(request: Dict[str, Any], response: Dict[str, Any]) -> Any:
+        """Utility; Return the result of a grant or revocation event."""
+        return response["result"][0] if request["first"] else response["result"]
 
     def access(self, targettype: str, targetid: str, recursive: bool = False) -> List[Dict[str, Any]]:
         """
@@ -1043,54 +3106,59 @@ class Session(object):
         .. versionadded:: 3.2
 
         :param targettype: The entity type to list access for (delivery, volume, folder, home, collection).
-        :param targetid: The id of the entity to list access for.
+        :param targetid: The id of the entity to list access for, or code of a share.
         :param recursive: If True, list ACLs for all shares beneath the target volume, folder or home.
         :return: List of dictionaries.
+
+        .. versionchanged:: 3.4.0
+            Accepts share codes.
         """
-        assert 0 < len(targettype or "") and Session._is_str(
-            targettype
-        ), "Invalid parent target type supplied, must be of string type!"
-        targettype = targettype.lower().strip()
-        assert 0 < len(targetid or "") and Session._is_str(
-            targetid
-        ), "Invalid target id supplied, must be of string type!"
-        targetid = targetid.lower().strip()
-        assert re.match("^[a-z0-9]{24}$", (targetid or "")), "Please supply a valid entity ID!"
-
-        if targettype.lower() in ["delivery"]:
+        targettype = Session._check_entitytype(targettype, "parent target type")
+        Session._check_entityid(targetid, "target id")
+        targetid = Session._check_id(self._resolve_code(targettype, targetid.lower().strip()))
+        request = Session._access_event(targettype, targetid, recursive)
+        response = self._event(
+            request["method"], request["uri"], request["data"], query=request["query"], entityid=request["entityid"]
+        )
+        return Session._access_result(targettype, response)
+
+    @staticmethod
+    def _access_event(targettype: str, targetid: str, recursive: bool) -> Dict[str, Any]:
+        """Utility; Build the event listing access to entity *targetid*."""
+        if targettype in ["delivery"]:
             # List recipients assigned to a delivery
-            response = self._event(
-                "GET",
-                f"job/recipients",
-                dict(),
-                entityid=targetid,
-            )
-            return response["result"]
-        elif targettype.lower() in ["volume", "folder", "home", "collection"]:
+            return dict(method="GET", uri="job/recipients", data=dict(), query=None, entityid=targetid)
+        elif targettype in ["volume", "folder", "home", "collection"]:
             # List users with access to a share
-            response = self._event(
-                "GET",
-                f"acl/find",
-                dict(recursive=recursive),
+            return dict(
+                method="GET",
+                uri="acl/find",
+                data=dict(recursive=recursive),
                 query=f"acl WHERE target=share:{targetid}",
+                entityid=None,
             )
-            result = []
-            for acl in response["result"]:
-                result.append(
-                    dict(
-                        user=acl["entity"].split(":")[1],
-                        user_hr=acl.get("entity_hr", ""),
-                        share=acl["target"].split(":")[1],
-                        share_hr=acl.get("target_hr", ""),
-                        read=acl["read"],
-                        write=acl["write"],
-                        acknowledged=acl.get("acknowledged", False),
-                        path=acl.get("path", "/"),
-                    )
+        raise AccsynException("Unsupported access operation!")
+
+    @staticmethod
+    def _access_result(targettype: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Utility; Return the recipients of a delivery, or the ACLs of a share as dictionaries."""
+        if targettype in ["delivery"]:
+            return response["result"]
+        result = []
+        for acl in response["result"]:
+            result.append(
+                dict(
+                    user=acl["entity"].split(":")[1],
+                    user_hr=acl.get("entity_hr", ""),
+                    share=acl["target"].split(":")[1],
+                    share_hr=acl.get("target_hr", ""),
+                    read=acl["read"],
+                    write=acl["write"],
+                    acknowledged=acl.get("acknowledged", False),
+                    path=acl.get("path", "/"),
                 )
-            return result
-        else:
-            raise AccsynException("Unsupported access operation!")
+            )
+        return result
 
     def revoke(self, entitytype: str, entityid: str, targettype: str, targetid: str) -> bool:
         """
@@ -1104,40 +3172,14 @@ class Session(object):
         :param targetid: The id of the entity to revoke access from.
         :param data: ACL data, should contain parent entity id and entity ids.
         :return: True if revocation was a success, exception otherwise.
+
+        .. versionchanged:: 3.4.0
+            Accepts target share codes.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        assert 0 < len(entityid or "") and Session._is_str(
-            entityid
-        ), "Invalid entity id supplied, must be of string type!"
-        entityid = entityid.lower().strip()
-        if not re.match("^[a-z0-9]{24}$", (entityid or "")):
-            # Try to find entity by code if possible
-            if entitytype in UNIQUE_ENTITY_TYPES:
-                response = self._event(
-                    "GET",
-                    f"{entitytype}/find",
-                    query=f"code='{entityid}'",
-                )
-                if 0 < len(response.get("result", [])):
-                    # Use the correct ID
-                    entityid = response["result"][0]["id"]
-                else:
-                    raise AccsynException(f"No {entitytype} found with code '{entityid}' found!")
-            else:
-                raise AccsynException(f"Please supply a valid {entitytype} ID!")
-        assert re.match("^[a-z0-9]{24}$", (entityid or "")), "Please supply a valid entity ID!"
-        assert 0 < len(targettype or "") and Session._is_str(
-            targettype
-        ), "Invalid target entity type supplied, must be of string type!"
-        targettype = targettype.lower().strip()
-        assert 0 < len(targetid or "") and Session._is_str(
-            targetid
-        ), "Invalid target entity id supplied, must be of string type!"
-        targetid = targetid.lower().strip()
-        assert re.match("^[a-z0-9]{24}$", (targetid or "")), "Please supply a valid entity ID!"
+        entitytype, targettype = Session._check_access(entitytype, entityid, targettype, targetid)
+        # Find entity by code if possible
+        entityid = Session._check_id(self.resolve_id(entitytype, entityid))
+        targetid = Session._check_id(self._resolve_code(targettype, targetid.lower().strip()))
         response = None
         if targettype in ["delivery"] and entitytype == "user":
             # Revoke user access from a delivery, expect delivery and user supplied
@@ -1155,22 +3197,129 @@ class Session(object):
             user_id = entityid
             # First, located the ACL
             response = self._event(
-                "GET", f"acl/find", dict(), query=f"acl WHERE entity=user:{user_id} AND target=share:{share_id}"
+                "GET",
+                f"acl/find",
+                dict(limit=1, attributes=["id"]),
+                query=f"acl WHERE entity=user:{user_id} AND target=share:{share_id}",
             )
-            acls = response["result"]
-            if len(acls) == 0:
-                raise AccsynException(f"No ACL found for user {user_id} and share {share_id}")
             response = self._event(
                 "DELETE",
                 f"acl/delete",
                 dict(),
-                entityid=acls[0]["id"],
+                entityid=Session._revoke_acl_id(response, user_id, share_id),
             )
         if response is not None:
             return response["result"]
         else:
             raise AccsynException("Unsupported revoke access operation!")
 
+    @staticmethod
+    def _revoke_acl_id(response: Dict[str, Any], user_id: str, share_id: str) -> str:
+        """Utility; Return the id of the ACL found for user and share, raise exception if none."""
+        acls = response["result"]
+        if len(acls) == 0:
+            raise AccsynException(f"No ACL found for user {user_id} and share {share_id}")
+        return acls[0]["id"]
+
+    def revoke_many(
+        self,
+        entitytype: str,
+        targettype: str,
+        revocations: List[Tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Revoke access of many entities to many target entities, concurrently.
+
+        Entity and target codes are resolved in batches, as are the ACLs of shares - one paged ACL query per hundred
+        revocations instead of one per revocation.
+
+        .. versionadded:: 3.4.0
+
+        :param entitytype: The entity type to revoke access for (user).
+        :param targettype: The entity type to revoke access from (volume, folder, delivery, ..)
+        :param revocations: List of (entity id, target id) tuples, ids or codes.
+        :param max_workers: The maximum amount of concurrent events, defaults to the connection pool size.
+        :return: List of results in order of *revocations*, the revoke result or the exception raised.
+        """
+        entitytype, targettype, entityids, targetids = self._access_many_prepare(entitytype, targettype, revocations)
+        acls: Dict[Tuple[str, str], str] = dict()
+        if entitytype == "user" and targettype in ["volume", "folder", "home", "collection"]:
+            for query in Session._revoke_many_queries(entityids, targetids):
+                Session._revoke_many_store(
+                    acls, list(self.find_iter(query, prefetch=0, attributes=["id", "entity", "target"]))
+                )
+        requests = Session._revoke_many_requests(entitytype, targettype, revocations, entityids, targetids, acls)
+        return self.map(self._access_many_event, requests, max_workers=max_workers)
+
+    @staticmethod
+    def _revoke_many_queries(entityids: List[Optional[str]], targetids: List[Optional[str]]) -> Iterator["Query"]:
+        """
+        Utility; Yield queries finding the ACLs of (user, share) pairs *entityids* and *targetids*, a hundred pairs
+        per query. The queries may match more ACLs than the pairs, to be paged.
+        """
+        pairs = [
+            (entityid, targetid)
+            for entityid, targetid in dict.fromkeys(zip(entityids, targetids))
+            if entityid is not None and targetid is not None
+        ]
+        for idx in range(0, len(pairs), Session.RESOLVE_ID_BATCH_SIZE):
+            batch = pairs[idx : idx + Session.RESOLVE_ID_BATCH_SIZE]
+            users = list(dict.fromkeys(f"user:{entityid}" for entityid, _ in batch))
+            shares = list(dict.fromkeys(f"share:{targetid}" for _, targetid in batch))
+            yield Session._batch_query("acl", "target", shares).where(entity=users if 1 < len(users) else users[0])
+
+    @staticmethod
+    def _revoke_many_store(acls: Dict[Tuple[str, str], str], entities: Optional[List[Dict[str, Any]]]) -> None:
+        """Utility; Store ACL ids found by (user id, share id)."""
+        for acl in entities or []:
+            entity = str(acl.get("entity") or "").split(":")[-1]
+            target = str(acl.get("target") or "").split(":")[-1]
+            acls.setdefault((entity, target), acl["id"])
+
+    @staticmethod
+    def _revoke_many_requests(
+        entitytype: str,
+        targettype: str,
+        revocations: List[Tuple[str, str]],
+        entityids: List[Optional[str]],
+        targetids: List[Optional[str]],
+        acls: Dict[Tuple[str, str], str],
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """Utility; Build the event of each revocation, ids resolved, or the exception telling why it cannot be made."""
+        requests: List[Union[Dict[str, Any], Exception]] = []
+        for revocation, entityid, targetid in zip(revocations, entityids, targetids):
+            if entityid is None:
+                requests.append(AccsynException(f"No {entitytype} found with code '{revocation[0]}'!"))
+            elif targetid is None:
+                requests.append(AccsynException(f"No {targettype} found with code '{revocation[1]}'!"))
+            elif targettype in ["delivery"] and entitytype == "user":
+                requests.append(
+                    dict(
+                        method="DELETE",
+                        uri="job/recipient",
+                        data=dict(recipient=entityid),
+                        entityid=targetid,
+                        first=False,
+                    )
+                )
+            elif targettype in ["volume", "folder", "home", "collection"] and entitytype == "user":
+                if (entityid, targetid) in acls:
+                    requests.append(
+                        dict(
+                            method="DELETE",
+                            uri="acl/delete",
+                            data=dict(),
+                            entityid=acls[(entityid, targetid)],
+                            first=False,
+                        )
+                    )
+                else:
+                    requests.append(AccsynException(f"No ACL found for user {entityid} and share {targetid}"))
+            else:
+                requests.append(AccsynException("Unsupported revoke access operation!"))
+        return requests
+
     # Deactivate/Delete an entity
 
     def offline_one(self, entitytype: str, entityid: str) -> Any:
@@ -1190,22 +3339,21 @@ class Session(object):
         .. versionadded:: 3.2
 
         :param entitytype: The type of entity to delete (job, share, acl, ..)
-        :param entityid: The id of the entity.
+        :param entityid: The id of the entity, or code of entity types having unique codes (user, share, queue, ..).
         :return: True if offline, an exception is thrown otherwise.
+
+        .. versionchanged:: 3.4.0
+            Accepts entity codes.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        assert 0 < len(entityid or "") and (
-            Session._is_str(entityid)
-        ), "Invalid entity ID supplied, must be of string type!"
+        entitytype = Session._check_entitytype(entitytype)
+        entityid = self._resolve_code(entitytype, Session._check_entityid(entityid))
         response = self._event(
             "DELETE",
             f"{entitytype}/deactivate",
             dict(),
             entityid=entityid,
         )
+        self._invalidate_entity(entityid)
         if response:
             return response["result"]
 
@@ -1214,30 +3362,36 @@ class Session(object):
         Delete(archive) an entity.
 
         :param entitytype: The type of entity to delete (job, share, acl, ..)
-        :param entityid: The id of the entity.
+        :param entityid: The id of the entity, or code of entity types having unique codes (user, share, queue, ..).
         :param data: (Optional) The dictionary containing additional delete options, such as force=True to delete even if there are active related entities.
 
         :return: True if deleted, an exception is thrown otherwise.
+
+        .. versionchanged:: 3.4.0
+            Accepts entity codes.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, provided and be of string type!"
-        entitytype = entitytype.lower().strip()
-        if entitytype == "acl":
-            raise AccsynException("ACLs cannot be deleted, use the revoke function to revoke access.")
-        assert 0 < len(entityid or "") and (
-            Session._is_str(entityid)
-        ), "Invalid entity ID supplied, provided and be of string type!"
+        entitytype = Session._delete_check(entitytype, entityid)
+        entityid = self._resolve_code(entitytype, entityid)
         response = self._event(
             "DELETE",
             f"{entitytype}/delete",
             data,
             entityid=entityid,
         )
+        self._invalidate_entity(entityid)
         if response:
             return response["result"]
         return None
 
+    @staticmethod
+    def _delete_check(entitytype: str, entityid: str) -> str:
+        """Utility; Validate an entity delete, return the entity type normalised."""
+        entitytype = Session._check_entitytype(entitytype)
+        if entitytype == "acl":
+            raise AccsynException("ACLs cannot be deleted, use the revoke function to revoke access.")
+        Session._check_entityid(entityid)
+        return entitytype
+
     def delete_many(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Any:
         """
         Delete multiple sub entities (files) beneath a parent entity.
@@ -1279,24 +3433,28 @@ class Session(object):
         """
         Activate an entity - bring back from deactivated(offline) state.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        assert 0 < len(entityident or "") and Session._is_str(
-            entityident
-        ), "Invalid entity identification supplied, must be of string type!"
-        entityident = entityident.lower().strip()
+        entitytype = Session._check_entitytype(entitytype)
+        entityident = Session._check_entityid(entityident, "entity identification").lower().strip()
+        is_id = re.match("^[a-z0-9]{24}$", entityident) is not None
         response = self._event(
             "POST",
             f"{entitytype}/activate",
             dict(),
-            entityid=entityident if re.match("^[a-z0-9]{24}$", (entityident or "")) else None,
-            query=entityident if not re.match("^[a-z0-9]{24}$", (entityident or "")) else None,
+            entityid=entityident if is_id else None,
+            query=entityident if not is_id else None,
         )
+        self._invalidate_activated(entityident, is_id)
         if response:
             return response["result"]
 
+    def _invalidate_activated(self, entityident: str, is_id: bool) -> None:
+        """Utility; Evict an activated entity from the entity cache."""
+        if is_id:
+            self._invalidate_entity(entityident)
+        elif self._entity_cache is not None:
+            # Activated by code, id unknown
+            self._entity_cache.clear()
+
     # File operations
 
     def ls(
@@ -1329,20 +3487,8 @@ class Session(object):
         .. versionadded:: 2.2.0 (app/daemon: 2.6-20)
 
         """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
-        data = dict(op="ls", path=path, download=True, recursive=recursive, getsize=getsize)
-        if maxdepth:
-            data["maxdepth"] = maxdepth
-        if directories_only:
-            data["directories_only"] = directories_only
-        if files_only:
-            data["files_only"] = files_only
-        if include:
-            data["include"] = include
-        if exclude:
-            data["exclude"] = exclude
+        Session._check_path(path)
+        data = Session._ls_data(path, recursive, maxdepth, getsize, files_only, directories_only, include, exclude)
         response = self._event("GET", "workspace/file", data)
         if response:
             return response["result"]
@@ -1366,33 +3512,64 @@ class Session(object):
 
         .. versionadded:: 2.2.0 (app/daemon: 2.6-20)
         """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
-        data = dict(
-            op="getsize",
-            path=path,
-        )
-        if include:
-            data["include"] = include
-        if exclude:
-            data["exclude"] = exclude
+        Session._check_path(path)
+        data = Session._getsize_data(path, include, exclude)
         response = self._event("GET", "workspace/file", data)
         if response:
             return response["result"]
 
-    def exists(self, path: Union[str, Dict[str, Any], List[str]]) -> Optional[bool]:
-        """
-        Check if a file or directory exists.
-
-        :param path: The accsyn path, on the form 'share=<the share>/<path>/<somewhere>'.
-        :return: True if file exists, False otherwise.
-        """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
-        data = dict(
-            op="exists",
+    @staticmethod
+    def _ls_data(
+        path: Union[str, Dict[str, Any], List[str]],
+        recursive: bool,
+        maxdepth: Optional[int],
+        getsize: bool,
+        files_only: bool,
+        directories_only: bool,
+        include: Optional[Union[str, List[str]]],
+        exclude: Optional[Union[str, List[str]]],
+    ) -> Dict[str, Any]:
+        """Utility; Build the file listing operation data."""
+        data: Dict[str, Any] = dict(op="ls", path=path, download=True, recursive=recursive, getsize=getsize)
+        if maxdepth:
+            data["maxdepth"] = maxdepth
+        if directories_only:
+            data["directories_only"] = directories_only
+        if files_only:
+            data["files_only"] = files_only
+        if include:
+            data["include"] = include
+        if exclude:
+            data["exclude"] = exclude
+        return data
+
+    @staticmethod
+    def _getsize_data(
+        path: Union[str, Dict[str, Any], List[str]],
+        include: Optional[Union[str, List[str]]],
+        exclude: Optional[Union[str, List[str]]],
+    ) -> Dict[str, Any]:
+        """Utility; Build the file size operation data."""
+        data: Dict[str, Any] = dict(
+            op="getsize",
+            path=path,
+        )
+        if include:
+            data["include"] = include
+        if exclude:
+            data["exclude"] = exclude
+        return data
+
+    def exists(self, path: Union[str, Dict[str, Any], List[str]]) -> Optional[bool]:
+        """
+        Check if a file or directory exists.
+
+        :param path: The accsyn path, on the form 'share=<the share>/<path>/<somewhere>'.
+        :return: True if file exists, False otherwise.
+        """
+        Session._check_path(path)
+        data = dict(
+            op="exists",
             path=path,
         )
         response = self._event("GET", "workspace/file", data)
@@ -1408,9 +3585,7 @@ class Session(object):
         :param path: The accsyn path, on the form 'share=<the share>/<path>/<somewhere>'.
         :return: True if file exists, False otherwise.
         """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
+        Session._check_path(path)
         data = dict(
             op="mkdir",
             path=path,
@@ -1433,12 +3608,8 @@ class Session(object):
         :param path_to: The new accsyn path, has to be within the same directory as source *path*, on the form 'share=<the share>/<path>/<somewhere>'.
         :return: True if file exists, False otherwise.
         """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
-        assert 0 < len(path_to or "") and (
-            Session._is_str(path_to) or isinstance(path_to, dict) or isinstance(path_to, list)
-        ), "No destination path supplied, or not a string/list/dict!"
+        Session._check_path(path)
+        Session._check_path(path_to, "destination path")
         data = dict(
             op="rename",
             path=path,
@@ -1462,12 +3633,8 @@ class Session(object):
         :param path_dst: The accsyn destination path, on the form 'share=<the share>/<path>/<somewhere>'.
         :return: True if file exists, False otherwise.
         """
-        assert 0 < len(path_src or "") and (
-            Session._is_str(path_src) or isinstance(path_src, dict) or isinstance(path_src, list)
-        ), "No source path supplied, or not a string/list/dict!"
-        assert 0 < len(path_dst or "") and (
-            Session._is_str(path_dst) or isinstance(path_dst, dict) or isinstance(path_dst, list)
-        ), "No destination path supplied, or not a string/list/dict!"
+        Session._check_path(path_src, "source path")
+        Session._check_path(path_dst, "destination path")
         data = dict(
             op="move",
             path=path_src,
@@ -1491,9 +3658,7 @@ class Session(object):
         :param force: Force removal of non-empty directory.
         :return: True if file exists, False otherwise.
         """
-        assert 0 < len(path or "") and (
-            Session._is_str(path) or isinstance(path, dict) or isinstance(path, list)
-        ), "No path supplied, or not a string/list/dict!"
+        Session._check_path(path)
         data = dict(
             op="delete",
             path=path,
@@ -1611,13 +3776,9 @@ class Session(object):
         :param entityid: Optional entity ID (None for workspace entity type, otherwise required).
         :return: True if setting was updated.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        assert 0 < len(name or "") and Session._is_str(name), "Invalid name supplied, must be of string type!"
+        payload = Session._setting_data(entitytype, name)
         assert value is not None and isinstance(value, str), "Invalid value supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        payload: Dict[str, Any] = dict(entitytype=entitytype, name=name, value=value)
+        payload["value"] = value
         response = self._event("PUT", "setting", payload, entityid=entityid)
         return bool(response.get("result"))
 
@@ -1635,15 +3796,17 @@ class Session(object):
         :param entityid: Optional entity ID (None for workspace entity type, otherwise required).
         :return: True if setting was deleted.
         """
-        assert 0 < len(entitytype or "") and Session._is_str(
-            entitytype
-        ), "Invalid entity type supplied, must be of string type!"
-        assert 0 < len(name or "") and Session._is_str(name), "Invalid name supplied, must be of string type!"
-        entitytype = entitytype.lower().strip()
-        payload: Dict[str, Any] = dict(entitytype=entitytype, name=name)
+        payload = Session._setting_data(entitytype, name)
         response = self._event("DELETE", "setting", payload, entityid=entityid)
         return bool(response.get("result"))
 
+    @staticmethod
+    def _setting_data(entitytype: str, name: str) -> Dict[str, Any]:
+        """Utility; Validate and build the event data addressing setting *name* of an entity type."""
+        entitytype = Session._check_entitytype(entitytype)
+        assert 0 < len(name or "") and Session._is_str(name), "Invalid name supplied, must be of string type!"
+        return dict(entitytype=entitytype, name=name)
+
 
     # Misc
     def get_api_key(self) -> str:
@@ -1665,7 +3828,7 @@ class Session(object):
         result = self._event(
             "GET",
             "client/find",
-            dict(),
+            dict(attributes=["status"]),
             query=f"user={self._uid} AND code={Session.get_hostname()} AND type={CLIENT_TYPE_APP}",
         )["result"]
         retval = None
@@ -1691,7 +3854,7 @@ class Session(object):
         result = self._event(
             "GET",
             "client/find",
-            dict(),
+            dict(attributes=["status"]),
             query=f"user={self._uid} AND code={Session.get_hostname()} AND (type={CLIENT_TYPE_SERVER} OR type={CLIENT_TYPE_USERSERVER})",
         )["result"]
         retval = None
@@ -1751,23 +3914,20 @@ class Session(object):
 
     # Internal utility functions
 
+    _SENSITIVE_VALUE_PATTERN = re.compile(r'((?:pwd|_key|token)[^"]*"[^"]*")[^"]*"')
+
     @staticmethod
     def _obscure_dict_string(s: Optional[str]) -> Optional[str]:
-        """Hide sensitive information within a string originating from a dict."""
+        """Hide sensitive information within a string originating from a dict, in a single pass."""
         if s is None:
             return s
-        for key in ["pwd", "_key", "token"]:
-            last_pos = 0
-            while True:
-                new_pos = s.find(key, last_pos)
-                if new_pos == -1:
-                    break
-                else:
-                    idx_start = s.find('"', new_pos + len(key) + 1)
-                    idx_end = s.find('"', idx_start + 1)
-                    s = s[: idx_start + 1] + "*" + s[idx_end:]
-                    last_pos = idx_start
-        return s
+        return Session._SENSITIVE_VALUE_PATTERN.sub(r'\1*"', s)
+
+    def _printable(self, d: Any) -> str:
+        """Utility; Return a printable string of *d* with sensitive information hidden, for logging."""
+        return Session._obscure_dict_string(
+            Session._safely_printable(str(d) if not self._pretty_json else Session.dump(d)).replace("'", '"')
+        )
 
     # Rest API
 
@@ -1782,6 +3942,9 @@ class Session(object):
         port: Optional[int] = None,
         quiet: bool = False,
         headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        content_encoding: Optional[str] = None,
+        sample: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         (Utility) Make a REST call to accsyn backend.
@@ -1795,9 +3958,112 @@ class Session(object):
         :param port: The remote port to connect to.
         :param quiet: If True, do not print any log messages.
         :param headers: The headers to supply, by default the session will be supplied.
+        :param body: The payload data already serialised to JSON, *data* is then only used for logging.
+        :param content_encoding: The encoding PUT/POST *body* is compressed with, "gzip" or "zstd".
+        :param sample: The compression sample of *body*, to store the time until response headers arrived in.
 
         :return: The result of request, as a JSON dict.
         """
+        request = self._prepare_rest(
+            method,
+            hostname,
+            uri,
+            data,
+            timeout=timeout,
+            ssl=ssl,
+            port=port,
+            headers=headers,
+            body=body,
+            content_encoding=content_encoding,
+        )
+        t_start = int(round(time.time() * 1000))
+        retries = dict(connect=0, read=0, status=0)
+        replayable = Session._is_replayable(method, data)
+        self._verbose("REST %s %s, data: %s", method, request["url"], _LazyFormat(self._printable, data))
+        while True:
+            try:
+                r = self._http.request(
+                    request["method"],
+                    request["url"],
+                    params=request["params"],
+                    data=request["body"],
+                    timeout=request["timeout"],
+                    verify=False,
+                    headers=request["headers"],
+                    stream=True,
+                )
+                retry_status = self._retry_policy.is_retryable_status(r.status_code) and self._retry_policy.allows(
+                    "status", retries, replayable
+                )
+                if retry_status:
+                    r.close()
+                else:
+                    if sample is not None:
+                        sample["request_seconds"] = r.elapsed.total_seconds()
+                    # Decode response as it arrives, instead of holding both raw body and text in memory
+                    text = Session._read_text(r.iter_content(RESPONSE_CHUNK_SIZE), r.encoding)
+            except requests.exceptions.RequestException as e:
+                kind = "connect" if Session._is_connect_error(e) else "read"
+                if self._retry_policy.allows(kind, retries, replayable):
+                    self._retry_wait(request, kind, retries)
+                    continue
+                raise AccsynException(self._unreachable_message(request, quiet=quiet))
+            except BaseException:
+                raise AccsynException(self._unreachable_message(request, quiet=quiet))
+            if retry_status:
+                self._retry_wait(
+                    request, "status", retries, status=r.status_code, retry_after=r.headers.get("Retry-After")
+                )
+                continue
+            break
+        if Session._is_encoding_rejected(r.status_code, text, content_encoding):
+            raise _ContentEncodingRejected(cast(str, content_encoding))
+        return self._decode_rest_response(request, text, t_start, quiet=quiet)
+
+    @staticmethod
+    def _is_encoding_rejected(status: int, text: str, content_encoding: Optional[str]) -> bool:
+        """
+        Utility; Return True if the response (*status*, *text*) to a request body compressed with *content_encoding*
+        tells it was not accepted - 415 Unsupported Media Type, or 400 Bad Request not being a backend JSON error.
+        """
+        if not content_encoding or status not in [400, 415]:
+            return False
+        if status == 415:
+            return True
+        try:
+            retval = json.loads(text)
+        except ValueError:
+            return True
+        # A backend error, e.g. validation failed, is raised as is
+        return not (isinstance(retval, dict) and ("message" in retval or "exception" in retval))
+
+    @staticmethod
+    def _read_text(chunks: Iterable[bytes], encoding: Optional[str] = None) -> str:
+        """Utility; Decode (decompressed) response body *chunks* to text as they are read from the connection."""
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        text = [decoder.decode(chunk) for chunk in chunks]
+        text.append(decoder.decode(b"", final=True))
+        return "".join(text)
+
+    def _prepare_rest(
+        self,
+        method: str,
+        hostname: Optional[str],
+        uri: str,
+        data: Optional[Dict[str, Any]],
+        timeout: Optional[int] = None,
+        ssl: bool = True,
+        port: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+        body: Optional[bytes] = None,
+        content_encoding: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        (Utility) Resolve endpoint, proxy, headers and payload of a REST call to accsyn backend.
+
+        :return: The request, as a dict with method, url, params, body, headers and (connect, read) timeout.
+        """
+        assert method.lower() in ["get", "put", "post", "delete"], f"Unsupported REST method {method}!"
         if port is None:
             port = self._port or ACCSYN_PORT
         if hostname is None:
@@ -1857,11 +4123,9 @@ class Session(object):
             data = dict()
         # Wait 10s to reach machine, 2min for it to send back data
         CONNECT_TO, READ_TO = (self.connect_timeout, timeout)
-        r = None
-        retval = None
 
         headers_effective = dict()
-        if headers:
+        if headers is not None:
             headers_effective = copy.deepcopy(headers)
         elif self._api_key:
             headers_effective = {
@@ -1871,63 +4135,107 @@ class Session(object):
         headers_effective[
             "X-Accsyn-Device"
         ] = f"PythonAPI v{__version__} @ {sys.platform} {Session.get_hostname()}({os.name})"
-        t_start = int(round(time.time() * 1000))
-        try:
-            self._verbose(f"REST {method} {url}, data: {data if not self._pretty_json else Session.str(data)}")
-            if method.lower() == "get":
-                r = requests.get(
-                    url,
-                    params=Session._url_quote(data),
-                    timeout=(CONNECT_TO, READ_TO),
-                    verify=False,
-                    headers=headers_effective,
-                )
-            elif method.lower() == "put":
-                r = requests.put(
-                    url,
-                    Session._safe_dumps(data),
-                    timeout=(CONNECT_TO, READ_TO),
-                    verify=False,
-                    headers=headers_effective,
-                )
-            elif method.lower() == "post":
-                r = requests.post(
-                    url,
-                    Session._safe_dumps(data),
-                    timeout=(CONNECT_TO, READ_TO),
-                    verify=False,
-                    headers=headers_effective,
-                )
-            elif method.lower() == "delete":
-                r = requests.delete(
-                    url,
-                    params=Session._url_quote(data),
-                    timeout=(CONNECT_TO, READ_TO),
-                    verify=False,
-                    headers=headers_effective,
-                )
-            t_end = int(round(time.time() * 1000))
-            # break
-        except BaseException:
-            # if timeout <= 0:
-            raise AccsynException(
-                f"Could not reach {hostname}:{port}! Make sure backend({hostname}) can be reached from you location and no firewall is blocking outgoing TCP traffic at port {port}. Details: {traceback.format_exc() if not quiet else '(quiet)'}"
-            )
+        if not self._keep_alive:
+            headers_effective["Connection"] = "close"
+        params = None
+        if body is None:
+            body = Session._safe_dumps(data)
+        if method.lower() in ["get", "delete"]:
+            params = urllib.parse.quote(body)
+            body = None
+        elif content_encoding:
+            headers_effective["Content-Type"] = "application/json"
+            headers_effective["Content-Encoding"] = content_encoding
+        return dict(
+            method=method.upper(),
+            url=url,
+            hostname=hostname,
+            port=port,
+            uri=uri,
+            data=data,
+            params=params,
+            body=body,
+            headers=headers_effective,
+            timeout=(CONNECT_TO, READ_TO),
+        )
+
+    @staticmethod
+    def _is_replayable(method: str, data: Optional[Dict[str, Any]]) -> bool:
+        """Utility; Check if a REST call can safely be sent again, POST only if carrying an event id to de-duplicate."""
+        return method.lower() != "post" or "eid" in (data or dict())
+
+    @staticmethod
+    def _is_connect_error(e: BaseException) -> bool:
+        """Utility; Check if a requests exception happened before the request could reach the backend."""
+        if isinstance(e, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(e, requests.exceptions.ConnectionError):
+            reason = getattr(e.args[0], "reason", None) if e.args else None
+            return isinstance(reason, requests.packages.urllib3.exceptions.NewConnectionError)
+        return False
+
+    def _retry_delay(
+        self,
+        request: Dict[str, Any],
+        kind: str,
+        retries: Dict[str, int],
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ) -> float:
+        """Utility; Count retry of *kind* and return the backoff delay to wait before retrying."""
+        delay = self._retry_policy.get_backoff(sum(retries.values()), retry_after=retry_after)
+        retries[kind] += 1
+        self._verbose(
+            "REST %s %s failed (%s), retry %d/%d in %.2fs",
+            request["method"],
+            request["url"],
+            status or kind,
+            sum(retries.values()),
+            self._retry_policy.max_retries,
+            delay,
+        )
+        return delay
+
+    def _retry_wait(
+        self,
+        request: Dict[str, Any],
+        kind: str,
+        retries: Dict[str, int],
+        status: Optional[int] = None,
+        retry_after: Optional[str] = None,
+    ) -> None:
+        """Utility; Count retry of *kind* and sleep for the backoff delay."""
+        time.sleep(self._retry_delay(request, kind, retries, status=status, retry_after=retry_after))
+
+    @staticmethod
+    def _unreachable_message(request: Dict[str, Any], quiet: bool = False) -> str:
+        """Utility; Build the message for a REST call that could not reach the backend."""
+        hostname = request["hostname"]
+        port = request["port"]
+        return f"Could not reach {hostname}:{port}! Make sure backend({hostname}) can be reached from you location and no firewall is blocking outgoing TCP traffic at port {port}. Details: {traceback.format_exc() if not quiet else '(quiet)'}"
+
+    def _decode_rest_response(
+        self, request: Dict[str, Any], text: str, t_start: int, quiet: bool = False
+    ) -> Dict[str, Any]:
+        """Utility; Decode the JSON response of a REST call, raising AccsynException on backend error."""
+        t_end = int(round(time.time() * 1000))
+        method = request["method"]
+        uri = request["uri"]
         try:
-            retval = json.loads(r.text, cls=JSONDecoder)
+            retval = json.loads(text, cls=JSONDecoder)
             if not quiet:
-                str_result = Session._obscure_dict_string(
-                    Session._safely_printable(str(retval) if not self._pretty_json else Session.str(retval)).replace(
-                        "'", '"'
-                    )
+                self._verbose(
+                    "%s/%s REST %s result: %s (~%sms)",
+                    request["hostname"],
+                    uri,
+                    method,
+                    _LazyFormat(self._printable, retval),
+                    t_end - t_start,
                 )
-                self._verbose(f"{hostname}/{uri} REST {method} result: {str_result} (~{t_start - t_end + 1}ms)")
         except BaseException:
             sys.stderr.write(traceback.format_exc())
-            str_data = Session._obscure_dict_string(Session._safely_printable(str(data)).replace("'", '"'))
-            message = (
-                f'The {url} REST {method} {str_data} operation failed! Details: {r.text} {traceback.format_exc()}'
-            )
+            str_data = self._printable(request["data"])
+            message = f'The {request["url"]} REST {method} {str_data} operation failed! Details: {text} {traceback.format_exc()}'
             Session._warning(message)
             raise AccsynException(message)
 
@@ -1945,6 +4253,446 @@ class Session(object):
 
     # REST get
 
+    def get_compression_statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Return event payload compression statistics per endpoint uri, see
+        :func:`CompressionPolicy.get_statistics`.
+
+        .. versionadded:: 3.4.0
+        """
+        return self._compression_policy.get_statistics()
+
+    @property
+    def compression_policy(self) -> CompressionPolicy:
+        """The compression policy of this session."""
+        return self._compression_policy
+
+    # Schema cache
+
+    @property
+    def schema_cache(self) -> Optional[SchemaCache]:
+        """The schema cache of this session, None if disabled."""
+        return self._schema_cache
+
+    def _find_schema(self, uri: str, data: Dict[str, Any]) -> Optional[List[Any]]:
+        """
+        Utility; Return entity types or attributes from schema cache, fetching them if missing and refreshing them in
+        the background if stale.
+        """
+        scope, key = self._get_schema_scope(), Session._get_schema_key(uri, data)
+        schema_cache = self._schema_cache
+        assert schema_cache is not None, "Session has no schema cache!"
+        result, stale = schema_cache.get(scope, key)
+        if result is None or (stale and self._backend_version is None):
+            # Without a backend version, a stale schema might be from before an upgrade - do not return it
+            return self._fetch_schema(scope, key, uri, data)
+        if stale and self._begin_schema_refresh(key):
+            threading.Thread(
+                target=self._refresh_schema, args=(scope, key, uri, data), name="accsyn-schema-refresh", daemon=True
+            ).start()
+        return result
+
+    def _fetch_schema(self, scope: str, key: str, uri: str, data: Dict[str, Any]) -> Optional[List[Any]]:
+        result = Session._find_result(self._event("GET", uri, data))
+        schema_cache = self._schema_cache
+        if schema_cache is not None and result is not None:
+            schema_cache.put(scope, key, result)
+        return result
+
+    def _refresh_schema(self, scope: str, key: str, uri: str, data: Dict[str, Any]) -> None:
+        try:
+            self._fetch_schema(scope, key, uri, data)
+        except Exception as e:
+            # Keep the stale schema, will be retried next time it is used
+            Session._warning(f"Could not refresh schema {key}: {e}", False)
+        finally:
+            with self._schema_lock:
+                self._schema_refreshing.discard(key)
+
+    def _begin_schema_refresh(self, key: str) -> bool:
+        """Utility; Return True if *key* is not already being refreshed, marking it as being refreshed."""
+        with self._schema_lock:
+            if key in self._schema_refreshing:
+                return False
+            self._schema_refreshing.add(key)
+            return True
+
+    def _get_schema_scope(self) -> str:
+        """
+        Utility; Return the schema cache scope - schemas depend on backend version and access (role). Schemas of a
+        backend not reporting its version are scoped "unversioned" and only kept for the time to live.
+        """
+        return f"{self._workspace}-{self._backend_version or 'unversioned'}-{self._role}"
+
+    @staticmethod
+    def _get_schema_key(uri: str, data: Dict[str, Any]) -> str:
+        return f"{uri}:{json.dumps(data, sort_keys=True)}" if data else uri
+
+    # Write-behind
+
+    @property
+    def write_behind(self) -> Optional[WriteBehindBuffer]:
+        """The buffer of updates pending, None if updates are not deferred."""
+        return self._write_behind
+
+    def flush(self) -> Dict[Tuple[str, str], Union[Optional[Dict[str, Any]], Exception]]:
+        """
+        Send updates pending in the write-behind buffer now, concurrently. Does nothing if updates are not deferred.
+
+        .. versionadded:: 3.4.0
+
+        :return: Dictionary by (entity type, id), holding the updated entity or the exception raised.
+        """
+        if self._write_behind is None:
+            return dict()
+        return self._write_behind_flush()
+
+    def _write_behind_flush(
+        self, sequential: bool = False
+    ) -> Dict[Tuple[str, str], Union[Optional[Dict[str, Any]], Exception]]:
+        """Utility; Send pending updates, concurrently unless *sequential*."""
+        with self._write_behind_lock:
+            pending = cast(WriteBehindBuffer, self._write_behind).take()
+            results: List[Any] = []
+            if sequential:
+                for update in pending:
+                    try:
+                        results.append(self._update_event(*update))
+                    except Exception as e:
+                        results.append(e)
+            else:
+                try:
+                    results = self.map(lambda update: self._update_event(*update), pending)
+                except RuntimeError as e:
+                    # Interpreter is exiting and threads cannot be started, have them requeued
+                    results = [e] * len(pending)
+            return self._write_behind_record(pending, results)
+
+    def _write_behind_stop(self, sequential: bool = False) -> None:
+        """Utility; Stop the flush thread and send pending updates, failed updates again until given up."""
+        buffer = cast(WriteBehindBuffer, self._write_behind)
+        self._write_behind_closing = True
+        self._write_behind_wakeup.set()
+        if self._write_behind_thread is not None:
+            self._write_behind_thread.join()
+            self._write_behind_thread = None
+        while 0 < len(buffer):
+            self._write_behind_flush(sequential)
+        if self._write_behind_exit is not None:
+            atexit.unregister(self._write_behind_exit)
+            self._write_behind_exit = None
+
+    def _write_behind_put(self, entitytype: str, entityid: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Utility; Queue an update to be sent in the background, starting the flush thread if needed."""
+        buffer = cast(WriteBehindBuffer, self._write_behind)
+        was_empty = 0 == len(buffer)
+        retval = buffer.put(entitytype, entityid, data)
+        self._invalidate_entity(entityid)
+        if self._write_behind_thread is None:
+            self._write_behind_closing = False
+            self._write_behind_thread = threading.Thread(
+                target=self._write_behind_run, name="accsyn_api-write-behind", daemon=True
+            )
+            self._write_behind_thread.start()
+            if self._write_behind_exit is None:
+                # The flush thread is a daemon, send what is pending if the session is not closed before exit
+                self._write_behind_exit = functools.partial(Session._write_behind_atexit, weakref.ref(self))
+                atexit.register(self._write_behind_exit)
+        if was_empty or buffer.is_due():
+            self._write_behind_wakeup.set()
+        return retval
+
+    def _write_behind_run(self) -> None:
+        """Utility; Flush thread, sending pending updates when due until the session is closed."""
+        buffer = cast(WriteBehindBuffer, self._write_behind)
+        while not self._write_behind_closing:
+            self._write_behind_wakeup.wait(timeout=buffer.get_wait_time())
+            self._write_behind_wakeup.clear()
+            if not self._write_behind_closing and buffer.is_due():
+                self._write_behind_flush()
+
+    @staticmethod
+    def _write_behind_atexit(ref: "weakref.ReferenceType[Session]") -> None:
+        """Utility; Send updates still pending at interpreter exit, one by one as threads cannot be started."""
+        session = ref()
+        if session is not None:
+            session._write_behind_stop(sequential=True)
+
+    def _write_behind_record(
+        self, pending: List[Tuple[str, str, Dict[str, Any]]], results: List[Any]
+    ) -> Dict[Tuple[str, str], Union[Optional[Dict[str, Any]], Exception]]:
+        """Utility; Record the outcome of sending pending updates, requeuing or warning about failures."""
+        buffer = cast(WriteBehindBuffer, self._write_behind)
+        for (entitytype, entityid, data), result in zip(pending, results):
+            error = result if isinstance(result, Exception) else None
+            if buffer.record(entitytype, entityid, data, error):
+                Session._warning(f"Could not send pending update of {entitytype} {entityid}, retrying: {error}", False)
+            elif error is not None:
+                Session._warning(f"Could not send pending update of {entitytype} {entityid}: {error}", False)
+        return collections.OrderedDict(
+            ((entitytype, entityid), r) for (entitytype, entityid, _), r in zip(pending, results)
+        )
+
+    # Entity cache
+
+    @property
+    def entity_cache(self) -> Optional[EntityCache]:
+        """The entity cache of this session, None if disabled."""
+        return self._entity_cache
+
+    def get_cache_statistics(self) -> Optional[Dict[str, int]]:
+        """
+        Return entity cache statistics, see :func:`EntityCache.get_statistics`. None if the cache is disabled.
+
+        .. versionadded:: 3.4.0
+        """
+        return self._entity_cache.get_statistics() if self._entity_cache is not None else None
+
+    def _invalidate_entity(self, entityid: Optional[str]) -> None:
+        """Utility; Remove modified entity from cache, and codes resolving to it."""
+        if not entityid:
+            return
+        if self._entity_cache is not None:
+            self._entity_cache.invalidate(entityid)
+        self._code_cache.invalidate(entityid)
+
+    def _expand(
+        self,
+        query: Union[str, "Query"],
+        entities: List[Dict[str, Any]],
+        expand: List[str],
+        expanded: Optional[Dict[Tuple[str, str], Optional[Dict[str, Any]]]] = None,
+        lock: Optional[threading.Lock] = None,
+    ) -> None:
+        """
+        Utility; Attach entities referenced by *expand* attributes of *entities*, fetching those not already in
+        *expanded*.
+        """
+        if expanded is None:
+            expanded = dict()
+        lock = lock or threading.Lock()
+        references, missing = self._expand_prepare(query, entities, expand, expanded, lock)
+        for entitytype, entityids in missing.items():
+            fetched = self.get_entities(entitytype, entityids)
+            with lock:
+                expanded.update(((entitytype, entityid), entity) for entityid, entity in fetched.items())
+        Session._expand_attach(references, expanded)
+
+    def _expand_prepare(
+        self,
+        query: Union[str, "Query"],
+        entities: List[Dict[str, Any]],
+        expand: List[str],
+        expanded: Dict[Tuple[str, str], Optional[Dict[str, Any]]],
+        lock: threading.Lock,
+    ) -> Tuple[List[Tuple[Dict[str, Any], str, Optional[Tuple[str, str]]]], Dict[str, List[str]]]:
+        """
+        Utility; Collect the entity references of *expand* attributes.
+
+        :return: List of entity, attribute and referenced entity type and id - None if not a reference, and ids not
+            yet expanded by entity type.
+        """
+        assert isinstance(expand, list) and all(
+            0 < len(field or "") and Session._is_str(field) for field in expand
+        ), "Invalid expand supplied, must be a list of attribute names!"
+        entitytype_queried = self._decode_query(query)["entitytype"]
+        fields = []
+        for field in expand:
+            field, _, entitytype = field.partition(":")
+            field = field.strip()
+            if not entitytype:
+                entitytype = (
+                    EXPAND_PARENT_ENTITY_TYPES.get(entitytype_queried, entitytype_queried)
+                    if field == "parent"
+                    else EXPAND_ENTITY_TYPES.get(field)
+                )
+            fields.append((field, (entitytype or "").strip().lower() or None))
+        references = []
+        missing: Dict[str, Dict[str, None]] = dict()  # Ordered sets of ids, by entity type
+        with lock:
+            for entity in entities:
+                for field, entitytype in fields:
+                    reference = Session._get_reference(entity.get(field), entitytype)
+                    if reference is None:
+                        if Session._is_str(entity.get(field)) and re.match("^[a-z0-9]{24}$", entity[field]):
+                            raise AccsynException(
+                                f"Cannot expand '{field}', supply its entity type as '{field}:<entitytype>'!"
+                            )
+                    elif reference not in expanded:
+                        missing.setdefault(reference[0], dict())[reference[1]] = None
+                    references.append((entity, field, reference))
+        return references, {entitytype: list(entityids) for entitytype, entityids in missing.items()}
+
+    @staticmethod
+    def _expand_attach(
+        references: List[Tuple[Dict[str, Any], str, Optional[Tuple[str, str]]]],
+        expanded: Dict[Tuple[str, str], Optional[Dict[str, Any]]],
+    ) -> None:
+        """Utility; Attach expanded entities as "<attribute>_entity"."""
+        for entity, field, reference in references:
+            entity[f"{field}_entity"] = expanded.get(reference) if reference is not None else None
+
+    @staticmethod
+    def _get_reference(value: Any, entitytype: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Utility; Return entity type and id referenced by *value*, either "<entitytype>:<id>" or a plain id of
+        *entitytype*. None if not a reference.
+        """
+        if not Session._is_str(value):
+            return None
+        m = re.match("^(?:([a-z_]+):)?([a-z0-9]{24})$", value)
+        if m is None:
+            return None
+        if m.group(1):
+            return m.group(1), m.group(2)
+        return (entitytype, m.group(2)) if entitytype else None
+
+    def _get_entities_prepare(
+        self,
+        entitytype: str,
+        entityids: List[str],
+        attributes: Optional[List[str]],
+        batch_size: Optional[int],
+    ) -> Tuple[str, Dict[str, Optional[Dict[str, Any]]], List[List[str]]]:
+        """
+        Utility; Validate *entityids* and take entities from entity cache.
+
+        :return: The entity type, the result by id - None if not yet fetched, and batches of ids to fetch.
+        """
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), "Invalid entity type supplied, must be of string type!"
+        entitytype = entitytype.lower().strip()
+        assert isinstance(entityids, (list, tuple)), "Invalid entity IDs supplied, must be a list!"
+        batch_size = batch_size or Session.GET_ENTITIES_BATCH_SIZE
+        assert 0 < batch_size, "Batch size must be positive!"
+        result: Dict[str, Optional[Dict[str, Any]]] = dict()
+        missing = []
+        for entityid in entityids:
+            assert Session._is_str(entityid) and re.match(
+                "^[a-z0-9]{24}$", entityid
+            ), f"Invalid entity ID supplied: {entityid}!"
+            if entityid in result:
+                continue
+            entity = None
+            if self._entity_cache is not None and not attributes:
+                entity = self._entity_cache.get(entitytype, entityid)
+            result[entityid] = entity
+            if entity is None:
+                missing.append(entityid)
+        return entitytype, result, [missing[idx : idx + batch_size] for idx in range(0, len(missing), batch_size)]
+
+    def _get_entities_store(
+        self,
+        entitytype: str,
+        result: Dict[str, Optional[Dict[str, Any]]],
+        entities: Optional[List[Dict[str, Any]]],
+        attributes: Optional[List[str]],
+    ) -> None:
+        """Utility; Store fetched *entities* in result, and entity cache if all attributes were fetched."""
+        for entity in entities or []:
+            if entity.get("id") in result:
+                result[entity["id"]] = entity
+                if self._entity_cache is not None and not attributes:
+                    self._entity_cache.put(entitytype, entity)
+
+    def _resolve_code(self, entitytype: str, ident: str) -> str:
+        """
+        Utility; Return the id of entity if *ident* is a code of an entity type having unique codes, otherwise
+        *ident* as is.
+        """
+        if entitytype.lower().strip() in UNIQUE_ENTITY_TYPES:
+            return self.resolve_id(entitytype, ident)
+        return ident
+
+    def _resolve_id_prepare(
+        self, entitytype: str, ident: Union[str, List[str]]
+    ) -> Tuple[str, List[str], Dict[str, Optional[str]], List[str]]:
+        """
+        Utility; Validate and normalise *ident*.
+
+        :return: The entity type, the identifiers, identifiers already resolved (ids and cached codes) and codes left
+            to look up.
+        """
+        assert 0 < len(entitytype or "") and Session._is_str(
+            entitytype
+        ), "Invalid entity type supplied, must be of string type!"
+        entitytype = entitytype.lower().strip()
+        idents = ident if isinstance(ident, list) else [ident]
+        assert all(
+            0 < len(value or "") and Session._is_str(value) for value in idents
+        ), "Invalid entity ID supplied, must be of string type!"
+        idents = [value.lower().strip() for value in idents]
+        resolved: Dict[str, Optional[str]] = dict()
+        codes = []
+        for code in dict.fromkeys(idents):
+            if re.match("^[a-z0-9]{24}$", code):
+                resolved[code] = code
+                continue
+            if entitytype not in UNIQUE_ENTITY_TYPES:
+                raise AccsynException(f"Please supply a valid {entitytype} ID!")
+            entityid = self._code_cache.get(entitytype, code)
+            if entityid is not None:
+                resolved[code] = entityid
+            else:
+                codes.append(code)
+        return entitytype, idents, resolved, codes
+
+    @staticmethod
+    def _resolve_id_queries(entitytype: str, codes: List[str]) -> Iterator["Query"]:
+        """Utility; Yield queries looking up *codes*, in batches."""
+        for idx in range(0, len(codes), Session.RESOLVE_ID_BATCH_SIZE):
+            yield Session._batch_query(entitytype, "code", codes[idx : idx + Session.RESOLVE_ID_BATCH_SIZE])
+
+    @staticmethod
+    def _batch_query(entitytype: str, attribute: str, values: List[str]) -> "Query":
+        """Utility; Return query matching entities having *attribute* equal to any of *values*."""
+        return Query(entitytype).where(**{attribute: values if 1 < len(values) else values[0]})
+
+    def _resolve_id_store(
+        self, entitytype: str, resolved: Dict[str, Optional[str]], entities: Optional[List[Dict[str, Any]]]
+    ) -> None:
+        """Utility; Cache ids of *entities* found by code."""
+        for entity in entities or []:
+            code = (entity.get("code") or "").lower()
+            if code:
+                resolved[code] = entity["id"]
+                self._code_cache.put(entitytype, code, entity["id"])
+
+    @staticmethod
+    def _resolve_id_result(
+        entitytype: str,
+        ident: Union[str, List[str]],
+        idents: List[str],
+        resolved: Dict[str, Optional[str]],
+        missing_ok: bool,
+    ) -> Union[Optional[str], List[Optional[str]]]:
+        """Utility; Return resolved ids in order of *idents*, single id if a single *ident* was supplied."""
+        result = [resolved.get(code) for code in idents]
+        if not missing_ok:
+            for code, entityid in zip(idents, result):
+                if entityid is None:
+                    raise AccsynException(f"No {entitytype} found with code '{code}'!")
+        return result if isinstance(ident, list) else result[0]
+
+    def _get_cache_key(
+        self,
+        query: Union[str, "Query"],
+        entityid: Optional[str],
+        attributes: Optional[List[str]],
+        finished: Optional[bool],
+        inactive: Optional[bool],
+        archived: Optional[bool],
+    ) -> Optional[Tuple[str, str]]:
+        """Utility; Return the entity cache key of a find_one *query* on id only, None if it cannot be cached."""
+        if self._entity_cache is None or entityid or attributes or finished or inactive or archived:
+            return None
+        d = self._decode_query(query)
+        m = re.match("^id=['\"]?([a-z0-9]{24})['\"]?$", (d.get("expression") or "").replace(" ", ""))
+        if m is None:
+            return None
+        return d["entitytype"], m.group(1)
+
     def _event(
         self,
         method: str,
@@ -1957,6 +4705,41 @@ class Session(object):
         quiet: bool = False,
     ) -> Dict[str, Any]:
         """Utility; Construct an event and send using REST to accsyn backend."""
+        event, payload = self._build_event(uri, data, query=query, entityid=entityid)
+        while True:
+            body, content_encoding, sample = self._encode_event(method, event, payload)
+            try:
+                response = self._rest(
+                    method,
+                    hostname=self._hostname,
+                    uri="/event",
+                    data=dict(event, data=data),
+                    timeout=timeout,
+                    ssl=ssl,
+                    port=self._port,
+                    quiet=quiet,
+                    body=body,
+                    content_encoding=content_encoding,
+                    sample=sample,
+                )
+            except _ContentEncodingRejected as e:
+                self._fallback_compression(e.content_encoding)
+                continue
+            self._record_compression(sample, body)
+            return response
+
+    def _build_event(
+        self,
+        uri: str,
+        data: Optional[Dict[str, Any]] = None,
+        query: Optional[str] = None,
+        entityid: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Utility; Construct an event envelope and serialise its payload, once.
+
+        :return: Tuple of the event envelope, without payload, and the payload data serialised to (ASCII) JSON.
+        """
         assert self._uid, "Login before posting event!"
         event = dict(
             audience="api",
@@ -1968,110 +4751,113 @@ class Session(object):
             created=datetime.datetime.now(),
             hostname=Session.get_hostname(),
         )
-        did_compress_payload = False
-        if data is not None and 0 < len(data):
-            # Check if should compress payload
-            def recursive_estimate_dict_size(o: Any) -> int:
-                result = 0
-                if o is not None:
-                    if isinstance(o, dict):
-                        d = o
-                        for key, value in list(d.items()):
-                            result += len(str(key)) + recursive_estimate_dict_size(value)
-                    elif isinstance(o, list):
-                        l = o
-                        for _o in l:
-                            result += recursive_estimate_dict_size(_o)
-                    elif Session._is_str(o):
-                        result += len(o)
-                    else:
-                        result += 10
-                return result
-
-            size = recursive_estimate_dict_size(data)
-            if DEFAULT_EVENT_PAYLOAD_COMPRESS_SIZE_TRESHOLD < size:
-                out = io.BytesIO()
-                with gzip.GzipFile(fileobj=out, mode="w") as f:
-                    f.write(Session._safe_dumps(data).encode('ascii'))
-                b = out.getvalue()
-                event["gz_data"] = base64.b64encode(b).decode('utf-8')
-                self._verbose(
-                    f"Compressed event payload {size}>{len(event['gz_data'])}({100 * len(event['gz_data']) / size}%)"
-                )
-                did_compress_payload = True
-        if not did_compress_payload:
-            event["data"] = data
-
         if query:
             event["query"] = query
         if entityid:
             event["id"] = entityid
-        response = self._rest(
-            method,
-            hostname=self._hostname,
-            uri="/event",
-            data=event,
-            timeout=timeout,
-            ssl=ssl,
-            port=self._port,
-            quiet=quiet,
+        return event, Session._safe_dumps(data)
+
+    def _encode_event(
+        self, method: str, event: Dict[str, Any], payload: str
+    ) -> Tuple[bytes, Optional[str], Dict[str, Any]]:
+        """
+        Utility; Serialise the request body of *event* with *payload*, compressing payload if compression policy
+        says so.
+
+        :return: Tuple of the body, its HTTP content encoding - None if not compressed at HTTP level (compressed
+            within the event for GET/DELETE and legacy "gz_data" compression) - and the compression sample to
+            record once sent.
+        """
+        compression = self._compression if method.lower() in ["put", "post"] else COMPRESSION_LEGACY
+        level = self._compression_policy.get_level(event["uri"], len(payload), compression)
+        t_start = time.perf_counter()
+        body, content_encoding = Session._serialise_event(
+            event, payload, compression=compression if level is not None else None, level=level
         )
-        return response
-
-    def _decode_query(self, query: str) -> Dict[str, str]:
-        # Scenarios:
-        #   entities
-        #   attributes WHERE entitytype='job'
-        #   Job WHERE code='my_transfer'
-        #   Job WHERE (dest='lars@edit.com' OR ..)
-
-        # First replace tabs with spaces, remove double spaces
-        s = ""
-        is_escaped = False
-        is_at_whitespace = False
-        query = (query or "").replace("\t", " ").replace("\n", "").strip()
-        parts = []
-        idx_part_start = 0
-        paranthesis_depth = 0
-        for idx in range(0, len(query)):
-            do_append = True
-            if query[idx] == " ":
-                if not is_escaped and paranthesis_depth == 0:
-                    if is_at_whitespace:
-                        # Ignore this
-                        do_append = False
-                    else:
-                        is_at_whitespace = True
-                        if idx_part_start < idx:
-                            # Add this part
-                            parts.append(query[idx_part_start:idx])
-                            idx_part_start = idx + 1
-            else:
-                is_at_whitespace = False
-                if query[idx] == '"':
-                    is_escaped = not is_escaped
-                elif query[idx] == "(":
-                    if not is_escaped:
-                        paranthesis_depth += 1
-                elif query[idx] == ")":
-                    if not is_escaped:
-                        paranthesis_depth -= 1
-            if do_append:
-                s += query[idx]
-        if idx_part_start < len(query):
-            parts.append(query[idx_part_start:])
-        self._verbose(f'Query: "{query}", parts: "{parts}"')
-        assert len(parts) == 1 or 3 <= len(parts), (
-            "Query has invalid syntax; statements can either be "
-            'single ("<entity>"") or with a WHERE statement '
-            '("<(sub)entity> WHERE {<entity>.}id=..{ AND ..}"")'
+        sample = dict(uri=event["uri"], size=len(payload), level=level, compress_seconds=time.perf_counter() - t_start)
+        if level is not None:
+            self._verbose(
+                "Compressed (%s:%d) event payload %d>%d bytes (%.1f%%)",
+                compression,
+                level,
+                len(payload),
+                len(body),
+                100 * len(body) / len(payload),
+            )
+        return body, content_encoding, sample
+
+    def _record_compression(self, sample: Dict[str, Any], body: bytes) -> None:
+        """Utility; Feed the outcome of a sent event back to compression policy."""
+        self._compression_policy.record(
+            sample["uri"],
+            sample["size"],
+            len(body),
+            sample["level"],
+            sample["compress_seconds"],
+            sample["request_seconds"],
         )
+
+    @staticmethod
+    def _serialise_event(
+        event: Dict[str, Any], payload: str, compression: Optional[str] = None, level: Optional[int] = None
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Utility; Splice serialised *payload* into JSON of *event* envelope, without re-serialising or copying it
+        when compressing.
+
+        :param compression: "zstd" or "gzip" to compress entire body, "gz_data" to compress payload within event.
+        :param level: The compression level, defaults to the :class:`CompressionPolicy` default level.
+        :return: Tuple of the body and its HTTP content encoding, None if not compressed at HTTP level.
+        """
+        head = Session._safe_dumps(event)[:-1]
+        if compression == COMPRESSION_LEGACY:
+            gz_data = base64.b64encode(Session._compress([payload], COMPRESSION_GZIP, level=level)).decode("ascii")
+            return "".join([head, ', "gz_data": "', gz_data, '"}']).encode("utf-8"), None
+        chunks = [head, ', "data": ', payload, "}"]
+        if compression:
+            return Session._compress(chunks, compression, level=level), compression
+        return "".join(chunks).encode("utf-8"), None
+
+    def _fallback_compression(self, content_encoding: str) -> None:
+        """Utility; Backend did not accept *content_encoding*, remember the next compression to try."""
+        if content_encoding == COMPRESSION_ZSTD:
+            self._compression = COMPRESSION_GZIP
+        else:
+            self._compression = COMPRESSION_LEGACY
+        Session._warning(
+            f"Backend does not accept {content_encoding} compressed requests, falling back to {self._compression}."
+        )
+
+    @staticmethod
+    def _compress(chunks: List[str], content_encoding: str, level: Optional[int] = None) -> bytes:
+        """
+        Utility; Compress concatenated (ASCII) JSON *chunks* with HTTP *content_encoding*, "gzip" or "zstd", encoding
+        and feeding the compressor a slice at a time instead of copying entire payload to bytes.
+        """
+        size = sum(len(chunk) for chunk in chunks)
+        if level is None:
+            level = CompressionPolicy._get_default_level(content_encoding)
+        if content_encoding == COMPRESSION_ZSTD:
+            compressor = _get_zstandard().ZstdCompressor(level=level).compressobj(size=size)
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+        result = []
+        for chunk in chunks:
+            for offset in range(0, len(chunk), COMPRESSION_CHUNK_SIZE):
+                result.append(compressor.compress(chunk[offset : offset + COMPRESSION_CHUNK_SIZE].encode("ascii")))
+        result.append(compressor.flush())
+        return b"".join(result)
+
+    def _decode_query(self, query: Union[str, "Query"]) -> Dict[str, str]:
+        """Utility; Decode *query* into entitytype and expression, parsed query strings are cached."""
+        if isinstance(query, Query):
+            # Already structured, no need to parse
+            return dict(entitytype=query.entitytype.lower(), expression=query.expression.lower())
+        parts = _parse_query(query)
+        self._verbose('Query: "%s", parts: "%s"', query, parts)
         if len(parts) == 1:
             return dict(entitytype=parts[0].lower())
         else:
-            assert (
-                parts[1].strip().lower() == "where"
-            ), f'Invalid query "{query}", should be on the form "<entitytype> where <expression>".'
             # Decode expression
             return {
                 "entitytype": parts[0].lower(),
@@ -2089,12 +4875,12 @@ class Session(object):
 
         """
         if Session._p_logfile:
-            with open(Session._p_logfile, "a") as f:
-                if standout:
-                    f.write("[WARNING]" + "-" * 80 + "\n")
-                f.write("[WARNING]" + s + "\n")
-                if standout:
-                    f.write("[WARNING]" + "-" * 80 + "\n")
+            logger = Session._get_logfile_logger(Session._p_logfile)
+            if standout:
+                logger.warning("[WARNING]" + "-" * 80)
+            logger.warning("[WARNING]" + s)
+            if standout:
+                logger.warning("[WARNING]" + "-" * 80)
         else:
             if standout:
                 logging.warning("-" * 80)
@@ -2103,9 +4889,43 @@ class Session(object):
                 logging.warning("-" * 80)
         return s
 
-    def _verbose(self, s: str) -> None:
+    def _verbose(self, s: str, *args: Any) -> None:
+        """
+        Utility; Print verbose message, if verbose output is enabled.
+
+        :param s: The message to print, with %-style placeholders if *args* are given.
+        :param args: Arguments formatted into message, only if verbose output is enabled. Expensive arguments
+            should be wrapped in a :class:`_LazyFormat`.
+        """
         if self._be_verbose:
-            Session._info(f"[ACCSYN_API] {s}")
+            Session._info(f"[ACCSYN_API] {s % args if args else s}")
+
+    @staticmethod
+    def _get_logfile_logger(path: str) -> logging.Logger:
+        """Utility; Return the logger writing to logfile at *path* through a buffered handler, created once."""
+        logger = Session._loggers_logfile.get(path)
+        if logger is None:
+            with Session._lock_logfile:
+                logger = Session._loggers_logfile.get(path)
+                if logger is None:
+                    handler_file = logging.FileHandler(path, mode="a", delay=True)
+                    handler_file.setFormatter(logging.Formatter("%(message)s"))
+                    handler = logging.handlers.MemoryHandler(
+                        Session.LOGFILE_BUFFER_SIZE, flushLevel=logging.WARNING, target=handler_file
+                    )
+                    logger = logging.getLogger(f"accsyn_api.logfile.{len(Session._loggers_logfile)}")
+                    logger.setLevel(logging.INFO)
+                    logger.propagate = False
+                    logger.addHandler(handler)
+                    Session._loggers_logfile[path] = logger
+        return logger
+
+    @staticmethod
+    def _flush_logfile() -> None:
+        """Utility; Write buffered log messages to logfile."""
+        if Session._p_logfile and Session._p_logfile in Session._loggers_logfile:
+            for handler in Session._loggers_logfile[Session._p_logfile].handlers:
+                handler.flush()
 
     @staticmethod
     def _safe_dumps(d: Any, indent: Optional[int] = None) -> str:
@@ -2119,6 +4939,11 @@ class Session(object):
     def _is_str(s: Any) -> bool:
         return isinstance(s, str)
 
+    @staticmethod
+    def _is_query(query: Any) -> bool:
+        """Utility; Check if *query* is a non empty query string or a :class:`Query`."""
+        return isinstance(query, Query) or (Session._is_str(query) and 0 < len(query))
+
     @staticmethod
     def _url_quote(url: Any) -> str:
         return urllib.parse.quote(Session._safe_dumps(url))
@@ -2129,6 +4954,135 @@ class Session(object):
         return (base64.b64encode(s.encode("utf-8"))).decode("ascii")
 
 
+class ResultSet(object):
+    """
+    Lazy result of :func:`Session.find` with *lazy=True*. Nothing is fetched until the result set is used:
+
+    * Iterating fetches entities page by page, see :func:`Session.find_iter`.
+    * Slicing returns a new result set, mapped to skip and limit. Indexing fetches a single entity.
+    * *len* fetches the ids of matching entities - at most *limit* of them - and counts them, *bool* probes for a
+      single entity.
+    * *filter* returns a new result set, further restricted by an expression.
+
+    .. versionadded:: 3.4.0
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        query: Union[str, "Query"],
+        skip: Optional[int] = None,
+        limit: Optional[int] = None,
+        **find_kwargs: Any,
+    ) -> None:
+        """
+        :param session: The session to fetch entities with.
+        :param query: The query, a string on accsyn query format or a :class:`Query`.
+        :param skip: The amount of entities to skip.
+        :param limit: The maximum amount of entities.
+        :param find_kwargs: Additional :func:`Session.find` arguments; entityid, attributes, finished, inactive and
+            archived.
+        """
+        assert Session._is_query(query), "Invalid query type supplied, must be of string type!"
+        if limit is not None and not isinstance(limit, int):
+            raise AccsynException("Limit must be an integer!")
+        if skip is not None and not isinstance(skip, int):
+            raise AccsynException("Skip must be an integer!")
+        self._session = session
+        self._query = query
+        self._skip = skip or 0
+        self._limit = limit
+        self._find_kwargs = find_kwargs
+        self._count: Optional[int] = None
+
+    @property
+    def query(self) -> Union[str, "Query"]:
+        return self._query
+
+    def filter(self, expression: str) -> "ResultSet":
+        """
+        Return a new result set, restricted to entities also matching *expression*.
+
+        :param expression: Query expression on accsyn query format, e.g. "status=running".
+        """
+        assert 0 < len(expression or "") and Session._is_str(expression), "Invalid expression supplied!"
+        assert self._skip == 0 and self._limit is None, "Cannot filter a sliced result set!"
+        d = self._session._decode_query(self._query)
+        if d.get("expression"):
+            query = f"{d['entitytype']} WHERE ({d['expression']}) AND ({expression})"
+        else:
+            query = f"{d['entitytype']} WHERE {expression}"
+        return ResultSet(self._session, query, **self._find_kwargs)
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """Return the first entity, or None if there are no entities."""
+        result = self._fetch(self._skip, 1)
+        return result[0] if result else None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._session.find_iter(
+            self._query,
+            page_size=min(self._limit, Session.DEFAULT_PAGE_SIZE) if self._limit else None,
+            limit=self._limit,
+            skip=self._skip,
+            **self._find_kwargs,
+        )
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Dict[str, Any], "ResultSet"]:
+        if isinstance(key, slice):
+            if key.step not in [None, 1]:
+                raise AccsynException("Result set slicing does not support steps!")
+            if (key.start or 0) < 0 or (key.stop or 0) < 0:
+                raise AccsynException("Result set slicing does not support negative indexes!")
+            start = key.start or 0
+            limit = self._limit
+            if key.stop is not None:
+                limit = max(0, key.stop - start) if limit is None else max(0, min(key.stop, limit) - start)
+            elif limit is not None:
+                limit = max(0, limit - start)
+            return ResultSet(self._session, self._query, skip=self._skip + start, limit=limit, **self._find_kwargs)
+        if not isinstance(key, int) or key < 0:
+            raise AccsynException("Result set index must be a non-negative integer!")
+        if self._limit is not None and self._limit <= key:
+            raise IndexError("Result set index out of range")
+        result = self._fetch(self._skip + key, 1)
+        if not result:
+            raise IndexError("Result set index out of range")
+        return result[0]
+
+    def __len__(self) -> int:
+        if self._count is None:
+            if self._limit is None:
+                self._count = max(0, self._session._count(self._query, **self._find_kwargs) - self._skip)
+            else:
+                # Backend has no count, fetch at most limit ids instead of all matching
+                self._count = len(self._fetch(self._skip, self._limit, attributes=["id"])) if 0 < self._limit else 0
+        return self._count
+
+    def __bool__(self) -> bool:
+        if self._limit == 0:
+            return False
+        return 0 < len(self._fetch(self._skip, 1, attributes=["id"]))
+
+    def __repr__(self) -> str:
+        return f"<ResultSet {self._query!r} skip={self._skip} limit={self._limit}>"
+
+    def _fetch(self, skip: int, limit: int, **find_kwargs: Any) -> List[Dict[str, Any]]:
+        """Utility; Fetch *limit* entities at *skip*."""
+        return self._session.find(self._query, skip=skip, limit=limit, **dict(self._find_kwargs, **find_kwargs)) or []
+
+
 class AccsynException(Exception):
     def __init__(self, message: str) -> None:
         super().__init__(message)
+
+
+class _ContentEncodingRejected(AccsynException):
+    """
+    Backend responded 415 Unsupported Media Type, or 400 Bad Request not being a backend error, to a compressed
+    request body.
+    """
+
+    def __init__(self, content_encoding: str) -> None:
+        super().__init__(f"Backend does not accept {content_encoding} compressed requests!")
+        self.content_encoding = content_encoding
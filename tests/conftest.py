@@ -82,6 +82,16 @@ def session_standard():
     return accsyn_api.Session(path_envfile=".env.standard", connect_timeout=10, timeout=30)
 
 
+@pytest.fixture
+def users(session_admin):
+    """
+    The users of the workspace, found with the admin session - at least one.
+    """
+    users = session_admin.find("User")
+    assert isinstance(users, list) and 0 < len(users)
+    return users
+
+
 # Temp entity storage
 
 
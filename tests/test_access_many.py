@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import TestUtils
+
+
+def test_access_many_types():
+    """
+    Test validation of bulk access pairs, requires no backend.
+    """
+    from accsyn_api.session import Session
+
+    assert Session._access_many_types(" User", "Delivery ", [("a", "b"), ("a", "c", dict(read=True))]) == (
+        "user",
+        "delivery",
+    )
+    for pairs in [[], ("a", "b"), [("a",)], [("a", " ")], [("a", "b", "rw")], [(1, "b")]]:
+        with pytest.raises(AssertionError):
+            Session._access_many_types("user", "delivery", pairs)
+
+
+def test_revoke_many_acls():
+    """
+    Test that share ACLs are looked up in batches of (user, share) pairs, and each revocation maps to its ACL,
+    requires no backend.
+    """
+    from accsyn_api.session import AccsynException, Session
+
+    u1, u2, s1, s2 = (f"{idx:024x}" for idx in range(4))
+    queries = list(Session._revoke_many_queries([u1, u2, u1, None], [s1, s1, s1, s2]))
+    assert [str(query) for query in queries] == [f"acl WHERE target='share:{s1}' AND entity in 'user:{u1},user:{u2}'"]
+    acls = dict()
+    Session._revoke_many_store(acls, [dict(id="acl1", entity=f"user:{u1}", target=f"share:{s1}")])
+    requests = Session._revoke_many_requests(
+        "user", "volume", [("u1", "s1"), ("u2", "s1"), ("nobody", "s2")], [u1, u2, None], [s1, s1, s2], acls
+    )
+    assert requests[0] == dict(method="DELETE", uri="acl/delete", data=dict(), entityid="acl1", first=False)
+    assert all(isinstance(request, AccsynException) for request in requests[1:])
+
+
+@pytest.mark.order(9)
+def test_grant_revoke_many_as_admin(session_admin, entities):
+    """
+    Test granting and revoking a user access to deliveries in bulk, ordered after the standard user is created.
+    """
+    deliveries = []
+    for idx in range(2):
+        name = entities.temp(f"grant_many_{idx}")
+        delivery = session_admin.create("Delivery", {"name": name})
+        entities.remember(kind="delivery", temp_name=name, entity_id=delivery["id"])
+        deliveries.append(delivery)
+    user = TestUtils.get_standard_ident()
+    result = session_admin.grant_many("user", "delivery", [(user, delivery["id"]) for delivery in deliveries])
+    assert len(result) == 2 and not any(isinstance(r, Exception) for r in result), result
+    result = session_admin.revoke_many("user", "delivery", [(user, delivery["id"]) for delivery in deliveries])
+    assert result == [True, True]
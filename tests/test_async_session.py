@@ -0,0 +1,33 @@
+import os
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def envfile_admin():
+    if not os.path.exists(".env.admin"):
+        pytest.skip("Missing required .env file: .env.admin")
+    pytest.importorskip("aiohttp")
+    return ".env.admin"
+
+
+def test_async_find_as_admin(envfile_admin, session_admin):
+    """
+    Test concurrent queries with the asyncio session, comparing with the blocking session.
+    """
+    import accsyn_api
+
+    async def run():
+        async with accsyn_api.AsyncSession(path_envfile=envfile_admin, connect_timeout=10, timeout=30) as session:
+            return await asyncio.gather(
+                session.find("entitytypes"),
+                session.find("User"),
+                session.find_one("User"),
+            )
+
+    entitytypes, users, user = asyncio.run(run())
+    assert "user" in {str(x).lower() for x in entitytypes}
+    assert isinstance(users, list)
+    assert {u["id"] for u in users} == {u["id"] for u in session_admin.find("User")}
+    assert user is not None and "id" in user
@@ -0,0 +1,146 @@
+import time
+
+import pytest
+
+
+def test_entity_cache_ttl(monkeypatch):
+    """
+    Test that cached entities are copies, and expire after the time to live, requires no backend.
+    """
+    from accsyn_api import EntityCache
+
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = EntityCache(ttl=10.0)
+    entity = dict(id="a", code="job_a", metadata=dict(frame=1))
+    cache.put("Job", entity)
+    entity["metadata"]["frame"] = 2
+    cached = cache.get("job", "a")
+    assert cached == dict(id="a", code="job_a", metadata=dict(frame=1))
+    cached["code"] = "changed"
+    assert cache.get("job", "a")["code"] == "job_a"
+    assert cache.get("user", "a") is None
+    now[0] += 10.0
+    assert cache.get("job", "a") is None
+    assert cache.get_statistics() == dict(hits=2, misses=2, evictions=0, size=0)
+
+
+def test_entity_cache_lru():
+    """
+    Test that the least recently used entity is evicted when full, and invalidation of any entity type.
+    """
+    from accsyn_api import EntityCache
+
+    cache = EntityCache(maxsize=2)
+    cache.put("job", dict(id="a"))
+    cache.put("job", dict(id="b"))
+    assert cache.get("job", "a") is not None
+    cache.put("job", dict(id="c"))
+    assert cache.get("job", "b") is None
+    assert cache.get("job", "a") is not None and cache.get("job", "c") is not None
+    cache.put("transfer", dict(id="a"))
+    cache.invalidate("a")
+    assert cache.get("job", "a") is None and cache.get("transfer", "a") is None
+    assert cache.get_statistics()["evictions"] == 2
+
+
+def test_resolve_id_batches_and_caches():
+    """
+    Test resolving codes in batches, passing ids through and serving codes from cache, requires no backend.
+    """
+    from accsyn_api.session import AccsynException, Session
+
+    class CodedSession(Session):
+        _connect_upon_init = False
+
+        def find(self, query, attributes=None, **kwargs):
+            self.queries.append(str(query))
+            return [dict(id=f"{idx:024x}", code=f"user{idx}") for idx in range(Session.RESOLVE_ID_BATCH_SIZE + 1)]
+
+    session = CodedSession(workspace="test", username="test@example.com", api_key="key", hostname="127.0.0.1")
+    session.queries = []
+    codes = [f"User{idx}" for idx in range(Session.RESOLVE_ID_BATCH_SIZE + 1)]
+    ids = session.resolve_id("user", codes + ["f" * 24])
+    assert ids == [f"{idx:024x}" for idx in range(len(codes))] + ["f" * 24]
+    assert len(session.queries) == 2
+    assert session.resolve_id("user", "user1") == f"{1:024x}" and len(session.queries) == 2
+    session._code_cache.invalidate(f"{1:024x}")
+    assert session.resolve_id("user", "nobody", missing_ok=True) is None and len(session.queries) == 3
+    with pytest.raises(AccsynException):
+        session.resolve_id("user", ["user0", "nobody"])
+
+
+def test_schema_cache_ttl(monkeypatch, tmp_path):
+    """
+    Test that schemas are kept per scope, stale after the time to live and persisted on disk, requires no backend.
+    """
+    from accsyn_api import SchemaCache
+
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = SchemaCache(path=str(tmp_path), ttl=60.0)
+    assert cache.get("test-3.4.0-admin", "entitytypes") == (None, True)
+    cache.put("test-3.4.0-admin", "entitytypes", ["job", "user"])
+    assert cache.get("test-3.4.0-admin", "entitytypes") == (["job", "user"], False)
+    assert cache.get("test-3.4.1-admin", "entitytypes") == (None, True)
+    now[0] += 60.0
+    assert cache.get("test-3.4.0-admin", "entitytypes") == (["job", "user"], True)
+    assert cache.get_statistics() == dict(hits=2, misses=2)
+    # A new cache reads the schemas persisted by the previous one, until cleared
+    assert SchemaCache(path=str(tmp_path)).get("test-3.4.0-admin", "entitytypes") == (["job", "user"], False)
+    cache.clear()
+    assert SchemaCache(path=str(tmp_path)).get("test-3.4.0-admin", "entitytypes") == (None, True)
+
+
+@pytest.mark.order(1)
+def test_entity_cache_as_admin(session_admin, users):
+    """
+    Test a session with entity cache serving repeated user lookups by id from cache.
+    """
+    import accsyn_api
+
+    with accsyn_api.Session(path_envfile=".env.admin", entity_cache=True) as session:
+        user = session.get_entity("user", users[0]["id"])
+        assert user["id"] == users[0]["id"]
+        assert session.get_entity("user", users[0]["id"]) == user
+        assert session.find_one(f"User WHERE id={users[0]['id']}") == user
+        statistics = session.get_cache_statistics()
+        assert statistics["hits"] == 2 and statistics["misses"] == 1 and statistics["size"] == 1
+    assert session_admin.get_cache_statistics() is None
+
+
+@pytest.mark.order(2)
+def test_resolve_id_as_admin(session_admin, users):
+    """
+    Test resolving user codes to ids in one go, ids passed through and unknown codes.
+    """
+    from accsyn_api.session import AccsynException
+
+    codes = [user["code"] for user in users[:3]]
+    assert session_admin.resolve_id("user", codes) == [user["id"] for user in users[:3]]
+    assert session_admin.resolve_id("user", users[0]["id"]) == users[0]["id"]
+    assert session_admin.get_entity("user", codes[0])["id"] == users[0]["id"]
+    assert session_admin.resolve_id("user", "pytest-nobody@example.com", missing_ok=True) is None
+    with pytest.raises(AccsynException):
+        session_admin.resolve_id("user", "pytest-nobody@example.com")
+
+
+@pytest.mark.order(3)
+def test_schema_cache_as_admin(session_admin, tmp_path):
+    """
+    Test entity types and attributes served from a schema cache persisted on disk, by a new session.
+    """
+    import accsyn_api
+
+    entitytypes = session_admin.find("entitytypes")
+    attributes = session_admin.find("attributes WHERE entitytype=job")
+    cache = accsyn_api.SchemaCache(path=str(tmp_path))
+    with accsyn_api.Session(path_envfile=".env.admin", schema_cache=cache) as session:
+        assert session.find("entitytypes") == entitytypes
+        assert session.find("attributes WHERE entitytype=job") == attributes
+    # A new cache reads the schemas persisted by the previous one
+    cache = accsyn_api.SchemaCache(path=str(tmp_path))
+    with accsyn_api.Session(path_envfile=".env.admin", schema_cache=cache) as session:
+        assert session.find("entitytypes") == entitytypes
+        assert session.find("attributes WHERE entitytype=job") == attributes
+    assert cache.get_statistics() == dict(hits=2, misses=0)
@@ -0,0 +1,170 @@
+import datetime
+import gzip
+import json
+
+import pytest
+
+
+class FakeResponse(object):
+    """HTTP response of the fake transport."""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.headers = dict()
+        self.elapsed = datetime.timedelta(seconds=0.01)
+        self.encoding = "utf-8"
+        self._body = body.encode("utf-8")
+
+    def iter_content(self, chunk_size):
+        return iter([self._body])
+
+    def close(self):
+        pass
+
+
+class FakeTransport(object):
+    """Fake HTTP transport, recording requests and answering with the responses supplied in turn."""
+
+    def __init__(self, responses):
+        self.requests = []
+        self._responses = list(responses)
+
+    def request(self, method, url, **kwargs):
+        self.requests.append(kwargs)
+        return FakeResponse(*self._responses.pop(0))
+
+
+def offline_session(compression, responses):
+    """Return a session logged in without connecting to backend, sending requests to a fake transport."""
+    from accsyn_api.session import Session
+
+    class OfflineSession(Session):
+        _connect_upon_init = False
+
+    session = OfflineSession(
+        workspace="test", username="test@example.com", api_key="key", hostname="127.0.0.1", compression=compression
+    )
+    session._store_login(dict(result=dict(role="admin", id="0" * 24, session_id="test", version="3.4.0")))
+    session._http = FakeTransport(responses)
+    return session
+
+
+# Above the compression threshold of the default policy
+LARGE_DATA = dict(description="x" * 200000)
+
+
+def test_compression_validation_error_raised():
+    """
+    Test that a backend validation error to a compressed request is raised as is, keeping compression, requires no
+    backend.
+    """
+    from accsyn_api.session import AccsynException
+
+    session = offline_session("gzip", [(400, json.dumps(dict(message="Invalid job name!")))])
+    with pytest.raises(AccsynException) as e:
+        session._event("POST", "job/create", LARGE_DATA)
+    assert str(e.value) == "Invalid job name!"
+    assert session._compression == "gzip"
+    assert len(session._http.requests) == 1
+    assert session._http.requests[0]["headers"]["Content-Encoding"] == "gzip"
+
+
+def test_compression_rejected_fallback():
+    """
+    Test that a compressed request body rejected by backend is sent again with the next compression to try.
+    """
+    session = offline_session("gzip", [(400, "<html>Bad Request</html>"), (200, json.dumps(dict(result=1)))])
+    assert session._event("POST", "job/create", LARGE_DATA)["result"] == 1
+    assert session._compression == "gz_data"
+    assert [(r["headers"] or dict()).get("Content-Encoding") for r in session._http.requests] == ["gzip", None]
+    assert "gz_data" in json.loads(session._http.requests[-1]["data"])
+
+
+def test_compress_roundtrip():
+    """
+    Test that JSON chunks compressed with gzip decompress to the concatenated chunks.
+    """
+    from accsyn_api.session import Session
+
+    chunks = ['{"a": ', json.dumps("y" * 300000), "}"]
+    assert gzip.decompress(Session._compress(chunks, "gzip")) == "".join(chunks).encode("ascii")
+    assert gzip.decompress(Session._compress(chunks, "gzip", level=1)) == "".join(chunks).encode("ascii")
+
+
+def test_is_encoding_rejected():
+    """
+    Test which responses tell a compressed request body was not accepted.
+    """
+    from accsyn_api.session import Session
+
+    assert Session._is_encoding_rejected(415, "", "gzip")
+    assert Session._is_encoding_rejected(400, "Bad Request", "zstd")
+    assert Session._is_encoding_rejected(400, json.dumps(dict(error="bad")), "gzip")
+    assert not Session._is_encoding_rejected(400, json.dumps(dict(message="Invalid!")), "gzip")
+    assert not Session._is_encoding_rejected(400, json.dumps(dict(exception="Traceback")), "gzip")
+    assert not Session._is_encoding_rejected(400, "Bad Request", None)
+    assert not Session._is_encoding_rejected(500, "Internal Server Error", "gzip")
+
+
+def test_compression_policy():
+    """
+    Test the fixed compression policy threshold and levels, and its statistics, requires no backend.
+    """
+    from accsyn_api import CompressionPolicy
+
+    policy = CompressionPolicy(threshold=1000)
+    assert policy.get_level("task/create", 1000, "gzip") is None
+    assert policy.get_level("task/create", 1001, "gzip") == 6
+    assert policy.get_level("task/create", 1001, "gz_data") == 6
+    assert policy.get_level("task/create", 1001, "zstd") == 3
+    assert CompressionPolicy(threshold=1000, level=1).get_level("task/create", 1001, "zstd") == 1
+    policy.record("task/create", 500, 500, None, 0.0, 0.5)
+    policy.record("task/create", 2000, 500, 6, 0.01, 0.5)
+    statistics = policy.get_statistics()["task/create"]
+    assert statistics["requests"] == 2 and statistics["compressed"] == 1 and statistics["level"] == 6
+    assert statistics["ratio"] == 0.25 and statistics["throughput"] == 1000.0
+
+
+def test_adaptive_compression_policy_fast_link():
+    """
+    Test that the adaptive policy stops compressing when sending uncompressed is faster, probing at intervals,
+    requires no backend.
+    """
+    from accsyn_api import AdaptiveCompressionPolicy
+
+    policy = AdaptiveCompressionPolicy(probe_interval=3)
+    size = 100000
+    assert policy.get_level("task/create", size, "gzip") == 6
+    policy.record("task/create", size, 30000, 6, 0.01, 0.001)
+    levels = []
+    for _ in range(6):
+        # 1 GB/s link, compressing at 10 MB/s to 30%
+        level = policy.get_level("task/create", size, "gzip")
+        size_sent = size if level is None else 30000
+        policy.record("task/create", size, size_sent, level, 0.0 if level is None else 0.01, 0.001 + size_sent / 1e9)
+        levels.append(level)
+    assert levels == [6, 1, None, None, 1, None]
+    assert policy.get_level("task/create", 1000, "gzip") is None
+
+
+def test_adaptive_compression_policy_slow_link():
+    """
+    Test that the adaptive policy raises the level on a slow link, and starts over after a compression fallback,
+    requires no backend.
+    """
+    from accsyn_api import AdaptiveCompressionPolicy
+
+    policy = AdaptiveCompressionPolicy()
+    size = 100000
+    ratios, speeds = {1: 0.5, 6: 0.3, 9: 0.25}, {1: 100e6, 6: 50e6, 9: 20e6}
+    policy.record("task/create", size, 30000, 6, 0.001, 0.01)
+    levels = []
+    for _ in range(4):
+        # 1 MB/s link
+        level = policy.get_level("task/create", size, "gzip")
+        size_sent = int(size * ratios[level])
+        policy.record("task/create", size, size_sent, level, size / speeds[level], 0.01 + size_sent / 1e6)
+        levels.append(level)
+    assert levels == [6, 9, 9, 9]
+    # Another compression, e.g. after falling back, has its own levels
+    assert policy.get_level("task/create", size, "zstd") == 3
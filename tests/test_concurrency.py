@@ -0,0 +1,22 @@
+import functools
+
+import pytest
+
+from accsyn_api.session import AccsynException
+
+
+@pytest.mark.order(1)
+def test_map_get_entity_as_admin(session_admin, users):
+    """
+    Test fetching users concurrently, results in order and failures reported per item.
+    """
+    progress = []
+    result = session_admin.map(
+        functools.partial(session_admin.get_entity, "user"),
+        [u["id"] for u in users] + ["000000000000000000000000"],
+        max_workers=4,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert [r["id"] for r in result[:-1]] == [u["id"] for u in users]
+    assert result[-1] is None or isinstance(result[-1], AccsynException)
+    assert progress[-1] == (len(users) + 1, len(users) + 1)
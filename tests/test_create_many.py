@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+
+def test_create_many_rounds():
+    """
+    Test splitting items into rounds of units to create concurrently, skipping items done, requires no backend.
+    """
+    from accsyn_api.session import Session
+
+    items = [dict(name=f"task{idx}") for idx in range(7)]
+    results = dict()
+    rounds = list(Session._create_many_rounds("task", items, {"1": "a" * 24}, results, 2, 2))
+    assert [[[idx for idx, _ in unit] for unit in units] for units in rounds] == [[[0, 2], [3, 4]], [[5, 6]]]
+    assert results == {1: dict(id="a" * 24)}
+    rounds = list(Session._create_many_rounds("user", items[:3], dict(), dict(), 2, 4))
+    assert [[[idx for idx, _ in unit] for unit in units] for units in rounds] == [[[0], [1]], [[2]]]
+
+
+def test_create_many_store():
+    """
+    Test that created items are recorded done, and items of failed or ambiguous creates fail, requires no backend.
+    """
+    from accsyn_api.session import AccsynException, Session
+
+    unit = [(0, dict(name="a")), (1, dict(name="b"))]
+    results, done = dict(), dict()
+    Session._create_many_store(unit, [dict(id="a" * 24), dict(name="b")], results, done)
+    assert results[0] == dict(id="a" * 24) and isinstance(results[1], AccsynException)
+    assert done == {"0": "a" * 24}
+    Session._create_many_store(unit, [dict(id="a" * 24)], results, done)
+    assert all(isinstance(results[idx], AccsynException) for idx in [0, 1])
+    e = AccsynException("boom")
+    Session._create_many_store(unit, e, results, done)
+    assert results == {0: e, 1: e}
+
+
+def test_create_many_resume(tmp_path):
+    """
+    Test that a checkpoint records the items created, and a resumed run only creates the failed items, requires no
+    backend.
+    """
+    from accsyn_api.session import AccsynException, Session
+
+    class CreatingSession(Session):
+        _connect_upon_init = False
+
+        def create(self, entitytype, data, entityid=None, allow_duplicates=None):
+            if data["name"] in self.failing:
+                raise AccsynException(f"Cannot create {data['name']}")
+            self.created.append(data["name"])
+            return dict(id=f"{len(self.created):024x}", **data)
+
+    session = CreatingSession(workspace="test", username="test@example.com", api_key="key", hostname="127.0.0.1")
+    session.created, session.failing = [], {"b"}
+    checkpoint = str(tmp_path / "create_many.json")
+    items = [dict(name=name) for name in "abc"]
+    result = session.create_many("share", items, chunk_size=2, checkpoint=checkpoint)
+    assert isinstance(result[1], AccsynException) and os.path.exists(checkpoint)
+    session.failing = set()
+    result = session.create_many("share", items, chunk_size=2, checkpoint=checkpoint)
+    assert sorted(session.created) == ["a", "b", "c"] and result[1]["name"] == "b"
+    assert result[0] == dict(id=f"{session.created.index('a') + 1:024x}")
+    assert not os.path.exists(checkpoint)
+    # A checkpoint recorded creating other entities cannot be resumed
+    Session._create_many_save_checkpoint(checkpoint, "share", None, dict())
+    with pytest.raises(AccsynException):
+        session.create_many("user", items, checkpoint=checkpoint)
+
+
+@pytest.mark.order(1)
+def test_create_many_as_admin(session_admin, entities, tmp_path):
+    """
+    Test creating deliveries in chunks with a checkpoint, removed once all were created.
+    """
+    names = [entities.temp(f"create_many_{i}") for i in range(3)]
+    checkpoint = str(tmp_path / "create_many.json")
+    result = session_admin.create_many(
+        "delivery", [dict(name=name) for name in names], chunk_size=2, checkpoint=checkpoint
+    )
+    assert sorted(result) == [0, 1, 2]
+    for idx, name in enumerate(names):
+        assert not isinstance(result[idx], Exception), result[idx]
+        entities.remember(kind="delivery", temp_name=name, entity_id=result[idx]["id"])
+    assert not os.path.exists(checkpoint)
@@ -0,0 +1,210 @@
+import datetime
+
+import pytest
+
+
+def test_scan_query():
+    """
+    Test building of the id range partition queries used by scan, requires no backend.
+    """
+    from accsyn_api import Session
+
+    assert Session._scan_query("user") == "user"
+    assert Session._scan_query("user", "code='a'") == "user WHERE code='a'"
+    assert Session._scan_query("user", lower="a" * 24) == f"user WHERE id>='{'a' * 24}'"
+    assert (
+        Session._scan_query("user", "code='a' OR code='b'", "a" * 24, "b" * 24)
+        == f"user WHERE id>='{'a' * 24}' AND id<'{'b' * 24}' AND (code='a' OR code='b')"
+    )
+
+
+def test_object_id_at():
+    """
+    Test that partition bounds are the lowest ObjectId created at a given time, requires no backend.
+    """
+    from accsyn_api import Session
+
+    dt = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    entityid = Session._object_id_at(dt)
+    assert entityid == f"{int(dt.timestamp()):08x}{'0' * 16}" and len(entityid) == 24
+    assert Session._object_id_time(entityid) == dt
+    assert Session._object_id_at(dt) < Session._object_id_at(dt + datetime.timedelta(seconds=1))
+
+
+def listed_session(entities, **kwargs):
+    """
+    Return a session without backend connection, finding among *entities* and recording each find. Queries on ids
+    only find entities having those ids.
+    """
+    from accsyn_api.session import Session
+
+    class ListedSession(Session):
+        _connect_upon_init = False
+
+        def find(self, query, skip=None, limit=None, **kwargs):
+            self.finds.append(dict(query=query, skip=skip, limit=limit, **kwargs))
+            result = entities[skip or 0 :]
+            if str(query).startswith("user WHERE id"):
+                ids = str(query).split("'")[1].split(",")
+                result = [entity for entity in result if entity["id"] in ids]
+            return result[:limit] if limit is not None else result
+
+    session = ListedSession(
+        workspace="test", username="test@example.com", api_key="key", hostname="127.0.0.1", **kwargs
+    )
+    session.finds = []
+    return session
+
+
+def test_result_set_slicing():
+    """
+    Test that result set slices map to skip and limit, fetching nothing until used, requires no backend.
+    """
+    from accsyn_api import ResultSet
+
+    session = listed_session([dict(id=str(idx)) for idx in range(10)])
+    result = ResultSet(session, "User WHERE code=a")
+    sliced = result[2:8][1:3]
+    assert repr(sliced) == "<ResultSet 'User WHERE code=a' skip=3 limit=2>"
+    assert session.finds == []
+    assert [e["id"] for e in sliced] == ["3", "4"]
+    assert len(sliced) == 2 and sliced and result[9]["id"] == "9"
+    assert result[4:][:2].first()["id"] == "4"
+    assert not result[10:] and len(result[3:3]) == 0
+    with pytest.raises(IndexError):
+        sliced[2]
+    assert result.filter("status=online").query == "user WHERE (code=a) AND (status=online)"
+
+
+def test_count_and_exists_entity_fetch_ids():
+    """
+    Test that count and exists_entity only fetch ids, exists_entity at most one, requires no backend.
+    """
+    session = listed_session([dict(id=str(idx)) for idx in range(3)])
+    assert session.count("User", inactive=True) == 3
+    assert session.finds[-1]["attributes"] == ["id"] and session.finds[-1]["inactive"] is True
+    assert session.exists_entity("User")
+    assert session.finds[-1]["attributes"] == ["id"] and session.finds[-1]["limit"] == 1
+    assert not listed_session([]).exists_entity("User WHERE code=a")
+
+
+def test_get_entities_batches():
+    """
+    Test fetching entities by id in batches, in order of ids and served from entity cache, requires no backend.
+    """
+    ids = [f"{idx:024x}" for idx in range(5)]
+    session = listed_session([dict(id=entityid) for entityid in ids], entity_cache=True)
+    missing = "f" * 24
+    result = session.get_entities("user", [ids[4], ids[0], missing, ids[2]], batch_size=2)
+    assert list(result) == [ids[4], ids[0], missing, ids[2]]
+    assert [entity["id"] if entity else None for entity in result.values()] == [ids[4], ids[0], None, ids[2]]
+    assert sorted(str(find["query"]) for find in session.finds) == sorted(
+        [f"user WHERE id in '{ids[4]},{ids[0]}'", f"user WHERE id in '{missing},{ids[2]}'"]
+    )
+    assert session.get_entities("user", [ids[2], ids[3]]) == {ids[2]: dict(id=ids[2]), ids[3]: dict(id=ids[3])}
+    assert str(session.finds[-1]["query"]) == f"user WHERE id='{ids[3]}'"
+
+
+def test_expand_references():
+    """
+    Test collecting and attaching entities referenced by expanded attributes, requires no backend.
+    """
+    import threading
+
+    from accsyn_api.session import AccsynException, Session
+
+    a, b, c = (f"{idx:024x}" for idx in range(3))
+    assert Session._get_reference(f"share:{a}", None) == ("share", a)
+    assert Session._get_reference(a, "user") == ("user", a)
+    assert Session._get_reference(a, None) is None and Session._get_reference("x", "user") is None
+    session = listed_session([])
+    transfers = [dict(parent=a, user=b, target=f"share:{c}"), dict(parent=a, user=None, target="all")]
+    expanded = {("user", b): dict(id=b)}
+    references, missing = session._expand_prepare(
+        "transfer", transfers, ["parent", "user", "target"], expanded, threading.Lock()
+    )
+    assert missing == dict(job=[a], share=[c])
+    expanded.update({("job", a): dict(id=a), ("share", c): None})
+    Session._expand_attach(references, expanded)
+    assert transfers[0]["parent_entity"] == dict(id=a) and transfers[0]["user_entity"] == dict(id=b)
+    assert transfers[0]["target_entity"] is None and transfers[1]["target_entity"] is None
+    # A plain id of unknown entity type cannot be expanded
+    transfers[0]["source"] = a
+    with pytest.raises(AccsynException):
+        session._expand_prepare("transfer", transfers, ["source"], expanded, threading.Lock())
+
+
+@pytest.mark.order(1)
+def test_find_iter_pages_users_as_admin(session_admin, users):
+    """
+    Test iterating users page by page, with prefetch, yields the same users as a single find.
+    """
+    iterated = list(session_admin.find_iter("User", page_size=2, prefetch=2))
+    assert [u["id"] for u in iterated] == [u["id"] for u in users]
+    assert len(list(session_admin.find_iter("User", page_size=2, prefetch=0, limit=1))) == 1
+
+
+@pytest.mark.order(2)
+def test_scan_users_as_admin(session_admin, users):
+    """
+    Test scanning users in id range partitions yields the same users as a single find, in id order when ordered.
+    """
+    scanned = list(session_admin.scan("user", partitions=3, page_size=2))
+    assert sorted(u["id"] for u in scanned) == sorted(u["id"] for u in users)
+    assert [u["id"] for u in scanned] == sorted(u["id"] for u in scanned)
+    unordered = list(session_admin.scan("user", partitions=3, ordered=False, attributes=["code"]))
+    assert sorted(u["id"] for u in unordered) == sorted(u["id"] for u in users)
+
+
+@pytest.mark.order(3)
+def test_find_lazy_users_as_admin(session_admin, users):
+    """
+    Test lazy find; slicing, len, bool and first matches a plain find.
+    """
+    from accsyn_api import ResultSet
+
+    result = session_admin.find("User", lazy=True)
+    assert isinstance(result, ResultSet)
+    assert len(result) == len(users)
+    assert result
+    assert result.first()["id"] == users[0]["id"]
+    assert [u["id"] for u in result[0:2]] == [u["id"] for u in users[0:2]]
+    assert result[len(users) - 1]["id"] == users[-1]["id"]
+    assert len(result[len(users) :]) == 0
+    assert not result.filter("id=000000000000000000000000")
+
+
+@pytest.mark.order(4)
+def test_count_and_exists_entity_as_admin(session_admin, users):
+    """
+    Test counting and checking existence of users without fetching them, and find_one returning first user.
+    """
+    assert session_admin.count("User") == len(users)
+    assert session_admin.exists_entity(f"User WHERE id={users[0]['id']}")
+    assert not session_admin.exists_entity("User WHERE id=000000000000000000000000")
+    assert session_admin.find_one("User")["id"] == users[0]["id"]
+
+
+@pytest.mark.order(5)
+def test_get_entities_as_admin(session_admin, users):
+    """
+    Test fetching users by id in batches, with an unknown id reported as missing.
+    """
+    ids = [user["id"] for user in users] + ["000000000000000000000000"]
+    result = session_admin.get_entities("user", ids, batch_size=2)
+    assert list(result) == ids
+    assert [result[user["id"]]["id"] for user in users] == [user["id"] for user in users]
+    assert result["000000000000000000000000"] is None
+
+
+@pytest.mark.order(6)
+def test_find_expand_as_admin(session_admin):
+    """
+    Test expanding the users and shares referenced by ACLs.
+    """
+    acls = session_admin.find("acl", expand=["entity", "target"])
+    assert isinstance(acls, list)
+    for acl in acls:
+        assert "entity_entity" in acl and "target_entity" in acl
+        if acl["entity_entity"] is not None:
+            assert acl["entity"].endswith(acl["entity_entity"]["id"])
@@ -0,0 +1,111 @@
+import re
+import json
+import datetime
+
+
+def legacy_decode(json_string):
+    """The previous decoder; parse, then walk the tree converting date/time strings."""
+    from accsyn_api.session import Session
+
+    def recursive_decode(d):
+        if isinstance(d, dict):
+            for key in d.keys():
+                if isinstance(d[key], dict):
+                    d[key] = recursive_decode(d[key])
+                elif isinstance(d[key], list):
+                    d[key] = [recursive_decode(i) for i in d[key]]
+                elif Session._is_str(d[key]):
+                    dt = None
+                    if d[key].startswith("ObjectId:"):
+                        d[key] = d[key].replace("ObjectId:", "")
+                    elif re.match("^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}$", d[key]):
+                        dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S")
+                    elif re.match("^[0-9]{2,4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}.[0-9]{3}$", d[key]):
+                        dt = datetime.datetime.strptime(d[key], "%Y-%m-%dT%H:%M:%S.%f")
+                    if dt is not None:
+                        dt = dt.replace(tzinfo=datetime.timezone.utc)
+                        d[key] = dt.astimezone()
+        return d
+
+    return recursive_decode(json.loads(json_string))
+
+
+def decode(value):
+    from accsyn_api.session import JSONDecoder
+
+    return json.loads(json.dumps(dict(value=value)), cls=JSONDecoder)["value"]
+
+
+def test_json_decoder_matches_legacy():
+    """
+    Test that the single pass decoder gives the same result as the previous decoder, requires no backend.
+    """
+    from accsyn_api.session import JSONDecoder
+
+    values = [
+        "2024-01-02T03:04:05",
+        "2024-01-02T03:04:05.123",
+        "1999-12-31T23:59:59.999",
+        "2024-07-01T12:00:00",  # Daylight saving time, if any
+        "ObjectId:5f5e10000000000000000001",
+        "ObjectId:",
+        "Objective",
+        # Non date/time strings of the same lengths
+        "abcdefghijklmnopq",
+        "abcdefghijklmnopq:ab",
+        "abcdefghijklmnopqrs",
+        "abcdefghijklmnopq.ab",
+        "abcdefghijklmnopqr.abc",
+        "abcdefghijklmnopqrs.abc",
+        "2024-01-02 03:04:05",
+        "2024-01-02T03:04:05Z",
+        "2024-01-02T03:04:05.1234",
+        "",
+        "user:5f5e10000000000000000001",
+        42,
+        1.5,
+        True,
+        None,
+    ]
+    document = dict(
+        result=[dict(("v%d" % idx, value) for idx, value in enumerate(values))],
+        nested=dict(
+            inner=dict(created="2024-01-02T03:04:05", parent="ObjectId:abc"), items=[dict(a="2024-01-02T03:04:05.500")]
+        ),
+        strings=["2024-01-02T03:04:05", "ObjectId:abc"],
+    )
+    s = json.dumps(document)
+    assert json.loads(s, cls=JSONDecoder) == legacy_decode(s)
+    assert isinstance(json.loads(s, cls=JSONDecoder)["result"][0]["v0"], datetime.datetime)
+
+
+def test_json_decoder_two_digit_year():
+    """
+    Test date/time strings with two digit years, that the previous decoder matched but failed to parse.
+    """
+    for value, year in [
+        ("24-01-02T03:04:05", 2024),
+        ("24-01-02T03:04:05.123", 2024),
+        ("68-01-02T03:04:05", 2068),
+        ("69-01-02T03:04:05", 1969),
+    ]:
+        # Same century pivot as strptime %y
+        expected = datetime.datetime(year, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        dt = decode(value)
+        assert isinstance(dt, datetime.datetime)
+        assert dt.replace(microsecond=0) == expected
+        assert dt.microsecond == (123000 if value.endswith(".123") else 0)
+
+
+def test_json_decoder_invalid_datetime():
+    """
+    Test that strings looking like, but not being, date/times are kept as strings instead of raising.
+    """
+    for value in [
+        "2024-13-02T03:04:05",
+        "2024-01-32T03:04:05.123",
+        "2024-01-02T03:04:05x123",
+        "124-01-02T03:04:05",
+        "abcd-01-02T03:04:05",
+    ]:
+        assert decode(value) == value
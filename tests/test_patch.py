@@ -0,0 +1,57 @@
+import pytest
+
+
+def test_patch_data():
+    """
+    Test that only changed attributes are patched, dictionaries diffed by key if deep, requires no backend.
+    """
+    from accsyn_api.session import Session
+
+    before = dict(id="a", name="x", status="running", metadata=dict(frame=1, camera="a"))
+    assert Session._patch_data(before, dict(before), False) == dict()
+    assert Session._patch_data(before, dict(before, name="y", priority=5), False) == dict(name="y", priority=5)
+    after = dict(before, metadata=dict(frame=2, camera="a"))
+    assert Session._patch_data(before, after, False) == dict(metadata=dict(frame=2, camera="a"))
+    assert Session._patch_data(before, after, True) == dict(metadata=dict(frame=2))
+    # A removed key requires sending the dictionary whole
+    after = dict(before, metadata=dict(frame=2))
+    assert Session._patch_data(before, after, True) == dict(metadata=dict(frame=2))
+    after = dict(before, metadata=dict(camera="b"))
+    assert Session._patch_data(before, after, True) == dict(metadata=dict(camera="b"))
+
+
+def test_patch_unchanged():
+    """
+    Test that a patch without changes sends no update, and a changed patch only the changes, requires no backend.
+    """
+    from accsyn_api.session import Session
+
+    class PatchedSession(Session):
+        _connect_upon_init = False
+
+        def update(self, entitytype, entityid, data):
+            self.updates.append((entitytype, entityid, data))
+            return dict(id=entityid, **data)
+
+    session = PatchedSession(workspace="test", username="test@example.com", api_key="key", hostname="127.0.0.1")
+    session.updates = []
+    before = dict(id="a" * 24, name="x", status="running")
+    assert session.patch("delivery", before, dict(before)) is None and session.updates == []
+    assert session.patch("delivery", before, dict(before, name="y")) == dict(id="a" * 24, name="y")
+    assert session.updates == [("delivery", "a" * 24, dict(name="y"))]
+    with pytest.raises(AssertionError):
+        session.patch("delivery", before, dict(name="y"))
+
+
+@pytest.mark.order(1)
+def test_patch_as_admin(session_admin, entities):
+    """
+    Test patching a delivery, skipping the update when nothing changed.
+    """
+    name = entities.temp("patch")
+    delivery = session_admin.create("Delivery", {"name": name})
+    entities.remember(kind="delivery", temp_name=name, entity_id=delivery["id"])
+    delivery = session_admin.get_entity("delivery", delivery["id"])
+    assert session_admin.patch("delivery", delivery, dict(delivery)) is None
+    result = session_admin.patch("delivery", delivery, dict(delivery, name=f"{name}_2"))
+    assert result["name"] == f"{name}_2"
@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+
+
+def test_query_quote():
+    """
+    Test quoting of query values, requires no backend.
+    """
+    from accsyn_api import Query
+
+    assert Query._quote("running") == "'running'"
+    assert Query._quote("it's") == '"it\'s"'
+    assert Query._quote('say "x"') == '\'say "x"\''
+    assert Query._quote(True) == "true"
+    assert Query._quote(False) == "false"
+    assert Query._quote(42) == "42"
+    assert Query._quote(0.5) == "0.5"
+    assert Query._quote(["a", "b", 3]) == "'a,b,3'"
+    assert Query._quote(("it's", "b")) == '"it\'s,b"'
+    assert Query._quote(datetime.datetime(2024, 1, 2, 3, 4, 5)).startswith("'")
+
+
+def test_query_quote_unquotable():
+    """
+    Test that values the query syntax cannot express raise instead of producing a wrong query.
+    """
+    from accsyn_api import Query
+    from accsyn_api.session import AccsynException
+
+    with pytest.raises(AccsynException):
+        Query._quote('it\'s "x"')
+    with pytest.raises(AccsynException):
+        Query._quote(["a,b", "c"])
+    with pytest.raises(AccsynException):
+        Query._quote(["it's", 'say "x"'])
+    with pytest.raises(AccsynException):
+        Query("Job").where(name='it\'s "x"')
+    with pytest.raises(AccsynException):
+        Query("Job").where(name=["a,b", "c"])
+    query = Query("Job").where(name=Query.param("name"))
+    with pytest.raises(AccsynException):
+        query.bind(name='it\'s "x"').expression
+
+
+def test_query_compile():
+    """
+    Test compiling structured queries, with conditions, expressions and parameters.
+    """
+    from accsyn_api import Query
+    from accsyn_api.session import AccsynException
+
+    assert str(Query("Job")) == "Job"
+    query = Query("Job").where(status="running", code=["a", "b"])
+    assert str(query) == "Job WHERE status='running' AND code in 'a,b'"
+    query = Query("Job").where("priority>{priority}", user=Query.param("user"))
+    assert query.parameters == ["priority", "user"]
+    assert query.bind(priority=50, user="lisa").expression == "(priority>50) AND user='lisa'"
+    with pytest.raises(AccsynException):
+        query.bind(priority=50).expression
+
+
+def test_parse_query():
+    """
+    Test splitting query strings into entity type, WHERE and expression parts, requires no backend.
+    """
+    from accsyn_api.session import _parse_query
+
+    assert _parse_query("Job") == ("Job",)
+    assert _parse_query("  Job\t") == ("Job",)
+    assert _parse_query("Job WHERE code='my_transfer'") == ("Job", "WHERE", "code='my_transfer'")
+    assert _parse_query("Job  where   status=running AND code=x") == (
+        "Job",
+        "where",
+        "status=running",
+        "AND",
+        "code=x",
+    )
+    assert _parse_query("Job WHERE (dest='lars@edit.com' OR dest='b')") == (
+        "Job",
+        "WHERE",
+        "(dest='lars@edit.com' OR dest='b')",
+    )
+    assert _parse_query('Job WHERE name="my transfer (2)"') == ("Job", "WHERE", 'name="my transfer (2)"')
+    with pytest.raises(AssertionError):
+        _parse_query("Job code=x")
+    with pytest.raises(AssertionError):
+        _parse_query("Job WITH code=x")
+
+
+@pytest.mark.order(1)
+def test_find_query_builder_as_admin(session_admin, users):
+    """
+    Test finding a user with a reusable query, bound to different ids.
+    """
+    from accsyn_api import Query
+
+    query = Query("User").where(id=Query.param("userid"))
+    for user in users[:2]:
+        result = session_admin.find(query.bind(userid=user["id"]))
+        assert [u["id"] for u in result] == [user["id"]]
+    assert session_admin.find_one(query.bind(userid=users[0]["id"]))["id"] == users[0]["id"]
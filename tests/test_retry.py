@@ -0,0 +1,68 @@
+import datetime
+import email.utils
+
+
+def test_retry_allows():
+    """
+    Test which failures the default retry policy retries, requires no backend.
+    """
+    from accsyn_api import RetryPolicy
+
+    policy = RetryPolicy()
+    # Connection failures never reached backend, always retried
+    assert policy.allows("connect", dict(connect=0, read=0, status=0), False)
+    assert policy.allows("connect", dict(connect=2, read=0, status=0), False)
+    assert not policy.allows("connect", dict(connect=3, read=0, status=0), False)
+    # Read timeouts are not retried unless opted in
+    assert not policy.allows("read", dict(connect=0, read=0, status=0), True)
+    # Retryable statuses only if replayable
+    assert policy.allows("status", dict(connect=0, read=0, status=0), True)
+    assert not policy.allows("status", dict(connect=0, read=0, status=0), False)
+    assert policy.is_retryable_status(503)
+    assert not policy.is_retryable_status(500)
+    # The total amount of retries is capped
+    assert not policy.allows("status", dict(connect=2, read=0, status=1), True)
+
+    policy = RetryPolicy(max_retries=5, read_retries=2)
+    assert policy.allows("read", dict(connect=0, read=1, status=0), True)
+    assert not policy.allows("read", dict(connect=0, read=2, status=0), True)
+    assert not policy.allows("read", dict(connect=0, read=0, status=0), False)
+
+    policy = RetryPolicy(max_retries=0)
+    assert not policy.allows("connect", dict(connect=0, read=0, status=0), True)
+
+
+def test_retry_backoff():
+    """
+    Test exponential backoff, capped and jittered, requires no backend.
+    """
+    from accsyn_api import RetryPolicy
+
+    policy = RetryPolicy(backoff_factor=0.5, backoff_max=3.0, jitter=False)
+    assert [policy.get_backoff(retry) for retry in range(5)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    policy = RetryPolicy(backoff_factor=0.5, backoff_max=3.0)
+    for retry in range(5):
+        for _ in range(20):
+            assert 0 <= policy.get_backoff(retry) <= min(3.0, 0.5 * 2**retry)
+
+
+def test_retry_after():
+    """
+    Test Retry-After header parsing, as delay seconds or HTTP date, requires no backend.
+    """
+    from accsyn_api import RetryPolicy
+
+    policy = RetryPolicy(backoff_max=30.0, jitter=False)
+    assert policy.get_backoff(0, retry_after="7") == 7.0
+    assert policy.get_backoff(0, retry_after="120") == 30.0
+    assert policy.get_backoff(0, retry_after="-3") == 0.0
+    # Unparseable header falls back to backoff
+    assert policy.get_backoff(0, retry_after="soon") == 0.5
+    when = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=10)
+    assert 8.0 <= policy.get_backoff(0, retry_after=email.utils.format_datetime(when, usegmt=True)) <= 10.0
+    when = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=10)
+    assert policy.get_backoff(0, retry_after=email.utils.format_datetime(when, usegmt=True)) == 0.0
+
+    policy = RetryPolicy(respect_retry_after=False, jitter=False)
+    assert policy.get_backoff(1, retry_after="7") == 1.0
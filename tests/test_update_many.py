@@ -0,0 +1,70 @@
+import pytest
+
+
+def test_update_many_result():
+    """
+    Test that the tasks updated by chunks of a bulk task update are returned as a list, requires no backend.
+    """
+    from accsyn_api.session import Session
+
+    responses = [dict(result=[dict(id="1"), dict(id="2")]), dict(result=[dict(id="3")])]
+    assert Session._update_many_result(responses) == [dict(id="1"), dict(id="2"), dict(id="3")]
+    assert Session._update_many_result([None]) is None
+
+
+def test_update_many_result_failed_chunk():
+    """
+    Test that a failed chunk is raised, holding the tasks updated by the other chunks.
+    """
+    from accsyn_api.session import Session, AccsynException
+
+    error = AccsynException("Chunk failed")
+    responses = [dict(result=[dict(id="1")]), error, dict(result=[dict(id="3")])]
+    with pytest.raises(AccsynException) as e:
+        Session._update_many_result(responses)
+    assert e.value is error
+    assert e.value.partial_result == [dict(id="1"), dict(id="3")]
+
+
+def test_update_many_chunks():
+    """
+    Test that task updates are split into chunks.
+    """
+    from accsyn_api.session import Session, AccsynException
+
+    data = [dict(id=str(idx), status="onhold") for idx in range(5)]
+    chunks = Session._update_many_chunks("0" * 24, data, 2)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [d for chunk in chunks for d in chunk] == data
+    with pytest.raises(AccsynException):
+        Session._update_many_chunks("not-an-id", data, 2)
+
+
+def test_update_many_patches():
+    """
+    Test that updates of the same entity are merged, and that the same attributes can be applied to many entities.
+    """
+    from accsyn_api.session import Session
+
+    patches = Session._update_many_patches(
+        None, [dict(id="a", status="paused"), dict(id="b", priority=5), dict(id="a", priority=1)]
+    )
+    assert list(patches.items()) == [("a", dict(status="paused", priority=1)), ("b", dict(priority=5))]
+    patches = Session._update_many_patches(["a", "b"], dict(status="paused"))
+    assert patches == dict(a=dict(status="paused"), b=dict(status="paused"))
+    with pytest.raises(AssertionError):
+        Session._update_many_patches(None, [dict(status="paused")])
+
+
+@pytest.mark.order(1)
+def test_update_many_as_admin(session_admin, entities):
+    """
+    Test renaming a delivery in bulk, with an unknown delivery reported as failed.
+    """
+    name = entities.temp("update_many")
+    delivery = session_admin.create("Delivery", {"name": name})
+    entities.remember(kind="delivery", temp_name=name, entity_id=delivery["id"])
+    result = session_admin.update_many("delivery", [delivery["id"], "000000000000000000000000"], {"name": f"{name}_2"})
+    assert list(result) == [delivery["id"], "000000000000000000000000"]
+    assert result[delivery["id"]]["name"] == f"{name}_2"
+    assert isinstance(result["000000000000000000000000"], Exception)
@@ -0,0 +1,94 @@
+import pytest
+
+
+def test_write_behind_merge():
+    """
+    Test that updates of the same entity are merged, last write wins per attribute, requires no backend.
+    """
+    from accsyn_api import WriteBehindBuffer
+
+    buffer = WriteBehindBuffer(interval=60.0)
+    assert buffer.get_wait_time() is None
+    assert buffer.put("Job", "a", {"status": "running", "metadata": {"frame": 1}}) == dict(
+        id="a", status="running", metadata={"frame": 1}
+    )
+    buffer.put("job", "a", {"metadata": {"frame": 2}})
+    buffer.put("job", "b", {"priority": 5})
+    assert len(buffer) == 2
+    assert not buffer.is_due()
+    assert buffer.take() == [
+        ("job", "a", {"status": "running", "metadata": {"frame": 2}}),
+        ("job", "b", {"priority": 5}),
+    ]
+    assert len(buffer) == 0 and buffer.get_wait_time() is None
+    assert buffer.get_statistics() == dict(queued=3, sent=0, retried=0, failed=0, pending=0)
+
+
+def test_write_behind_due():
+    """
+    Test that pending updates are due when the maximum amount of entities are pending.
+    """
+    from accsyn_api import WriteBehindBuffer
+
+    buffer = WriteBehindBuffer(interval=60.0, max_pending=2)
+    buffer.put("job", "a", {"status": "paused"})
+    assert 0 < buffer.get_wait_time() <= 60.0
+    buffer.put("job", "b", {"status": "paused"})
+    assert buffer.is_due()
+
+
+def test_write_behind_requeue():
+    """
+    Test that a failed update is requeued until it failed the maximum amount of attempts.
+    """
+    from accsyn_api import WriteBehindBuffer
+
+    buffer = WriteBehindBuffer(max_attempts=2)
+    buffer.put("job", "a", {"status": "paused"})
+    (entitytype, entityid, data) = buffer.take()[0]
+    assert buffer.record(entitytype, entityid, data, Exception("boom"))
+    assert buffer.take() == [("job", "a", {"status": "paused"})]
+    assert not buffer.record(entitytype, entityid, data, Exception("boom"))
+    assert len(buffer) == 0
+    assert buffer.get_statistics() == dict(queued=1, sent=0, retried=1, failed=1, pending=0)
+
+    buffer.put("job", "a", {"status": "paused"})
+    assert not buffer.record(*buffer.take()[0], None)
+    assert buffer.get_statistics()["sent"] == 1
+
+
+def test_write_behind_requeue_beneath_newer():
+    """
+    Test that a failed update is merged beneath a newer update of the entity queued while it was sent, keeping
+    attributes only in the failed update.
+    """
+    from accsyn_api import WriteBehindBuffer
+
+    buffer = WriteBehindBuffer(max_attempts=2)
+    buffer.put("job", "a", {"status": "paused", "priority": 1})
+    sent = buffer.take()
+    buffer.put("job", "a", {"priority": 5})
+    assert buffer.record(*sent[0], Exception("boom"))
+    assert buffer.take() == [("job", "a", {"status": "paused", "priority": 5})]
+    # Attempts carry over to the merged update
+    assert not buffer.record("job", "a", {"status": "paused", "priority": 5}, Exception("boom"))
+    assert buffer.get_statistics()["failed"] == 1
+
+
+@pytest.mark.order(1)
+def test_write_behind_as_admin(session_admin, entities):
+    """
+    Test deferred updates of a delivery, merged into one update sent on close.
+    """
+    import accsyn_api
+
+    name = entities.temp("write_behind")
+    delivery = session_admin.create("Delivery", {"name": name})
+    entities.remember(kind="delivery", temp_name=name, entity_id=delivery["id"])
+    buffer = accsyn_api.WriteBehindBuffer(interval=60)
+    with accsyn_api.Session(path_envfile=".env.admin", write_behind=buffer) as session:
+        for idx in range(3):
+            assert session.update("delivery", delivery["id"], {"name": f"{name}_{idx}"})["name"] == f"{name}_{idx}"
+        assert buffer.get_statistics()["pending"] == 1
+    assert buffer.get_statistics() == dict(queued=3, sent=1, retried=0, failed=0, pending=0)
+    assert session_admin.get_entity("delivery", delivery["id"])["name"] == f"{name}_2"